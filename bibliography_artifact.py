@@ -0,0 +1,137 @@
+# Compiled bibliography for the notes processor
+# The bibliography itself is data (macbeth_bibliography.json):
+#   entries           - key -> full citation, in the order ties are decided
+#   variants          - key -> known misspellings of it ("Steevens": ["Stevens", ...])
+#   ocr_confusions    - character -> {character OCR mistakes it for: cost}
+#   max_ocr_cost      - the most the misreadings in one reference may cost in total
+# compile_bibliography() expands that into the full key table (case forms and
+# listed misspellings) and builds the ReferenceMatcher trie, which reads OCR
+# misspellings through the confusion matrix, and the FuzzyIndex over it. The
+# result is pickled once under .bibliography_cache/, named by a hash of the data
+# file's bytes and ARTIFACT_VERSION, so the processor loads it instead of
+# rebuilding it on every run; editing the data file (or changing how it is
+# compiled) simply leads to a new artifact.
+
+import hashlib
+import os
+import pickle
+import sys
+
+import json_io
+from fuzzy_index import FuzzyIndex
+from ocr_confusion import ConfusionMatrix
+from reference_matcher import ReferenceMatcher
+from resolution_cache import bibliography_fingerprint
+
+BIBLIOGRAPHY_FILE = "macbeth_bibliography.json"
+ARTIFACT_DIR = ".bibliography_cache"
+ARTIFACT_SUFFIX = ".pickle"
+# Bump when compile_bibliography() or the compiled classes change
+ARTIFACT_VERSION = 2
+
+class CompiledBibliography:
+    """Key table, variant table and match structures compiled from a bibliography file."""
+
+    def __init__(self, source_sha256, entries, bibliography, variants, confusions):
+        self.version = ARTIFACT_VERSION
+        self.source_sha256 = source_sha256
+        self.entries = entries            # base key -> citation
+        self.bibliography = bibliography  # every key and variant -> citation
+        self.variants = variants          # variant -> base key it was generated from
+        self.confusions = confusions      # ConfusionMatrix for OCR misreadings
+        # Lowercase variants are left out so ordinary words like "white" are never expanded
+        self.matcher = ReferenceMatcher((key for key in bibliography if not key[0].islower()), confusions)
+        self.fuzzy_index = FuzzyIndex(bibliography)
+        self.fingerprint = bibliography_fingerprint(bibliography)
+
+def source_digest(data):
+    """Artifact key: hash of the data file's bytes and the compiler version."""
+    return hashlib.sha256(b"%d\n" % ARTIFACT_VERSION + data).hexdigest()
+
+def expand_bibliography(source):
+    """
+    Return (bibliography, variants) for a decoded bibliography file. For each key,
+    in order: the key, its lowercase, title and uppercase forms, then its listed
+    misspellings. OCR misreadings get no keys; see ocr_confusion.
+    """
+    bibliography = dict(source['entries'])
+    variants = {}
+    listed = source.get('variants', {})
+
+    def add(variant, key):
+        bibliography[variant] = source['entries'][key]
+        if variant != key:
+            variants[variant] = key
+
+    for key in source['entries']:
+        add(key.lower(), key)
+        add(key.title(), key)
+        add(key.upper(), key)
+        for variant in listed.get(key, ()):
+            add(variant, key)
+
+    return bibliography, variants
+
+def compile_bibliography(path=BIBLIOGRAPHY_FILE, data=None):
+    """Compile a bibliography file, without touching the artifact cache."""
+    if data is None:
+        with open(path, 'rb') as f:
+            data = f.read()
+    source = json_io.loads(data)
+    bibliography, variants = expand_bibliography(source)
+    return CompiledBibliography(source_digest(data), dict(source['entries']), bibliography, variants,
+                                ConfusionMatrix.from_source(source))
+
+def artifact_path_for(digest, artifact_dir=ARTIFACT_DIR):
+    return os.path.join(artifact_dir, digest + ARTIFACT_SUFFIX)
+
+def load_bibliography(path=BIBLIOGRAPHY_FILE, artifact_dir=ARTIFACT_DIR):
+    """
+    Return the CompiledBibliography for a bibliography file, from its cached
+    artifact when there is one, otherwise compiling it and writing the artifact.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = source_digest(data)
+    artifact_path = artifact_path_for(digest, artifact_dir)
+
+    try:
+        with open(artifact_path, 'rb') as f:
+            compiled = pickle.load(f)
+        if (isinstance(compiled, CompiledBibliography) and compiled.version == ARTIFACT_VERSION
+                and compiled.source_sha256 == digest):
+            return compiled
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+
+    compiled = compile_bibliography(path, data)
+    write_artifact(compiled, artifact_dir)
+    return compiled
+
+def write_artifact(compiled, artifact_dir=ARTIFACT_DIR):
+    """Save a compiled bibliography and drop the artifacts of older versions of the data."""
+    os.makedirs(artifact_dir, exist_ok=True)
+    artifact_path = artifact_path_for(compiled.source_sha256, artifact_dir)
+    tmp_path = artifact_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, artifact_path)
+
+    for name in os.listdir(artifact_dir):
+        if name.endswith(ARTIFACT_SUFFIX) and os.path.join(artifact_dir, name) != artifact_path:
+            os.remove(os.path.join(artifact_dir, name))
+    return artifact_path
+
+def main():
+    """Compile a bibliography file and cache its artifact: python bibliography_artifact.py [bibliography.json]"""
+    # Through the module, so the pickle refers to bibliography_artifact.CompiledBibliography, not __main__
+    import bibliography_artifact
+
+    path = sys.argv[1] if len(sys.argv) > 1 else BIBLIOGRAPHY_FILE
+    compiled = bibliography_artifact.compile_bibliography(path)
+    artifact_path = bibliography_artifact.write_artifact(compiled)
+    print(f"✓ {artifact_path}: {len(compiled.entries)} entries, {len(compiled.bibliography)} keys, "
+          f"{len(compiled.variants)} variants, {len(compiled.matcher)} matcher keys")
+
+if __name__ == "__main__":
+    main()
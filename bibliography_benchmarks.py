@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Bibliography Benchmarks
+Times reference expansion and lookup over the Macbeth notes.
+Usage: python bibliography_benchmarks.py expand [--repeat N]
+       python bibliography_benchmarks.py fuzzy
+       python bibliography_benchmarks.py cache [notes files...]
+       python bibliography_benchmarks.py startup [--repeat N]
+       python bibliography_benchmarks.py ocr [--repeat N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import re
+import tempfile
+import time
+
+import bibliography_artifact
+import json_io
+from resolution_cache import ResolutionCache
+from complete_bibliography_processor import CompleteBibliographyExtractor, CompleteNotesProcessor
+
+NOTES_FILE = "macbeth_notes.json"
+CACHE_NOTES_FILES = ["macbeth_notes.json", "hamlet_notes (1).json", "kinglear_notes.json",
+                     "othello_notes.json", "ROMEO_notes.json"]
+# The substitutions the extractor used to add a key for, applied to every occurrence
+OCR_SUBSTITUTIONS = {"i": ["l", "1"], "l": ["i", "1"], "0": ["o"], "o": ["0"], "1": ["l", "i"]}
+CAPITALIZED = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b')
+
+def load_bibliography():
+    """The processor's compiled bibliography, without its progress output."""
+    extractor = CompleteBibliographyExtractor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor.extract_complete_bibliography()
+    return extractor.compiled
+
+def load_scene_notes(path):
+    """[(scene name, [note, ...]), ...] for every scene of a notes file, in file order."""
+    scenes = []
+    for scene_name, scene in json_io.read_json(path).items():
+        notes = []
+        if isinstance(scene, dict):
+            for line in scene.values():
+                if isinstance(line, dict) and isinstance(line.get('notes'), list):
+                    notes.extend(note for note in line['notes'] if isinstance(note, str) and note.strip())
+        scenes.append((scene_name, notes))
+    return scenes
+
+def load_notes(path=NOTES_FILE):
+    """Every non-empty note of a notes file, in file order."""
+    return [note for _, notes in load_scene_notes(path) for note in notes]
+
+def best_time(function, repeat):
+    """Best-of-repeat wall time of function(); returns (seconds, last result)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def expand_with_resub(text, references, bibliography):
+    """The previous expansion: one re.sub over the whole note per reference found."""
+    for ref in references:
+        if ref in bibliography:
+            text = re.sub(r'\b' + re.escape(ref) + r'\b', bibliography[ref], text)
+    return text
+
+def benchmark_expand(repeat=3):
+    """
+    Time the substitution step of reference expansion over every note: one
+    re.sub per reference (given the references each note contains) versus the
+    single-pass ReferenceMatcher, and count the notes where the old loop expanded
+    text it had already inserted.
+    """
+    compiled = load_bibliography()
+    bibliography = compiled.bibliography
+    notes = load_notes()
+    processor = CompleteNotesProcessor(bibliography, compiled=compiled)
+    print(f"=== EXPANSION BENCHMARK: {len(notes)} notes, {sum(map(len, notes)) / 1e3:.0f}k characters, "
+          f"{len(processor.matcher)} matcher keys ===")
+
+    # Only the exact references, so both sides replace the same keys
+    references = [[key for _, _, key in processor.matcher.find(note)] for note in notes]
+
+    resub_seconds, resub_notes = best_time(
+        lambda: [expand_with_resub(note, refs, bibliography) for note, refs in zip(notes, references)], repeat)
+    matcher_seconds, matcher_notes = best_time(
+        lambda: [processor.matcher.expand(note, bibliography)[0] for note in notes], repeat)
+
+    longest = max(range(len(notes)), key=lambda i: len(references[i]))
+    reexpanded = sum(1 for old, new in zip(resub_notes, matcher_notes) if old != new)
+
+    print(f"re.sub per reference: {resub_seconds * 1000:8.1f} ms")
+    print(f"ReferenceMatcher:     {matcher_seconds * 1000:8.1f} ms ({resub_seconds / matcher_seconds:.1f}x faster)")
+    print(f"Most references in one note: {len(references[longest])} in {len(notes[longest])} characters")
+    print(f"Notes where re.sub re-expanded its own output: {reexpanded}")
+
+    # One long text with many references: re.sub cost grows with length x references
+    joined = '\n'.join(notes[:100])
+    joined_references = [key for _, _, key in processor.matcher.find(joined)]
+    joined_resub, _ = best_time(lambda: expand_with_resub(joined, joined_references, bibliography), 1)
+    joined_matcher, _ = best_time(lambda: processor.matcher.expand(joined, bibliography), 1)
+    print(f"First 100 notes as one text ({len(joined_references)} references): re.sub {joined_resub:.2f} s, "
+          f"ReferenceMatcher {joined_matcher * 1000:.1f} ms")
+
+    return {'resub': resub_seconds, 'matcher': matcher_seconds, 'reexpanded': reexpanded,
+            'joined_resub': joined_resub, 'joined_matcher': joined_matcher}
+
+def linear_closest_match(processor, reference):
+    """The previous find_closest_match(): score every bibliography key."""
+    if not reference or len(reference) < 3:
+        return None
+    best_match = None
+    best_score = 0
+    for bib_key in processor.bibliography.keys():
+        score = processor.calculate_similarity(reference, bib_key)
+        if score > best_score and score > 0.7:
+            best_score = score
+            best_match = bib_key
+    return best_match
+
+def benchmark_fuzzy():
+    """
+    Look up every capitalized word of the notes that is not an exact key, as
+    find_all_references() does, with the linear scan and with the FuzzyIndex,
+    and check both return the same key for every word.
+    """
+    compiled = load_bibliography()
+    bibliography = compiled.bibliography
+    notes = load_notes()
+    processor = CompleteNotesProcessor(bibliography, compiled=compiled)
+
+    occurrences = [token for note in notes
+                   for token in CAPITALIZED.findall(note)
+                   if token not in bibliography]
+    words = sorted(set(occurrences))
+    print(f"=== FUZZY LOOKUP BENCHMARK: {len(occurrences)} lookups of {len(words)} distinct words, "
+          f"{len(bibliography)} keys ===")
+
+    start = time.perf_counter()
+    linear = [linear_closest_match(processor, word) for word in words]
+    linear_seconds = (time.perf_counter() - start) / len(words)
+
+    start = time.perf_counter()
+    indexed = [processor.find_closest_match(word) for word in words]
+    indexed_seconds = (time.perf_counter() - start) / len(words)
+
+    candidates = sum(len(processor.fuzzy_index.candidates(word)) for word in words) / len(words)
+    identical = linear == indexed
+
+    print(f"Linear scan: {linear_seconds * 1e6:8.1f} µs per lookup, {len(bibliography)} keys scored")
+    print(f"FuzzyIndex:  {indexed_seconds * 1e6:8.1f} µs per lookup, {candidates:.1f} candidates scored "
+          f"({linear_seconds / indexed_seconds:.0f}x faster)")
+    print(f"All {len(occurrences)} lookups in the notes: {linear_seconds * len(occurrences):.1f} s → "
+          f"{indexed_seconds * len(occurrences):.2f} s")
+    print(f"Same match for every word: {'✅' if identical else '❌'}")
+
+    return {'linear': linear_seconds, 'indexed': indexed_seconds, 'candidates': candidates, 'identical': identical}
+
+def benchmark_cache(paths=CACHE_NOTES_FILES):
+    """
+    Resolve every capitalized word of several notes files, scene by scene, the
+    way find_fuzzy_references() does: once with the uncached lookup and once with
+    a shared ResolutionCache, showing how the hit ratio builds up across scenes
+    and files and checking both give the same key for every word.
+    """
+    compiled = load_bibliography()
+    bibliography = compiled.bibliography
+    processor = CompleteNotesProcessor(bibliography, resolution_cache=ResolutionCache(), compiled=compiled)
+    cache = processor.resolution_cache
+
+    files = []
+    for path in paths:
+        scenes = [(scene_name, [token for note in notes for token in CAPITALIZED.findall(note)
+                                if token not in bibliography and len(token) >= 3])
+                  for scene_name, notes in load_scene_notes(path)]
+        files.append((path, [(scene_name, words) for scene_name, words in scenes if words]))
+
+    lookups = sum(len(words) for _, scenes in files for _, words in scenes)
+    print(f"=== RESOLUTION CACHE BENCHMARK: {lookups} lookups in {len(files)} notes files ===")
+
+    start = time.perf_counter()
+    uncached = [processor.score_closest_match(word)
+                for _, scenes in files for _, words in scenes for word in words]
+    uncached_seconds = time.perf_counter() - start
+
+    cached = []
+    cached_seconds = 0.0
+    for path, scenes in files:
+        for scene_number, (scene_name, words) in enumerate(scenes):
+            start = time.perf_counter()
+            cached.extend(processor.find_closest_match(word) for word in words)
+            cached_seconds += time.perf_counter() - start
+            if scene_number < 3:
+                print(f"  after {path} / {scene_name}: {cache.get_report()['hit_ratio']:.1%} hits so far")
+        print(f"  after {path}: {cache.get_report()['hit_ratio']:.1%} hits so far")
+
+    report = cache.get_report()
+    identical = uncached == cached
+    print(f"Uncached:         {uncached_seconds:.3f} s ({uncached_seconds / lookups * 1e6:.1f} µs per lookup)")
+    print(f"ResolutionCache:  {cached_seconds:.3f} s ({cached_seconds / lookups * 1e6:.1f} µs per lookup, "
+          f"{uncached_seconds / cached_seconds:.1f}x faster)")
+    print(f"Hit ratio: {report['hit_ratio']:.1%} ({report['entries']} entries, "
+          f"{report['negative_entries']} of them 'no match')")
+    print(f"Same match for every word: {'✅' if identical else '❌'}")
+
+    # A changed bibliography must not be answered from the old entries
+    bibliography['Zzyzx'] = 'Zzyzx test entry'
+    processor.set_bibliography(bibliography)
+    processor.find_closest_match('Zzyzx')
+    invalidated = cache.get_report()
+    print(f"After a bibliography edit: {invalidated['invalidations']} invalidation, "
+          f"{invalidated['entries']} entries left")
+    del bibliography['Zzyzx']
+
+    return {'uncached': uncached_seconds, 'cached': cached_seconds, 'hit_ratio': report['hit_ratio'],
+            'identical': identical}
+
+def benchmark_startup(repeat=5):
+    """
+    Time what the processor does before its first note: compiling the
+    bibliography file (the key table, matcher and fuzzy index that used to be
+    rebuilt from code on every run) versus loading the cached artifact, and
+    check the artifact gives the same key table.
+    """
+    print(f"=== STARTUP BENCHMARK: {bibliography_artifact.BIBLIOGRAPHY_FILE} ===")
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        compile_seconds, compiled = best_time(bibliography_artifact.compile_bibliography, repeat)
+        artifact_path = bibliography_artifact.write_artifact(compiled, artifact_dir)
+        load_seconds, loaded = best_time(lambda: bibliography_artifact.load_bibliography(artifact_dir=artifact_dir),
+                                         repeat)
+        artifact_bytes = os.path.getsize(artifact_path)
+
+    identical = list(loaded.bibliography.items()) == list(compiled.bibliography.items())
+    print(f"{len(compiled.entries)} entries -> {len(compiled.bibliography)} keys, "
+          f"{len(compiled.matcher)} matcher keys; artifact {artifact_bytes / 1e3:.0f} kB")
+    print(f"Compile from the data file: {compile_seconds * 1000:7.1f} ms")
+    print(f"Load cached artifact:       {load_seconds * 1000:7.1f} ms ({compile_seconds / load_seconds:.1f}x faster)")
+    print(f"Same key table: {'✅' if identical else '❌'}")
+
+    return {'compile': compile_seconds, 'load': load_seconds, 'bytes': artifact_bytes, 'identical': identical}
+
+def materialise_ocr_keys(source):
+    """The previous key table: bibliography_artifact's, plus a key per OCR substitution."""
+    bibliography = dict(source['entries'])
+    for key, value in source['entries'].items():
+        bibliography[key.lower()] = value
+        bibliography[key.title()] = value
+        bibliography[key.upper()] = value
+        for variant in source.get('variants', {}).get(key, ()):
+            bibliography[variant] = value
+        for char, replacements in OCR_SUBSTITUTIONS.items():
+            if char in key:
+                for replacement in replacements:
+                    bibliography[key.replace(char, replacement)] = value
+    return bibliography
+
+def benchmark_ocr(repeat=3):
+    """
+    Compare the key table with a materialised key per OCR substitution against
+    the base keys read through the confusion matrix: table size, exact matching
+    and fuzzy lookups over the notes, and check every materialised OCR key still
+    resolves to the same citation.
+    """
+    compiled = load_bibliography()
+    materialised = materialise_ocr_keys(json_io.read_json(bibliography_artifact.BIBLIOGRAPHY_FILE))
+    ocr_keys = [key for key in materialised if key not in compiled.bibliography]
+    old = CompleteNotesProcessor(materialised, resolution_cache=ResolutionCache())
+    new = CompleteNotesProcessor(compiled.bibliography, resolution_cache=ResolutionCache(), compiled=compiled)
+    print(f"=== OCR CONFUSION BENCHMARK: {len(materialised)} keys with OCR copies, "
+          f"{len(compiled.bibliography)} without ({len(compiled.confusions)} confusions, "
+          f"max cost {compiled.confusions.max_cost}) ===")
+
+    notes = load_notes()
+    old_find, old_matches = best_time(lambda: [old.matcher.find(note) for note in notes], repeat)
+    new_find, new_matches = best_time(lambda: [new.matcher.find(note) for note in notes], repeat)
+    same_expansions = ([[(start, end, materialised[key]) for start, end, key in found] for found in old_matches]
+                       == [[(start, end, compiled.bibliography[key]) for start, end, key in found]
+                           for found in new_matches])
+    print(f"Exact matching, {len(notes)} notes: {len(old.matcher)} trie keys {old_find * 1000:.1f} ms, "
+          f"{len(new.matcher)} trie keys with confusions {new_find * 1000:.1f} ms")
+
+    words = sorted({token for note in notes for token in CAPITALIZED.findall(note) if len(token) >= 3})
+    old_fuzzy, old_closest = best_time(lambda: [old.score_closest_match(word) for word in words], repeat)
+    new_fuzzy, new_closest = best_time(lambda: [new.score_closest_match(word) for word in words], repeat)
+
+    def candidates(processor):
+        return sum(len(processor.fuzzy_index.candidates(word)) for word in words) / len(words)
+
+    changed = [(word, a, b) for word, a, b in zip(words, old_closest, new_closest)
+               if (a and materialised[a]) != (b and compiled.bibliography[b])]
+    print(f"Fuzzy lookups, {len(words)} words: {old_fuzzy / len(words) * 1e6:.1f} µs ({candidates(old):.1f} candidates) "
+          f"→ {new_fuzzy / len(words) * 1e6:.1f} µs ({candidates(new):.1f} candidates) per word")
+    print(f"Close matches that changed: {len(changed)}, e.g. "
+          + ", ".join(f"{word} ~ {a} → {b}" for word, a, b in changed[:3]))
+
+    unresolved = []
+    for key in ocr_keys:
+        found = new.matcher.find(key)
+        if not (len(found) == 1 and found[0][:2] == (0, len(key))
+                and compiled.bibliography[found[0][2]] == materialised[key]):
+            unresolved.append(key)
+    print(f"OCR keys read through the confusion matrix: {len(ocr_keys) - len(unresolved)} of {len(ocr_keys)} "
+          f"{'✅' if not unresolved else '❌ ' + ', '.join(unresolved[:5])}")
+    print(f"Same expansions in every note: {'✅' if same_expansions else '❌'}")
+
+    return {'keys': (len(materialised), len(compiled.bibliography)), 'find': (old_find, new_find),
+            'fuzzy': (old_fuzzy, new_fuzzy), 'changed': len(changed), 'unresolved': unresolved,
+            'same_expansions': same_expansions}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bibliography reference expansion")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    expand_parser = subparsers.add_parser('expand', help="per-reference re.sub vs the single-pass matcher")
+    expand_parser.add_argument('--repeat', type=int, default=3)
+
+    subparsers.add_parser('fuzzy', help="linear find_closest_match vs the fuzzy index")
+
+    cache_parser = subparsers.add_parser('cache', help="fuzzy lookups with and without the resolution cache")
+    cache_parser.add_argument('paths', nargs='*', default=CACHE_NOTES_FILES)
+
+    startup_parser = subparsers.add_parser('startup', help="compiling the bibliography vs loading its artifact")
+    startup_parser.add_argument('--repeat', type=int, default=5)
+
+    ocr_parser = subparsers.add_parser('ocr', help="materialised OCR keys vs the confusion matrix")
+    ocr_parser.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'expand':
+        benchmark_expand(args.repeat)
+    elif args.benchmark == 'fuzzy':
+        benchmark_fuzzy()
+    elif args.benchmark == 'cache':
+        benchmark_cache(args.paths)
+    elif args.benchmark == 'startup':
+        benchmark_startup(args.repeat)
+    elif args.benchmark == 'ocr':
+        benchmark_ocr(args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# Columnar in-memory model of one play
+# The per-play JSON files ("ACT X SCENE Y": { "line_number": { "play": "SPEAKER: dialogue" } })
+# cost one dict and several strings per line once loaded. A ColumnarPlay holds the
+# same content in a handful of flat arrays:
+#   speakers       - interned speaker table
+#   speaker_ids    - speaker index per line (-1 when the line has no "SPEAKER: " prefix)
+#   line_numbers   - the JSON line-number key per line as an int (-1 for keys that are
+#                    not plain integers; those are kept in number_labels)
+#   scene_offsets  - index of the first line of each scene, plus the total line count
+#   text           - every line's dialogue in one string, sliced by text_offsets
+# Conversion to and from the JSON layout is lossless, and the model saves to its own
+# binary file (.colplay) that loads with a few array reads and one decode.
+
+import json
+import struct
+import sys
+from array import array
+
+import json_io
+
+MAGIC = b"COLPLAY1"
+HEADER_SIZE = struct.Struct("<I")
+MAX_LINE_NUMBER = 2 ** 31 - 1
+
+def _parse_line_number(label):
+    """Return label as an int if it round-trips exactly, else None."""
+    if label.isdigit() and label.isascii() and (label == "0" or label[0] != "0"):
+        number = int(label)
+        if number <= MAX_LINE_NUMBER:
+            return number
+    return None
+
+class ColumnarPlay:
+    """One play as interned speakers, integer columns, scene offsets and a text buffer."""
+
+    def __init__(self, scene_keys, speakers, speaker_ids, line_numbers, number_labels,
+                 scene_offsets, text, text_offsets):
+        self.scene_keys = scene_keys
+        self.speakers = speakers
+        self.speaker_ids = speaker_ids
+        self.line_numbers = line_numbers
+        self.number_labels = number_labels
+        self.scene_offsets = scene_offsets
+        self.text = text
+        self.text_offsets = text_offsets
+        self.scene_index = {key: i for i, key in enumerate(scene_keys)}
+
+    def __len__(self):
+        return len(self.speaker_ids)
+
+    @classmethod
+    def from_json_dict(cls, data):
+        """Build a ColumnarPlay from the per-play JSON layout."""
+        scene_keys = []
+        speakers = []
+        speaker_table = {}
+        speaker_ids = array('i')
+        line_numbers = array('i')
+        number_labels = {}
+        scene_offsets = array('I', [0])
+        texts = []
+        text_offsets = array('I', [0])
+        position = 0
+
+        for scene_key, lines in data.items():
+            scene_keys.append(scene_key)
+            for label, entry in lines.items():
+                if len(entry) != 1 or 'play' not in entry:
+                    raise ValueError(f"{scene_key} line {label}: expected only a 'play' entry, got {sorted(entry)}")
+                play_text = entry['play']
+
+                speaker, separator, dialogue = play_text.partition(': ')
+                if separator:
+                    speaker_id = speaker_table.get(speaker)
+                    if speaker_id is None:
+                        speaker_id = speaker_table[speaker] = len(speakers)
+                        speakers.append(sys.intern(speaker))
+                else:
+                    speaker_id = -1
+                    dialogue = play_text
+
+                number = _parse_line_number(label)
+                if number is None:
+                    number_labels[len(speaker_ids)] = label
+                    number = -1
+
+                speaker_ids.append(speaker_id)
+                line_numbers.append(number)
+                texts.append(dialogue)
+                position += len(dialogue)
+                text_offsets.append(position)
+
+            scene_offsets.append(len(speaker_ids))
+
+        return cls(scene_keys, speakers, speaker_ids, line_numbers, number_labels,
+                   scene_offsets, ''.join(texts), text_offsets)
+
+    @classmethod
+    def load_json(cls, json_path):
+        """Load a per-play JSON file into the columnar model."""
+        return cls.from_json_dict(json_io.read_json(json_path))
+
+    def line_label(self, index):
+        """The JSON line-number key of a line."""
+        number = self.line_numbers[index]
+        if number < 0:
+            return self.number_labels[index]
+        return str(number)
+
+    def speaker(self, index):
+        """The speaker of a line, or None."""
+        speaker_id = self.speaker_ids[index]
+        return self.speakers[speaker_id] if speaker_id >= 0 else None
+
+    def dialogue(self, index):
+        """The text of a line without its speaker prefix."""
+        return self.text[self.text_offsets[index]:self.text_offsets[index + 1]]
+
+    def play_text(self, index):
+        """The line as stored in the JSON "play" entry."""
+        speaker_id = self.speaker_ids[index]
+        dialogue = self.text[self.text_offsets[index]:self.text_offsets[index + 1]]
+        if speaker_id < 0:
+            return dialogue
+        return f"{self.speakers[speaker_id]}: {dialogue}"
+
+    def scene_range(self, scene_key):
+        """(first, end) line indexes of a scene."""
+        i = self.scene_index[scene_key]
+        return self.scene_offsets[i], self.scene_offsets[i + 1]
+
+    def scene_lines(self, scene_key):
+        """Yield (line label, speaker, dialogue) for every line of a scene."""
+        first, end = self.scene_range(scene_key)
+        for index in range(first, end):
+            yield self.line_label(index), self.speaker(index), self.dialogue(index)
+
+    def to_json_dict(self):
+        """Rebuild the per-play JSON layout."""
+        data = {}
+        for i, scene_key in enumerate(self.scene_keys):
+            data[scene_key] = {
+                self.line_label(index): {"play": self.play_text(index)}
+                for index in range(self.scene_offsets[i], self.scene_offsets[i + 1])
+            }
+        return data
+
+    def save_json(self, json_path, compact=False):
+        """Write the per-play JSON file, formatted like txt_to_json_converter.py's output."""
+        json_io.write_json(json_path, self.to_json_dict(), compact)
+
+    def save(self, path):
+        """
+        Write the binary .colplay file: MAGIC, header length, a JSON header with the
+        small tables, then the integer columns and the UTF-8 text buffer.
+        """
+        text_bytes = self.text.encode('utf-8')
+        header = json.dumps({
+            'byteorder': sys.byteorder,
+            'scene_keys': self.scene_keys,
+            'speakers': self.speakers,
+            'number_labels': {str(index): label for index, label in self.number_labels.items()},
+            'lines': len(self.speaker_ids),
+            'text_bytes': len(text_bytes)
+        }, ensure_ascii=False).encode('utf-8')
+
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(HEADER_SIZE.pack(len(header)))
+            f.write(header)
+            for column in (self.scene_offsets, self.speaker_ids, self.line_numbers, self.text_offsets):
+                column.tofile(f)
+            f.write(text_bytes)
+
+    @classmethod
+    def load(cls, path):
+        """Read a .colplay file written by save()."""
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a columnar play file")
+            header_size, = HEADER_SIZE.unpack(f.read(HEADER_SIZE.size))
+            header = json.loads(f.read(header_size))
+            lines = header['lines']
+
+            columns = []
+            for typecode, count in (('I', len(header['scene_keys']) + 1), ('i', lines), ('i', lines), ('I', lines + 1)):
+                column = array(typecode)
+                column.fromfile(f, count)
+                if header['byteorder'] != sys.byteorder:
+                    column.byteswap()
+                columns.append(column)
+            scene_offsets, speaker_ids, line_numbers, text_offsets = columns
+
+            text = f.read(header['text_bytes']).decode('utf-8')
+
+        speakers = [sys.intern(speaker) for speaker in header['speakers']]
+        number_labels = {int(index): label for index, label in header['number_labels'].items()}
+        return cls(header['scene_keys'], speakers, speaker_ids, line_numbers, number_labels,
+                   scene_offsets, text, text_offsets)
+
+def main():
+    """Convert per-play JSON files to .colplay files: python columnar_play.py <play.json> ..."""
+    if len(sys.argv) < 2:
+        print("Usage: python columnar_play.py <play.json> ...")
+        return
+
+    for json_path in sys.argv[1:]:
+        play = ColumnarPlay.load_json(json_path)
+        colplay_path = json_path[:-len('.json')] + '.colplay' if json_path.endswith('.json') else json_path + '.colplay'
+        play.save(colplay_path)
+        print(f"✓ {json_path} → {colplay_path} ({len(play.scene_keys)} scenes, "
+              f"{len(play)} lines, {len(play.speakers)} speakers)")
+
+if __name__ == "__main__":
+    main()
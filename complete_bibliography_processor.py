@@ -4,415 +4,37 @@ COMPLETE Bibliography Processor
 Uses comprehensive pre-defined bibliography instead of OCR extraction.
 """
 
-import json
+import argparse
 import re
 import os
 from typing import Dict, List, Tuple, Optional
 
+import json_io
+from bibliography_artifact import load_bibliography
+from fuzzy_index import FuzzyIndex
+from lazy_notes import LazyNotes
+from reference_matcher import ReferenceMatcher
+from resolution_cache import MISSING, bibliography_fingerprint, get_resolution_cache
+from scene_keys import SceneIndex
+
 class CompleteBibliographyExtractor:
     """Uses comprehensive pre-defined bibliography instead of OCR extraction."""
     
     def __init__(self):
         self.bibliography = {}
+        self.compiled = None
     
     def extract_complete_bibliography(self) -> Dict[str, str]:
         """Use comprehensive pre-defined bibliography instead of OCR extraction."""
         print("=== USING COMPREHENSIVE PRE-DEFINED BIBLIOGRAPHY ===")
         
-        # Comprehensive bibliography with proper formatting
-        base_bibliography = {
-            "Abbott": "E. A. Abbott, Shakespearean Grammar, London, 1870",
-            "Allen": "Prof. Allen, MS Notes on Macbeth, 1867",
-            "Angellier": "Angellier et Montegut, Macbeth, Paris, 1889",
-            "Anonymous": "Variorum Edition of Macbeth, London, 1807",
-            "Archer": "W. Archer and R. W. Lowe, Macbeth on the Stage (English Illustrated Magazine, December)",
-            "Arrowsmith": "W. R. Arrowsmith, Shakespeare's Editors and Commentators",
-            "Badham": "C. Badham, Text of Shakespeare (Cambridge Essays)",
-            "Bailey": "S. Bailey, The Received Text of Shakespeare",
-            "Baret": "J. Baret, An Alvearie",
-            "Barhurst": "C. Barhurst, Differences of Shakespeare's Versification",
-            "Baynes": "T. S. Baynes, Shakespeare Studies and other Essays",
-            "Beaumont and Fletcher": "Beaumont and Fletcher, Works (ed. Dyce)",
-            "Becket": "A. Becket, Shakespeare Himself Again",
-            "Beisley": "S. Beisley, Shakespeare's Garden",
-            "Benda": "J. W. O. Benda, Shakespeare's Dramatische Werke",
-            "Bell": "G. J. Bell, Notes on Mrs. Siddons's Lady Macbeth, 1875",
-            "Birch": "W. J. Birch, Inquiry into the Philosophy and Religion of Shakespeare, 1867",
-            "Bittinger": "J. B. Bittinger, Transactions American Philological Association, 1865",
-            "Bladen": "J. B. Bladen, Life of J. P. Kemble, 1825",
-            "Boas": "F. S. Boas, Shakespeare and his Predecessors",
-            "Booth": "Edwin Booth, Macbeth, Prompt-book (ed. W. Winter)",
-            "Breal": "M. Breal, Shakespeare's Dramatische Werke, Paris, 1861",
-            "Brockman": "A. Brockman, Shakespeare's Autobiographical Poems",
-            "Brown": "H. B. Brown, M.S. Notes on Macbeth",
-            "Brunner": "H. Brunner, Shakespeare's Dramatische Werke",
-            "Büchner": "H. Büchner, Shakespeare's Dramatische Werke",
-            "Bullen": "A. H. Bullen, Studies in the Text of Shakespeare",
-            "Bunsen": "G. V. Bunsen, Macbeth",
-            "Burlingame": "E. L. Burlingame, Shakespeare's Life and his Works, New York, 1889",
-            "Burnet": "J. H. Burnet, Shakespeare's Dramatic and Poetic Works",
-            "Campbell": "L. Campbell, Life of Mrs. Siddons",
-            "Capell": "E. Capell, Notes, 1779",
-            "Carolus": "P. G. E. Carolus, Macbeth, 1866",
-            "Clemens": "E. W. Clemens, Shakespeare's Life and his Works",
-            "Coleridge": "Samuel Taylor Coleridge, Lectures and Notes on Shakespeare, London, 1849",
-            "Collier": "J. P. Collier, Annals of the Stage",
-            "Cowden Clarke": "M. Cowden Clarke, The Shakespeare Key, London, 1879",
-            "Craik": "G. L. Craik, English of Shakespeare",
-            "Crisp": "G. H. Crisp, Shakespeare's Words, London, 1861",
-            "Cruikshank": "J. Cruikshank, Shakespeare's Dramatic Characters",
-            "Darmstetter": "A. Darmstetter, Macbeth, Paris, 1881",
-            "Davies": "T. Davies, Dramatic Miscellanies",
-            "De Quincey": "De Quincey, Miscellaneous Essays",
-            "Delius": "Nicolaus Delius, Shakespeare's Werke, Elberfeld, 1854-1861",
-            "Dodd": "W. Dodd, Shakespeare's Beauties, London, 1780",
-            "Draken": "R. Draken, Macbeth",
-            "Drake": "N. Drake, Shakespeare and His Times",
-            "Dryden": "J. Dryden, Notes on Shakespeare",
-            "Dunscombe": "J. Dunscombe, Shakespeare's Plays",
-            "Dyer": "F. T. Dyer, Folk-Lore of Shakespeare",
-            "Eaton": "T. R. Eaton, Shakespeare and the Bible, London, 1888",
-            "Edwards": "T. Edwards, Canons of Criticism, London, 1765",
-            "Elizur": "A. Elizur, Early English Pronunciation, 1876",
-            "Elze": "K. Elze, Shakespeare's Life and His Work, London, 1886",
-            "Fairholt": "F. W. Fairholt, Shakespeare's Armorial, Norwich, 1853",
-            "Fischer": "K. Fischer, Shakespeare's Dramatische Werke, Stuttgart, 1866",
-            "Fleay": "F. G. Fleay, Shakespearean Manual, London, 1876",
-            "Fletcher": "George Fletcher, Studies of Shakespeare, London, 1847",
-            "Florio": "J. Florio, A World of Words",
-            "Forde": "J. Forde, Works (ed. Gilford)",
-            "Forster": "J. Forster, Some Notes on Shakespeare's Characters",
-            "Fraser": "J. Fraser, Shakespeare and the Bible, London, 1888",
-            "Frey": "A. R. Frey, Shakespeare's Diction",
-            "Friedmann": "L. Friedmann, Shakespeare's Werke, Berlin, 1877",
-            "Fritsch": "O. Fritsch, Shakespeare's Dramatische Werke, Stuttgart, 1866",
-            "Furness": "H. H. Furness, Macbeth, Variorum Edition, Philadelphia, 1873",
-            "Gildon": "J. Gildon, Shakespeare's Works, London, 1710",
-            "Grant": "A. Grant, Shakespeare's Works, London, 1884",
-            "Gray": "A. G. Gray, Shakespeare's Dramatic Works, Boston, 1868",
-            "Halliwell": "James Orchard Halliwell-Phillipps, The Works of William Shakespeare, London, 1853-1865",
-            "Hall-Stevenson": "W. Hall-Stevenson, Shakespeare's Dramatic Works, London, 1877",
-            "Harding": "S. Harding, Shakespeare's Plays, London, 1866",
-            "Harington": "J. Harington, Shakespeare's Life, Art, and Character",
-            "Harness": "W. Harness, Shakespeare's Plays, London, 1830",
-            "Hart": "H. C. Hart, Shakespeare's Plays, Dublin, 1881",
-            "Havers": "T. Havers, Shakespeare's Plays, London, 1886",
-            "Haynes": "J. Haynes, Shakespeare's Plays, London, 1859",
-            "Henley": "W. E. Henley, Shakespeare's Plays, London, 1886",
-            "Hennell": "J. Hennell, Shakespeare's Plays, London, 1836",
-            "Herbert": "H. Herbert, Shakespeare's Plays, London, 1863",
-            "Hilaire": "G. Hilaire, Shakespeare's Plays, Paris, 1849",
-            "Hilberg": "H. Hilberg, Shakespeare's Plays, Leipzig, 1890",
-            "Hilgenfeld": "J. Hilgenfeld, Shakespeare's Plays, 1860",
-            "Hildebrand": "W. Hildebrand, Shakespeare's Dramatic Works, Berlin, 1864",
-            "Holland": "T. H. Holland, Shakespeare's Life and his Works, London, 1864",
-            "Holliday": "J. Holliday, Shakespeare's Dramatic Works, London, 1799",
-            "Holmes": "J. Holmes, Shakespeare's Life and his Works, London, 1866",
-            "Honey": "R. G. Honey, Macbeth",
-            "Hudson": "H. N. Hudson, Shakespeare's Life, Art, and Character",
-            "Hugo": "V. Hugo, Shakespeare's Works",
-            "Hunter": "Joseph Hunter, New Illustrations of the Life, Studies, and Writings of Shakespeare, London, 1845",
-            "Ingleby": "C. M. Ingleby, Shakespeare's Life, Art, and Character",
-            "Ingram": "J. H. Ingram, Shakespeare's Life, Art, and Character",
-            "Irving": "Henry Irving, Macbeth: Acting Version, London, 1889",
-            "Jackson": "J. Jackson, Shakespeare's Life, Art, and Character",
-            "James": "A. James, Shakespeare's Life, Art, and Character",
-            "Jenner": "H. Jenner, Shakespeare's Life, Art, and Character",
-            "Jereli": "J. Jereli, Shakespeare's Life, Art, and Character",
-            "Jolier": "J. Jolier, Shakespeare's Life, Art, and Character",
-            "Kalm": "J. Kalm, Shakespeare's Life, Art, and Character",
-            "Keary": "H. F. Keary, Shakespeare's Life, Art, and Character",
-            "Kellogg": "J. L. Kellogg, Shakespeare's Life, Art, and Character",
-            "Kerner": "A. Kerner, Shakespeare's Life, Art, and Character",
-            "Kindermann": "J. Kindermann, Shakespeare's Life, Art, and Character",
-            "Knight": "Charles Knight, The Pictorial Edition of the Works of Shakespeare, London, 1838-1843",
-            "Kruse": "A. Kruse, Shakespeare's Life, Art, and Character",
-            "Kühling": "J. Kühling, Shakespeare's Life, Art, and Character",
-            "Köller": "J. P. Köller, Shakespeare's Life, Art, and Character",
-            "Kreyssig": "J. Kreyssig, Shakespeare's Life, Art, and Character",
-            "Kurth": "A. M. Kurth, Shakespeare's Life, Art, and Character",
-            "Lambert": "G. Lambert, Shakespeare's Life, Art, and Character",
-            "Lanchs": "J. Lanchs, Shakespeare's Life, Art, and Character",
-            "Lang": "A. Lang, Shakespeare's Life, Art, and Character",
-            "Laurent": "J. Laurent, Shakespeare's Life, Art, and Character",
-            "Lester": "H. Lester, Shakespeare's Life, Art, and Character",
-            "Lewes": "G. H. Lewes, Shakespeare's Life, Art, and Character",
-            "Lillo": "G. Lillo, Shakespeare's Life, Art, and Character",
-            "Lindner": "J. Lindner, Shakespeare's Life, Art, and Character",
-            "Lister": "H. Lister, Shakespeare's Life, Art, and Character",
-            "Lounsbury": "T. R. Lounsbury, Shakespeare's Life, Art, and Character",
-            "Lowell": "J. R. Lowell, Shakespeare's Life, Art, and Character",
-            "Lubbock": "J. Lubbock, Shakespeare's Life, Art, and Character",
-            "Macaulay": "T. B. Macaulay, Shakespeare's Life, Art, and Character",
-            "MacDonald": "G. MacDonald, Shakespeare's Life, Art, and Character",
-            "Mackintosh": "A. Mackintosh, Shakespeare's Life, Art, and Character",
-            "Macnaught": "A. Macnaught, Shakespeare's Life, Art, and Character",
-            "Magnus": "H. Magnus, Shakespeare's Life, Art, and Character",
-            "Mair": "C. Mair, Shakespeare's Life, Art, and Character",
-            "Malone": "E. Malone, Shakespeare's Life, Art, and Character",
-            "Manning": "T. Manning, Shakespeare's Life, Art, and Character",
-            "Menzel": "A. Menzel, Shakespeare's Life, Art, and Character",
-            "Michaud": "J. Michaud, Shakespeare's Life, Art, and Character",
-            "Milman": "H. Milman, Shakespeare's Life, Art, and Character",
-            "Moser": "J. Moser, Shakespeare's Life, Art, and Character",
-            "Muller": "M. Muller, Shakespeare's Life, Art, and Character",
-            "Mundt": "T. Mundt, Shakespeare's Life, Art, and Character",
-            "Munich": "R. Munich, Shakespeare's Life, Art, and Character",
-            "Murray": "James A. H. Murray, A New English Dictionary on Historical Principles, Oxford, 1888-1928",
-            "Mutter": "H. Mutter, Shakespeare's Life, Art, and Character",
-            "Nash": "G. Nash, Shakespeare's Life, Art, and Character",
-            "Nuttall": "P. Nuttall, Shakespeare's Life, Art, and Character",
-            "Ogle": "J. Ogle, Shakespeare's Life, Art, and Character",
-            "O'Hanlon": "R. O'Hanlon, Shakespeare's Life, Art, and Character",
-            "Olin": "C. Olin, Shakespeare's Life, Art, and Character",
-            "Oliphant": "L. Oliphant, Shakespeare's Life, Art, and Character",
-            "Otto": "J. Otto, Shakespeare's Life, Art, and Character",
-            "Palmer": "F. Palmer, Shakespeare's Life, Art, and Character",
-            "Park": "T. Park, Shakespeare's Life, Art, and Character",
-            "Pasco": "T. Pasco, Shakespeare's Life, Art, and Character",
-            "Paterson": "W. Paterson, Shakespeare's Life, Art, and Character",
-            "Patterson": "T. Patterson, Shakespeare's Life, Art, and Character",
-            "Peers": "J. Peers, Shakespeare's Life, Art, and Character",
-            "Phillimore": "G. Phillimore, Shakespeare's Life, Art, and Character",
-            "Philippi": "A. Philippi, Shakespeare's Life, Art, and Character",
-            "Phillips": "J. Phillips, Shakespeare's Life, Art, and Character",
-            "Pritchard": "R. Pritchard, Shakespeare's Life, Art, and Character",
-            "Rassmann": "W. Rassmann, Shakespeare's Life, Art, and Character",
-            "Reed": "I. Reed, Shakespeare's Life, Art, and Character",
-            "Ritson": "J. Ritson, Shakespeare's Life, Art, and Character",
-            "Rohlfs": "J. Rohlfs, Shakespeare's Life, Art, and Character",
-            "Rolfe": "W. J. Rolfe, Shakespeare's Life, Art, and Character",
-            "Rümelin": "G. Rümelin, Shakespeare's Life, Art, and Character",
-            "Russell": "W. Russell, Shakespeare's Life, Art, and Character",
-            "Sabine": "J. Sabine, Shakespeare's Life, Art, and Character",
-            "Sandys": "W. Sandys, Shakespeare's Life, Art, and Character",
-            "Schmidt": "A. Schmidt, Shakespeare's Life, Art, and Character",
-            "Schwarz": "H. Schwarz, Shakespeare's Life, Art, and Character",
-            "Seward": "W. Seward, Shakespeare's Life, Art, and Character",
-            "Seymour": "E. H. Seymour, Shakespeare's Life, Art, and Character",
-            "Singer": "S. W. Singer, Shakespeare's Life, Art, and Character",
-            "Skeat": "W. W. Skeat, Shakespeare's Life, Art, and Character",
-            "Skottowe": "A. Skottowe, Shakespeare's Life, Art, and Character",
-            "Snedeker": "J. D. Snedeker, Shakespeare's Life, Art, and Character",
-            "Spencer": "A. Spencer, Shakespeare's Life, Art, and Character",
-            "Stahr": "A. Stahr, Shakespeare's Life, Art, and Character",
-            "Stephens": "S. Stephens, Shakespeare's Life, Art, and Character",
-            "Stoker": "W. Stoker, Shakespeare's Life, Art, and Character",
-            "Stones": "W. Stones, Shakespeare's Life, Art, and Character",
-            "Sturzen": "H. Sturzen, Shakespeare's Life, Art, and Character",
-            "Taine": "H. Taine, Shakespeare's Life, Art, and Character",
-            "Tausch": "H. Tausch, Shakespeare's Life, Art, and Character",
-            "Thirlwall": "C. Thirlwall, Shakespeare's Life, Art, and Character",
-            "Thoms": "W. J. Thoms, Shakespeare's Life, Art, and Character",
-            "Timms": "J. Timms, Shakespeare's Life, Art, and Character",
-            "Tobin": "J. Tobin, Shakespeare's Life, Art, and Character",
-            "Tolman": "A. H. Tolman, Shakespeare's Life, Art, and Character",
-            "Travers": "R. Travers, Shakespeare's Life, Art, and Character",
-            "Trebitsch": "E. Trebitsch, Shakespeare's Life, Art, and Character",
-            "Trebitschwitz": "H. Trebitschwitz, Shakespeare's Life, Art, and Character",
-            "Trelawny": "E. Trelawny, Shakespeare's Life, Art, and Character",
-            "Trench": "A. Trench, Shakespeare's Life, Art, and Character",
-            "Tyler": "A. Tyler, Shakespeare's Life, Art, and Character",
-            "Tyssen": "J. Tyssen, Shakespeare's Life, Art, and Character",
-            "Upton": "J. Upton, Shakespeare's Life, Art, and Character",
-            "Upjohn": "A. F. Upjohn, Shakespeare's Life, Art, and Character",
-            "Urie": "J. E. Urie, Shakespeare's Life, Art, and Character",
-            "Van Dam": "B. A. P. Van Dam, Shakespeare's Life, Art, and Character",
-            "Veirer": "A. F. Veirer, Shakespeare's Life, Art, and Character",
-            "Villain": "E. Villain, Shakespeare's Life, Art, and Character",
-            "Vischer": "F. T. Vischer, Shakespeare's Life, Art, and Character",
-            "Voigt": "H. Voigt, Shakespeare's Life, Art, and Character",
-            "Von": "H. Von, Shakespeare's Life, Art, and Character",
-            "Walker": "W. S. Walker, Shakespeare's Life, Art, and Character",
-            "Wall": "W. Wall, Shakespeare's Life, Art, and Character",
-            "Ware": "H. Ware, Shakespeare's Life, Art, and Character",
-            "Weller": "J. Weller, Shakespeare's Life, Art, and Character",
-            "Wellesley": "R. Wellesley, Shakespeare's Life, Art, and Character",
-            "Werrer": "K. Werrer, Shakespeare's Life, Art, and Character",
-            "Wetz": "W. Wetz, Shakespeare's Life, Art, and Character",
-            "Wheatley": "H. B. Wheatley, Shakespeare's Life, Art, and Character",
-            "Wilde": "O. Wilde, Shakespeare's Life, Art, and Character",
-            "Williams": "R. Williams, Shakespeare's Life, Art, and Character",
-            "Winter": "W. Winter, Shakespeare's Life, Art, and Character",
-            "Wordsworth": "C. Wordsworth, Shakespeare's Life, Art, and Character",
-            "Crowley": "K. Crowley, Shakespeare's Life, Art, and Character",
-            "Whitaker": "W. Whitaker, Shakespeare's Life, Art, and Character",
-            "White": "Richard Grant White, The Works of William Shakespeare, Boston, 1857-1866",
-            "Wither": "J. Wither, Shakespeare's Life, Art, and Character",
-            "Wool": "E. H. Wool, Shakespeare's Life, Art, and Character",
-            "Zimmermann": "K. Zimmermann, Shakespeare's Life, Art, and Character",
-            "Zoological": "J. Zoological, Shakespeare's Life, Art, and Character",
-            "Herrick": "R. Herrick, Shakespeare's Life, Art, and Character",
-            "Horne": "R. H. Horne, Shakespeare's Life, Art, and Character",
-            "Forrester": "J. Forster, Shakespeare's Life, Art, and Character",
-            "Forrest": "R. Forrest, Shakespeare's Life, Art, and Character",
-            "Fowler": "T. Fowler, Shakespeare's Life, Art, and Character",
-            "Franz": "H. Franz, Shakespeare's Life, Art, and Character",
-            "Frohlich": "J. Frohlich, Shakespeare's Life, Art, and Character",
-            "Frost": "T. Frost, Shakespeare's Life, Art, and Character",
-            "Froude": "J. A. Froude, Shakespeare's Life, Art, and Character",
-            "Gilfillan": "G. Gilfillan, Shakespeare's Life, Art, and Character",
-            "Glaser": "C. Glaser, Shakespeare's Life, Art, and Character",
-            "Gollancz": "I. Gollancz, Shakespeare's Life, Art, and Character",
-            "Goodrich": "F. L. Goodrich, Shakespeare's Life, Art, and Character",
-            "Gordon": "R. Gordon, Shakespeare's Life, Art, and Character",
-            "Goulburn": "E. M. Goulburn, Shakespeare's Life, Art, and Character",
-            "Gould": "S. Baring-Gould, Shakespeare's Life, Art, and Character",
-            "Graves": "G. Graves, Shakespeare's Life, Art, and Character",
-            "Green": "H. Green, Shakespeare's Life, Art, and Character",
-            "Greene": "R. Greene, Shakespeare's Life, Art, and Character",
-            "Greswell": "W. Greswell, Shakespeare's Life, Art, and Character",
-            "Griffin": "J. Griffin, Shakespeare's Life, Art, and Character",
-            "Grote": "G. Grote, Shakespeare's Life, Art, and Character",
-            "Guizot": "F. P. G. Guizot, Shakespeare's Life, Art, and Character",
-            "Haber": "J. Haber, Shakespeare's Life, Art, and Character",
-            "Hackett": "J. H. Hackett, Shakespeare's Life, Art, and Character",
-            "Hall": "A. Hall, Shakespeare's Life, Art, and Character",
-            "Harris": "H. Harris, Shakespeare's Life, Art, and Character",
-            "Hart": "A. Hart, Shakespeare's Life, Art, and Character",
-            "Hawthorne": "N. Hawthorne, Shakespeare's Life, Art, and Character",
-            "Hazlitt": "W. Hazlitt, Shakespeare's Life, Art, and Character",
-            "Helder": "J. Helder, Shakespeare's Life, Art, and Character",
-            "Johnson": "Samuel Johnson, The Plays of William Shakespeare, London, 1765",
-            "Steevens": "George Steevens, The Works of Shakespeare, London, 1793",
-            "Dyce": "Alexander Dyce, The Works of Shakespeare, London, 1857",
-            "Delius": "Nicolaus Delius, Shakespeare's Werke, Elberfeld, 1854-1861",
-            "Knight": "Charles Knight, The Pictorial Edition of the Works of Shakespeare, London, 1838-1843",
-            "Hunter": "Joseph Hunter, New Illustrations of the Life, Studies, and Writings of Shakespeare, London, 1845",
-            "Coleridge": "Samuel Taylor Coleridge, Lectures and Notes on Shakespeare, London, 1849",
-            "Dowden": "Edward Dowden, Shakspere: A Critical Study of his Mind and Art, London, 1875",
-            "Snider": "Denton J. Snider, The Shakespearean Drama, St. Louis, 1887",
-            "Spalding": "Thomas Alfred Spalding, Elizabethan Demonology, London, 1880",
-            "Leighton": "William Leighton, The Works of Shakespeare, London, 1880",
-            "Irving": "Henry Irving, Macbeth: Acting Version, London, 1889",
-            "Sherman": "Lucius A. Sherman, Analytics of Literature, Boston, 1893",
-            "Elwin": "Whitwell Elwin, The Works of Shakespeare, London, 1853",
-            "White": "Richard Grant White, The Works of William Shakespeare, Boston, 1857-1866",
-            "Clarendon": "William George Clark and William Aldis Wright, The Works of William Shakespeare, Oxford, 1863-1866",
-            "Tollett": "George Tollett, Annotations on Shakespeare, London, 1787",
-            "Halliwell": "James Orchard Halliwell-Phillipps, The Works of William Shakespeare, London, 1853-1865",
-            "Nares": "Robert Nares, A Glossary, or Collection of Words, Phrases, Names, and Allusions, London, 1822",
-            "Murray": "James A. H. Murray, A New English Dictionary on Historical Principles, Oxford, 1888-1928",
-            "Jennens": "Charles Jennens, King Lear, London, 1770",
-            "Rowe": "Nicholas Rowe, The Works of Mr. William Shakespeare, London, 1709",
-            "Fletcher": "George Fletcher, Studies of Shakespeare, London, 1847",
-            "Carmichael": "Charlotte Carmichael, Academy, 8 Feb. 1879",
-            "Coleman": "J. Coleman, Macbeth: Acting Version, London, 1889",
-            "Boppenstedt": "Boppenstedt, Macbeth: Acting Version, London, 1889"
-        }
-        
-        # Add variations for spelling errors and case sensitivity
-        self.bibliography = base_bibliography.copy()
-        
-        # Add case variations (lowercase, title case, etc.)
-        for key, value in base_bibliography.items():
-            # Lowercase variation
-            self.bibliography[key.lower()] = value
-            # Title case variation (first letter capitalized)
-            self.bibliography[key.title()] = value
-            # Uppercase variation
-            self.bibliography[key.upper()] = value
-            
-            # Handle common spelling variations
-            if key == "Abbott":
-                self.bibliography["Abott"] = value  # Missing 'b'
-                self.bibliography["Abbot"] = value  # Missing 't'
-            elif key == "Johnson":
-                self.bibliography["Jonson"] = value  # Common misspelling
-                self.bibliography["Johnston"] = value  # Common variation
-            elif key == "Steevens":
-                self.bibliography["Stevens"] = value  # Missing 'e'
-                self.bibliography["Steevins"] = value  # Missing 'e'
-            elif key == "Dyce":
-                self.bibliography["Dice"] = value  # Common misspelling
-                self.bibliography["Dyse"] = value  # Common misspelling
-            elif key == "Delius":
-                self.bibliography["Delious"] = value  # Common misspelling
-                self.bibliography["Delius"] = value  # Keep original
-            elif key == "Knight":
-                self.bibliography["Night"] = value  # Missing 'K'
-                self.bibliography["Knight"] = value  # Keep original
-            elif key == "Hunter":
-                self.bibliography["Hunt"] = value  # Common abbreviation
-                self.bibliography["Hunters"] = value  # Plural variation
-            elif key == "Coleridge":
-                self.bibliography["Coleridge"] = value  # Keep original
-                self.bibliography["Colridge"] = value  # Missing 'e'
-            elif key == "Dowden":
-                self.bibliography["Dowden"] = value  # Keep original
-                self.bibliography["Dowding"] = value  # Common variation
-            elif key == "Snider":
-                self.bibliography["Snider"] = value  # Keep original
-                self.bibliography["Schneider"] = value  # German variation
-            elif key == "Spalding":
-                self.bibliography["Spalding"] = value  # Keep original
-                self.bibliography["Spalding"] = value  # Keep original
-            elif key == "Leighton":
-                self.bibliography["Leighton"] = value  # Keep original
-                self.bibliography["Layton"] = value  # Common variation
-            elif key == "Irving":
-                self.bibliography["Irving"] = value  # Keep original
-                self.bibliography["Erving"] = value  # Common misspelling
-            elif key == "Sherman":
-                self.bibliography["Sherman"] = value  # Keep original
-                self.bibliography["Shermann"] = value  # Double 'n'
-            elif key == "Elwin":
-                self.bibliography["Elwin"] = value  # Keep original
-                self.bibliography["Elwyn"] = value  # Common variation
-            elif key == "White":
-                self.bibliography["White"] = value  # Keep original
-                self.bibliography["Whyte"] = value  # Common variation
-            elif key == "Clarendon":
-                self.bibliography["Clarendon"] = value  # Keep original
-                self.bibliography["Clarendon"] = value  # Keep original
-            elif key == "Tollett":
-                self.bibliography["Tollett"] = value  # Keep original
-                self.bibliography["Tollet"] = value  # Missing 't'
-            elif key == "Halliwell":
-                self.bibliography["Halliwell"] = value  # Keep original
-                self.bibliography["Halliwel"] = value  # Missing 'l'
-            elif key == "Nares":
-                self.bibliography["Nares"] = value  # Keep original
-                self.bibliography["Nair"] = value  # Common variation
-            elif key == "Murray":
-                self.bibliography["Murray"] = value  # Keep original
-                self.bibliography["Murry"] = value  # Common misspelling
-            elif key == "Jennens":
-                self.bibliography["Jennens"] = value  # Keep original
-                self.bibliography["Jennings"] = value  # Common variation
-            elif key == "Rowe":
-                self.bibliography["Rowe"] = value  # Keep original
-                self.bibliography["Row"] = value  # Missing 'e'
-            elif key == "Fletcher":
-                self.bibliography["Fletcher"] = value  # Keep original
-                self.bibliography["Fletch"] = value  # Common abbreviation
-            elif key == "Carmichael":
-                self.bibliography["Carmichael"] = value  # Keep original
-                self.bibliography["Carmichael"] = value  # Keep original
-            elif key == "Coleman":
-                self.bibliography["Coleman"] = value  # Keep original
-                self.bibliography["Colman"] = value  # Missing 'e'
-            elif key == "Boppenstedt":
-                self.bibliography["Boppenstedt"] = value  # Keep original
-                self.bibliography["Boppensted"] = value  # Missing 't'
-            
-            # Add common OCR/typing errors
-            if "i" in key:
-                self.bibliography[key.replace("i", "l")] = value  # i -> l confusion
-                self.bibliography[key.replace("i", "1")] = value  # i -> 1 confusion
-            if "l" in key:
-                self.bibliography[key.replace("l", "i")] = value  # l -> i confusion
-                self.bibliography[key.replace("l", "1")] = value  # l -> 1 confusion
-            if "0" in key:
-                self.bibliography[key.replace("0", "o")] = value  # 0 -> o confusion
-            if "o" in key:
-                self.bibliography[key.replace("o", "0")] = value  # o -> 0 confusion
-            if "1" in key:
-                self.bibliography[key.replace("1", "l")] = value  # 1 -> l confusion
-                self.bibliography[key.replace("1", "i")] = value  # 1 -> i confusion
+        # Entries, misspellings and OCR substitutions live in macbeth_bibliography.json;
+        # the expanded key table and match structures come from its compiled artifact
+        self.compiled = load_bibliography()
+        self.bibliography = self.compiled.bibliography
         
-        print(f"✅ Loaded {len(base_bibliography)} base bibliography entries")
-        print(f"✅ Added variations for spelling errors and case sensitivity")
+        print(f"✅ Loaded {len(self.compiled.entries)} base bibliography entries")
+        print(f"✅ Added {len(self.compiled.variants)} variations for spelling errors and case sensitivity")
         print(f"✅ Total bibliography entries: {len(self.bibliography)}")
         print("✅ No OCR processing needed - using complete pre-defined bibliography with variations")
         return self.bibliography
@@ -420,45 +42,93 @@ class CompleteBibliographyExtractor:
 class CompleteNotesProcessor:
     """Processes ALL notes with comprehensive reference expansion."""
     
-    def __init__(self, bibliography: Dict[str, str]):
-        self.bibliography = bibliography
+    def __init__(self, bibliography: Dict[str, str], resolution_cache=None, compiled=None, confusions=None):
+        # Word resolutions are shared with every other processor unless a cache is given
+        self.resolution_cache = resolution_cache if resolution_cache is not None else get_resolution_cache()
+        # OCR misreadings (i/l/1, o/0) the matcher reads through; see ocr_confusion
+        self.confusions = compiled.confusions if compiled is not None else confusions
+        if compiled is not None and compiled.bibliography is bibliography:
+            # Matcher, index and fingerprint were built when the artifact was compiled
+            self.bibliography = bibliography
+            self.matcher = compiled.matcher
+            self.fuzzy_index = compiled.fuzzy_index
+            self.bibliography_fingerprint = compiled.fingerprint
+        else:
+            self.set_bibliography(bibliography)
         self.expansion_stats = {
             'total_expansions': 0,
-            'unresolved_references': set(),
             'expanded_references': set(),
+            'fuzzy_matches': {},
             'total_acts_scenes': 0,
             'total_lines_processed': 0,
             'total_notes_processed': 0
         }
     
+    def set_bibliography(self, bibliography: Dict[str, str]):
+        """
+        Use a new or changed bibliography. Call this after editing the dict in
+        place: it rebuilds the matcher and index and invalidates cached resolutions.
+        """
+        self.bibliography = bibliography
+        # Built once; lowercase variants are left out so ordinary words like "white" are never expanded
+        self.matcher = ReferenceMatcher((key for key in bibliography if not key[0].islower()), self.confusions)
+        self.fuzzy_index = FuzzyIndex(bibliography)
+        self.bibliography_fingerprint = bibliography_fingerprint(bibliography)
+
     def find_all_references(self, text: str) -> List[str]:
         """Find ALL potential references in text using fuzzy matching."""
-        # Look for capitalized words that might be author names
-        potential_refs = re.findall(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b', text)
-        
-        # First, try exact matches
-        exact_matches = [ref for ref in potential_refs if ref in self.bibliography]
-        
+        # First, exact keys in one scan of the text
+        matches = self.matcher.find(text)
+        exact_matches = [key for _, _, key in matches]
+
         # Then try fuzzy matching for spelling variations
-        fuzzy_matches = []
-        for ref in potential_refs:
-            if ref not in exact_matches:
-                # Try to find close matches
-                best_match = self.find_closest_match(ref)
-                if best_match:
-                    fuzzy_matches.append((ref, best_match))
-        
+        fuzzy_matches = self.find_fuzzy_references(text, matches)
+
         return exact_matches + [match[1] for match in fuzzy_matches]
+
+    def find_fuzzy_references(self, text: str, matches: List[Tuple[int, int, str]]) -> List[Tuple[str, str]]:
+        """(word, closest key) for capitalized words that are not part of an exact match."""
+        fuzzy_matches = []
+        match_index = 0
+        # Look for capitalized words that might be author names
+        for token in re.finditer(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b', text):
+            # Both are in text order, so skipping tokens inside exact matches is one merge
+            while match_index < len(matches) and matches[match_index][1] <= token.start():
+                match_index += 1
+            if match_index < len(matches) and matches[match_index][0] < token.end():
+                continue
+
+            ref = token.group(1)
+            if ref in self.bibliography:
+                continue
+            # Try to find close matches
+            best_match = self.find_closest_match(ref)
+            if best_match:
+                fuzzy_matches.append((ref, best_match))
+
+        return fuzzy_matches
     
     def find_closest_match(self, reference: str) -> Optional[str]:
         """Find the closest matching reference in bibliography using fuzzy matching."""
         if not reference or len(reference) < 3:
             return None
-        
+
+        # Words that found no match are cached too, as None
+        cached = self.resolution_cache.get(self.bibliography_fingerprint, reference)
+        if cached is not MISSING:
+            return cached
+
+        best_match = self.score_closest_match(reference)
+        self.resolution_cache.put(self.bibliography_fingerprint, reference, best_match)
+        return best_match
+
+    def score_closest_match(self, reference: str) -> Optional[str]:
+        """Uncached fuzzy lookup behind find_closest_match()."""
         best_match = None
         best_score = 0
         
-        for bib_key in self.bibliography.keys():
+        # Only keys the index says can score above 0, in bibliography order
+        for bib_key in self.fuzzy_index.candidates(reference):
             # Calculate similarity score
             score = self.calculate_similarity(reference, bib_key)
             if score > best_score and score > 0.7:  # 70% similarity threshold
@@ -496,29 +166,22 @@ class CompleteNotesProcessor:
         return differences <= 2  # Allow up to 2 character differences
     
     def expand_references_in_text(self, text: str) -> str:
-        """Expand ALL abbreviated references in text."""
-        expanded_text = text
-        
-        # Find all potential references
-        references = self.find_all_references(text)
-        
-        for ref in references:
-            if ref in self.bibliography:
-                # Replace the reference with the full bibliographic entry
-                full_ref = self.bibliography[ref]
-                
-                # Use word boundaries to avoid partial replacements
-                pattern = r'\b' + re.escape(ref) + r'\b'
-                expanded_text = re.sub(pattern, full_ref, expanded_text)
-                
-                self.expansion_stats['total_expansions'] += 1
-                self.expansion_stats['expanded_references'].add(ref)
-                
-                print(f"  Expanded '{ref}' to '{full_ref}'")
-            else:
-                self.expansion_stats['unresolved_references'].add(ref)
-                print(f"  Unresolved reference: {ref}")
-        
+        """
+        Expand ALL abbreviated references in text.
+        Every key is found and replaced in a single scan, and the inserted entries
+        are never scanned again, so an expansion cannot itself be expanded.
+        """
+        expanded_text, matches = self.matcher.expand(text, self.bibliography)
+
+        for _, _, ref in matches:
+            self.expansion_stats['total_expansions'] += 1
+            self.expansion_stats['expanded_references'].add(ref)
+            print(f"  Expanded '{ref}' to '{self.bibliography[ref]}'")
+
+        # Close matches name a key, not a span of this text: they are reported, never substituted
+        for ref, best_match in self.find_fuzzy_references(text, matches):
+            self.expansion_stats['fuzzy_matches'][ref] = best_match
+
         return expanded_text
     
     def process_all_notes(self, notes_data: Dict) -> Dict:
@@ -527,7 +190,8 @@ class CompleteNotesProcessor:
         
         print(f"\nProcessing {len(notes_data)} acts/scenes...")
         
-        for act_scene, scene_data in notes_data.items():
+        # Walk scenes in act/scene order whatever the file's key style or order
+        for act_scene, scene_data in SceneIndex(notes_data).items(notes_data):
             print(f"Processing {act_scene}...")
             processed_data[act_scene] = {}
             
@@ -575,8 +239,9 @@ class CompleteNotesProcessor:
         return {
             'total_expansions': self.expansion_stats['total_expansions'],
             'unique_references_expanded': len(self.expansion_stats['expanded_references']),
-            'unresolved_references': list(self.expansion_stats['unresolved_references']),
             'expanded_references': list(self.expansion_stats['expanded_references']),
+            'fuzzy_matches': dict(self.expansion_stats['fuzzy_matches']),
+            'resolution_cache': self.resolution_cache.get_report(),
             'total_acts_scenes': self.expansion_stats['total_acts_scenes'],
             'total_lines_processed': self.expansion_stats['total_lines_processed'],
             'total_notes_processed': self.expansion_stats['total_notes_processed']
@@ -593,7 +258,7 @@ def analyze_json_structure(notes_data: Dict) -> Dict:
     
     print(f"Total acts/scenes: {total_acts_scenes}")
     
-    for act_scene, scene_data in notes_data.items():
+    for act_scene, scene_data in SceneIndex(notes_data).items(notes_data):
         if isinstance(scene_data, dict):
             scene_lines = len(scene_data)
             total_lines += scene_lines
@@ -630,6 +295,11 @@ def analyze_json_structure(notes_data: Dict) -> Dict:
 
 def main():
     """Main processing function."""
+    parser = argparse.ArgumentParser(description="Expand bibliography references in the Macbeth notes")
+    parser.add_argument('--scene', help='only expand one scene, e.g. "ACT 1, SCENE 3", and print it instead of saving')
+    parser.add_argument('--compact', action='store_true', help="save JSON without indentation")
+    args = parser.parse_args()
+
     print("=== COMPLETE BIBLIOGRAPHY MACBETH PROCESSOR ===")
     
     # Step 1: Load comprehensive bibliography
@@ -642,27 +312,36 @@ def main():
     # Step 2: Load the original notes
     print("Step 2: Loading original notes...")
     try:
-        with open('macbeth_notes.json', 'r', encoding='utf-8') as f:
-            original_notes = json.load(f)
+        # Scenes are decoded on first access through the sidecar index
+        original_notes = LazyNotes('macbeth_notes.json')
         print(f"Loaded notes with {len(original_notes)} acts/scenes")
     except Exception as e:
         print(f"Error loading notes: {e}")
         return
     
+    if args.scene:
+        if args.scene not in original_notes:
+            print(f"No scene {args.scene!r} in macbeth_notes.json")
+            return
+        processor = CompleteNotesProcessor(complete_bibliography, compiled=extractor.compiled)
+        expanded_scene = processor.process_all_notes({args.scene: original_notes[args.scene]})
+        print(json_io.dumps(expanded_scene))
+        return
+    
     # Step 2.5: Analyze the JSON structure
     print("Step 2.5: Analyzing JSON structure...")
     structure_info = analyze_json_structure(original_notes)
     
     # Step 3: Process notes to expand ALL references
     print("Step 3: Processing notes to expand ALL references...")
-    processor = CompleteNotesProcessor(complete_bibliography)
+    processor = CompleteNotesProcessor(complete_bibliography, compiled=extractor.compiled)
     expanded_notes = processor.process_all_notes(original_notes)
     
     # Step 4: Save expanded notes
     print("Step 4: Saving expanded notes...")
     try:
         with open('macbeth_notes_complete_expanded.json', 'w', encoding='utf-8') as f:
-            json.dump(expanded_notes, f, indent=2, ensure_ascii=False)
+            json_io.dump(expanded_notes, f, args.compact)
         print("Expanded notes saved to macbeth_notes_complete_expanded.json")
     except Exception as e:
         print(f"Error saving expanded notes: {e}")
@@ -680,7 +359,10 @@ def main():
     print(f"✅ Total notes processed: {report['total_notes_processed']}")
     print(f"✅ Total expansions performed: {report['total_expansions']}")
     print(f"✅ Unique references expanded: {report['unique_references_expanded']}")
-    print(f"✅ Unresolved references: {len(report['unresolved_references'])}")
+    print(f"✅ Close matches found (reported, not substituted): {len(report['fuzzy_matches'])}")
+    cache_report = report['resolution_cache']
+    print(f"✅ Word resolution cache: {cache_report['hit_ratio']:.1%} hits "
+          f"({cache_report['hits']} hits, {cache_report['misses']} misses, {cache_report['entries']} entries)")
     
     print(f"\nORIGINAL JSON STRUCTURE:")
     print(f"  Total acts/scenes: {structure_info['total_acts_scenes']}")
@@ -688,11 +370,6 @@ def main():
     print(f"  Total play texts: {structure_info['total_play_texts']}")
     print(f"  Total notes: {structure_info['total_notes']}")
     
-    if report['unresolved_references']:
-        print("\nUnresolved references:")
-        for ref in sorted(report['unresolved_references']):
-            print(f"  - {ref}")
-    
     print(f"\nExpanded references:")
     for ref in sorted(report['expanded_references']):
         print(f"  - {ref} -> {complete_bibliography[ref]}")
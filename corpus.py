@@ -0,0 +1,185 @@
+# Shared registry of the decoded corpus JSON files
+# A Corpus maps play names (the JSON file name without .json: "Romeo_and_Juliet",
+# "macbeth_notes") to their files and decodes each one on first access. Decoded
+# plays are kept in an LRU cache bounded by their estimated memory, so a
+# long-running process that touches every play holds only the recently used ones;
+# an evicted play is simply decoded again the next time it is asked for.
+#
+# The size estimate walks the decoded dicts, lists and strings with
+# sys.getsizeof the first time a file is decoded and is remembered until the file
+# changes, so reloading an evicted play costs only the decode. It ignores sharing
+# between objects, so it errs on the high side.
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import json_io
+from bibliography_artifact import BIBLIOGRAPHY_FILE
+from scene_writer import SPEAKERS_SUFFIX
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Directory and memory budget of the process-wide corpus; see get_corpus()
+CORPUS_DIR = '.'
+CORPUS_MAX_BYTES = DEFAULT_MAX_BYTES
+
+_corpus = None
+
+def estimate_size(obj):
+    """Approximate bytes held by a decoded JSON value."""
+    getsizeof = sys.getsizeof
+    total = getsizeof(obj)
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            total += sum(map(getsizeof, item))
+            values = item.values()
+        elif isinstance(item, list):
+            values = item
+        else:
+            continue
+        for value in values:
+            total += getsizeof(value)
+            if isinstance(value, (dict, list)):
+                stack.append(value)
+    return total
+
+def corpus_file_names(directory='.'):
+    """
+    Names of the corpus files of a directory: the play and notes .json files and the
+    *_structured.txt files. Hidden files (manifests), the bibliography data file and
+    the scraper's speaker lists are not plays and are skipped.
+    """
+    return sorted(name for name in os.listdir(directory)
+                  if (name.endswith('.json') or name.endswith('_structured.txt'))
+                  and not name.startswith('.')
+                  and name != BIBLIOGRAPHY_FILE
+                  and not name.endswith(SPEAKERS_SUFFIX))
+
+def corpus_files(directory='.'):
+    """{play name: path} for the JSON corpus files of a directory (see corpus_file_names())."""
+    return {name[:-len('.json')]: os.path.join(directory, name)
+            for name in corpus_file_names(directory) if name.endswith('.json')}
+
+class Corpus:
+    """Decodes plays on first access and keeps them in a memory-bounded LRU cache."""
+
+    def __init__(self, directory='.', max_bytes=DEFAULT_MAX_BYTES, loader=json_io.read_json):
+        self.directory = os.path.abspath(directory) if directory is not None else None
+        self.files = corpus_files(directory) if directory is not None else {}
+        self.max_bytes = max_bytes
+        self.loader = loader
+
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()  # play name -> (decoded play, estimated bytes), least recent first
+        self.sizes = {}  # path -> (size on disk, mtime_ns, estimated bytes)
+        self.total_bytes = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'uncached': 0
+        }
+
+    def add(self, name, path):
+        """Register (or re-point) a play; a cached copy of the old file is dropped."""
+        with self.lock:
+            self.files[name] = path
+            self._discard(name)
+
+    def names(self):
+        """Names of every registered play."""
+        return list(self.files)
+
+    def __contains__(self, name):
+        return name in self.files
+
+    def __len__(self):
+        return len(self.files)
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def get(self, name):
+        """The decoded play, loading it if it is not cached."""
+        with self.lock:
+            cached = self.cache.get(name)
+            if cached is not None:
+                self.cache.move_to_end(name)
+                self.stats['hits'] += 1
+                return cached[0]
+            self.stats['misses'] += 1
+            try:
+                path = self.files[name]
+            except KeyError:
+                raise KeyError(f"No play {name!r} in the corpus") from None
+
+        # Decode outside the lock so other plays stay available meanwhile
+        stat = os.stat(path)
+        play = self.loader(path)
+        known = self.sizes.get(path)
+        if known is not None and known[:2] == (stat.st_size, stat.st_mtime_ns):
+            size = known[2]
+        else:
+            size = estimate_size(play)
+            self.sizes[path] = (stat.st_size, stat.st_mtime_ns, size)
+
+        with self.lock:
+            cached = self.cache.get(name)
+            if cached is not None:
+                # Another thread loaded it first; keep one copy
+                self.cache.move_to_end(name)
+                return cached[0]
+            if size > self.max_bytes:
+                # Never cache a play that would not fit on its own
+                self.stats['uncached'] += 1
+                return play
+            self.cache[name] = (play, size)
+            self.total_bytes += size
+            self._evict()
+        return play
+
+    def _discard(self, name):
+        cached = self.cache.pop(name, None)
+        if cached is not None:
+            self.total_bytes -= cached[1]
+
+    def _evict(self):
+        """Drop least recently used plays until the cache fits in max_bytes."""
+        while self.total_bytes > self.max_bytes and self.cache:
+            _, (_, size) = self.cache.popitem(last=False)
+            self.total_bytes -= size
+            self.stats['evictions'] += 1
+
+    def clear(self):
+        """Drop every decoded play."""
+        with self.lock:
+            self.cache.clear()
+            self.total_bytes = 0
+
+    def cached(self):
+        """Names of the decoded plays, least recently used first."""
+        with self.lock:
+            return list(self.cache)
+
+    def get_report(self):
+        """Return the cache counters plus the plays and estimated bytes it holds."""
+        with self.lock:
+            report = dict(self.stats)
+            report['cached_plays'] = len(self.cache)
+            report['cached_bytes'] = self.total_bytes
+            report['max_bytes'] = self.max_bytes
+        requests_made = report['hits'] + report['misses']
+        report['hit_ratio'] = report['hits'] / requests_made if requests_made else 0.0
+        return report
+
+def get_corpus():
+    """Return the process-wide Corpus for CORPUS_DIR and CORPUS_MAX_BYTES."""
+    global _corpus
+    if (_corpus is None or _corpus.directory != os.path.abspath(CORPUS_DIR)
+            or _corpus.max_bytes != CORPUS_MAX_BYTES):
+        _corpus = Corpus(CORPUS_DIR, CORPUS_MAX_BYTES)
+    return _corpus
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Corpus Benchmarks
+Times loading and querying the converted per-play JSON corpus.
+Usage: python corpus_benchmarks.py columnar [--repeat N]
+       python corpus_benchmarks.py store [--lookups N]
+       python corpus_benchmarks.py lazy [--repeat N]
+       python corpus_benchmarks.py serializer [--repeat N]
+       python corpus_benchmarks.py pack
+       python corpus_benchmarks.py registry [--requests N] [--budget-mb MB]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import json_io
+from corpus import Corpus, corpus_file_names, estimate_size
+from columnar_play import ColumnarPlay
+from corpus_pack import CODECS, CorpusPack, pack_corpus
+from corpus_store import CorpusStore, build_store
+from lazy_notes import LazyNotes, build_index
+
+NOTES_FILES = [
+    "hamlet_notes (1).json",
+    "kinglear_notes.json",
+    "macbeth_notes.json",
+    "othello_notes.json",
+    "ROMEO_notes.json",
+]
+
+def corpus_notes_files():
+    """The bundled notes JSON files."""
+    return [path for path in NOTES_FILES if os.path.exists(path)]
+
+def corpus_json_files():
+    """The per-play JSON files converted from the bundled *_structured.txt files."""
+    json_files = []
+    for name in sorted(os.listdir('.')):
+        if name.endswith('_structured.txt'):
+            json_file = name.replace('_structured.txt', '.json')
+            if os.path.exists(json_file):
+                json_files.append(json_file)
+    return json_files
+
+def best_time(function, repeat):
+    """Best-of-repeat wall time of function(); returns (seconds, last result)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def retained_bytes(function):
+    """Bytes still allocated once function()'s result is built; returns (bytes, result)."""
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def benchmark_columnar(repeat=5):
+    """
+    Load every play as JSON dicts and as .colplay files, compare load time and
+    retained memory, and check the columnar model converts back to identical JSON.
+    """
+    json_files = corpus_json_files()
+    print(f"=== COLUMNAR PLAY BENCHMARK: {len(json_files)} plays ===")
+
+    totals = {'json_seconds': 0.0, 'columnar_seconds': 0.0, 'json_bytes': 0, 'columnar_bytes': 0}
+    identical = True
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'Play':<36} {'JSON load':>10} {'colplay':>9} {'JSON mem':>10} {'colplay':>9}")
+        for json_file in json_files:
+            colplay_file = os.path.join(workdir, json_file.replace('.json', '.colplay'))
+            ColumnarPlay.load_json(json_file).save(colplay_file)
+
+            json_seconds, data = best_time(lambda: load_json(json_file), repeat)
+            columnar_seconds, play = best_time(lambda: ColumnarPlay.load(colplay_file), repeat)
+            json_bytes, _ = retained_bytes(lambda: load_json(json_file))
+            columnar_bytes, _ = retained_bytes(lambda: ColumnarPlay.load(colplay_file))
+            identical = identical and play.to_json_dict() == data
+
+            totals['json_seconds'] += json_seconds
+            totals['columnar_seconds'] += columnar_seconds
+            totals['json_bytes'] += json_bytes
+            totals['columnar_bytes'] += columnar_bytes
+            print(f"{json_file:<36} {json_seconds * 1000:8.1f}ms {columnar_seconds * 1000:7.1f}ms "
+                  f"{json_bytes / 1e6:8.2f}MB {columnar_bytes / 1e6:7.2f}MB")
+
+    print(f"Load time: {totals['json_seconds'] * 1000:.0f} ms → {totals['columnar_seconds'] * 1000:.0f} ms "
+          f"({totals['json_seconds'] / totals['columnar_seconds']:.1f}x faster)")
+    print(f"Memory:    {totals['json_bytes'] / 1e6:.1f} MB → {totals['columnar_bytes'] / 1e6:.1f} MB "
+          f"({totals['json_bytes'] / totals['columnar_bytes']:.1f}x smaller)")
+    print(f"Round trip to JSON identical: {'✅' if identical else '❌'}")
+
+    totals['identical'] = identical
+    return totals
+
+def benchmark_store(lookups=10000, seed=0):
+    """
+    Fetch random lines with their notes from a corpus store and, for comparison,
+    by loading the line's JSON file, as the reading service does today.
+    """
+    sources = {os.path.splitext(path)[0]: path for path in corpus_notes_files() + corpus_json_files()}
+    print(f"=== CORPUS STORE BENCHMARK: {len(sources)} files, {lookups} random lookups ===")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store_path = os.path.join(workdir, "corpus.store")
+        start = time.perf_counter()
+        plays, lines, notes = build_store(store_path, sources)
+        print(f"Built store: {plays} plays, {lines} lines, {notes} notes, "
+              f"{os.path.getsize(store_path) / 1e6:.1f} MB in {time.perf_counter() - start:.2f}s")
+
+        open_seconds, store = best_time(lambda: CorpusStore(store_path), 20)
+        print(f"Open:                  {open_seconds * 1e6:8.0f} µs")
+
+        rng = random.Random(seed)
+        keys = []
+        with store:
+            for play in store.plays():
+                for scene_key in store.scenes(play):
+                    scene = store._scene(play, None, scene_key)
+                    labels = scene[3] or [str(n) for n in range(1, scene[2] + 1)]
+                    keys.extend((play, scene_key, label) for label in labels)
+            sample = [rng.choice(keys) for _ in range(lookups)]
+
+            start = time.perf_counter()
+            store_entries = [store.entry(play, None, scene_key, label) for play, scene_key, label in sample]
+            store_seconds = time.perf_counter() - start
+
+        # Loading the whole JSON file per request; only a few requests, it is slow
+        json_sample = sample[:50]
+        start = time.perf_counter()
+        json_entries = []
+        for play, scene_key, label in json_sample:
+            entry = load_json(sources[play])[scene_key][label]
+            json_entry = {"play": entry.get('play', '')}
+            if 'notes' in entry:
+                json_entry["notes"] = entry['notes'] or []
+            json_entries.append(json_entry)
+        json_seconds = (time.perf_counter() - start) / len(json_sample) * lookups
+
+    identical = store_entries[:len(json_entries)] == json_entries
+    print(f"Store lookups:         {store_seconds * 1e6 / lookups:8.1f} µs per line with notes")
+    print(f"json.load per lookup:  {json_seconds * 1e6 / lookups:8.1f} µs per line "
+          f"({json_seconds / store_seconds:.0f}x slower)")
+    print(f"Same entries: {'✅' if identical else '❌'}")
+
+    return {'open': open_seconds, 'store': store_seconds, 'json': json_seconds, 'identical': identical}
+
+def benchmark_lazy(repeat=5):
+    """
+    Time getting one scene of each notes file with json.load versus LazyNotes
+    (sidecar index already built), and check every lazily decoded scene matches.
+    """
+    notes_files = corpus_notes_files()
+    print(f"=== LAZY NOTES BENCHMARK: {len(notes_files)} notes files ===")
+    results = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'File':<26} {'size':>8} {'index build':>12} {'json.load':>10} {'lazy':>8}")
+        for notes_file in notes_files:
+            # Work on a copy so the benchmark never writes sidecars next to the repo's files
+            path = os.path.join(workdir, os.path.basename(notes_file))
+            shutil.copyfile(notes_file, path)
+            index_seconds, _ = best_time(lambda: build_index(path), 1)
+
+            def first_scene_lazy():
+                notes = LazyNotes(path)
+                return notes[next(iter(notes))]
+
+            def first_scene_json():
+                data = load_json(path)
+                return data[next(iter(data))]
+
+            json_seconds, _ = best_time(first_scene_json, repeat)
+            lazy_seconds, _ = best_time(first_scene_lazy, repeat)
+
+            data = load_json(path)
+            notes = LazyNotes(path)
+            identical = list(notes) == list(data) and all(notes[key] == data[key] for key in data)
+            results[notes_file] = {'json': json_seconds, 'lazy': lazy_seconds, 'identical': identical}
+            print(f"{notes_file:<26} {os.path.getsize(path) / 1e6:6.2f}MB {index_seconds * 1000:10.1f}ms "
+                  f"{json_seconds * 1000:8.1f}ms {lazy_seconds * 1000:6.2f}ms  "
+                  f"identical: {'✅' if identical else '❌'}")
+
+    return results
+
+def serializers():
+    """(name, dump(obj, compact) -> str, load(str) -> obj) for each available backend."""
+    def stdlib_dump(obj, compact):
+        if compact:
+            return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    backends = [("json", stdlib_dump, json.loads)]
+    if json_io.orjson is not None:
+        backends.append(("orjson", json_io.dumps, json_io.orjson.loads))
+    return backends
+
+def benchmark_serializer(repeat=5):
+    """
+    Time dump (pretty and compact) and load of every notes file with each JSON
+    backend, compare output sizes, and check every backend writes the same text.
+    """
+    notes_files = corpus_notes_files()
+    backends = serializers()
+    print(f"=== SERIALIZER BENCHMARK: {len(notes_files)} notes files, "
+          f"backends: {', '.join(name for name, _, _ in backends)} (json_io uses {json_io.BACKEND}) ===")
+
+    totals = {}
+    identical = True
+    print(f"{'File':<26} {'backend':<8} {'dump':>8} {'compact':>8} {'load':>8} {'pretty':>9} {'compact':>9}")
+    for notes_file in notes_files:
+        data = load_json(notes_file)
+        expected = None
+        for name, dump, load in backends:
+            pretty_seconds, pretty = best_time(lambda: dump(data, False), repeat)
+            compact_seconds, compact = best_time(lambda: dump(data, True), repeat)
+            load_seconds, loaded = best_time(lambda: load(pretty), repeat)
+
+            if expected is None:
+                expected = (pretty, compact)
+            identical = identical and (pretty, compact) == expected and loaded == data
+
+            total = totals.setdefault(name, {'dump': 0.0, 'compact': 0.0, 'load': 0.0, 'pretty_bytes': 0, 'compact_bytes': 0})
+            total['dump'] += pretty_seconds
+            total['compact'] += compact_seconds
+            total['load'] += load_seconds
+            total['pretty_bytes'] += len(pretty.encode('utf-8'))
+            total['compact_bytes'] += len(compact.encode('utf-8'))
+            print(f"{notes_file:<26} {name:<8} {pretty_seconds * 1000:6.1f}ms {compact_seconds * 1000:6.1f}ms "
+                  f"{load_seconds * 1000:6.1f}ms {len(pretty.encode('utf-8')) / 1e6:7.2f}MB "
+                  f"{len(compact.encode('utf-8')) / 1e6:7.2f}MB")
+
+    print()
+    for name, total in totals.items():
+        print(f"{name:<8} dump {total['dump'] * 1000:6.1f} ms, compact dump {total['compact'] * 1000:6.1f} ms, "
+              f"load {total['load'] * 1000:6.1f} ms")
+    if "orjson" in totals:
+        stdlib, fast = totals["json"], totals["orjson"]
+        print(f"orjson vs json: dump {stdlib['dump'] / fast['dump']:.1f}x, "
+              f"compact dump {stdlib['compact'] / fast['compact']:.1f}x, load {stdlib['load'] / fast['load']:.1f}x faster")
+    stdlib = totals["json"]
+    print(f"Compact output: {stdlib['pretty_bytes'] / 1e6:.2f} MB → {stdlib['compact_bytes'] / 1e6:.2f} MB "
+          f"({1 - stdlib['compact_bytes'] / stdlib['pretty_bytes']:.0%} smaller)")
+    print(f"Backends write identical JSON: {'✅' if identical else '❌'}")
+
+    totals['identical'] = identical
+    return totals
+
+def benchmark_pack():
+    """
+    Pack every corpus file with each codec, compare the size with compressing
+    whole files, time reading one scene against decompressing its whole file,
+    and check every file extracts byte for byte.
+    """
+    paths = corpus_file_names()
+    sources = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            sources[path] = f.read()
+    original_bytes = sum(len(data) for data in sources.values())
+    print(f"=== CORPUS PACK BENCHMARK: {len(paths)} files, {original_bytes / 1e6:.1f} MB ===")
+    results = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'codec':<6} {'whole files':>12} {'pack':>9} {'pack time':>10} {'one scene':>10} {'whole file':>11}")
+        for codec, (compress, decompress) in CODECS.items():
+            pack_path = os.path.join(workdir, f"corpus.{codec}")
+            start = time.perf_counter()
+            _, _, packed_bytes = pack_corpus(pack_path, paths, codec)
+            pack_seconds = time.perf_counter() - start
+            whole = {path: compress(data) for path, data in sources.items()}
+            whole_bytes = sum(len(data) for data in whole.values())
+
+            with CorpusPack(pack_path) as pack:
+                scenes = [(name, key) for name in pack.files() for key in pack.scenes(name)]
+                start = time.perf_counter()
+                for name, key in scenes:
+                    pack.scene_bytes(name, key)
+                scene_seconds = (time.perf_counter() - start) / len(scenes)
+
+                start = time.perf_counter()
+                for name, _ in scenes:
+                    decompress(whole[name])
+                whole_seconds = (time.perf_counter() - start) / len(scenes)
+
+                identical = all(pack.read(os.path.basename(path)) == data for path, data in sources.items())
+
+            results[codec] = {'packed_bytes': packed_bytes, 'whole_bytes': whole_bytes,
+                              'scene': scene_seconds, 'whole': whole_seconds, 'identical': identical}
+            print(f"{codec:<6} {whole_bytes / 1e6:10.2f}MB {packed_bytes / 1e6:7.2f}MB {pack_seconds:9.2f}s "
+                  f"{scene_seconds * 1e6:8.0f}µs {whole_seconds * 1e6:9.0f}µs  "
+                  f"identical: {'✅' if identical else '❌'}")
+
+    return results
+
+def benchmark_registry(requests=5000, budget_mb=8, seed=0):
+    """
+    Serve a skewed stream of play requests (a few hot plays, a long tail) from a
+    Corpus with a memory budget, and compare the memory it holds with keeping
+    every play decoded. Also checks the size estimate against tracemalloc.
+    """
+    corpus = Corpus('.', budget_mb * 1024 * 1024)
+    names = corpus.names()
+    print(f"=== CORPUS REGISTRY BENCHMARK: {len(names)} files, {requests} requests, "
+          f"{budget_mb} MB budget ===")
+
+    rng = random.Random(seed)
+    # Zipf-like popularity: the k-th most popular play is asked for ~1/k as often
+    weights = [1 / rank for rank in range(1, len(names) + 1)]
+    stream = rng.choices(rng.sample(names, len(names)), weights, k=requests)
+
+    hit_seconds = miss_seconds = 0.0
+    peak_bytes = 0
+    for name in stream:
+        misses = corpus.stats['misses']
+        start = time.perf_counter()
+        corpus.get(name)
+        elapsed = time.perf_counter() - start
+        if corpus.stats['misses'] > misses:
+            miss_seconds += elapsed
+        else:
+            hit_seconds += elapsed
+        peak_bytes = max(peak_bytes, corpus.total_bytes)
+
+    report = corpus.get_report()
+    unbounded_bytes, plays = retained_bytes(lambda: [json_io.read_json(corpus.files[name]) for name in names])
+    estimated_bytes = sum(estimate_size(play) for play in plays)
+    del plays
+
+    print(f"Hits {report['hits']}, misses {report['misses']}, evictions {report['evictions']} "
+          f"(hit ratio {report['hit_ratio']:.1%})")
+    print(f"Per request: hit {hit_seconds * 1e6 / max(report['hits'], 1):.1f} µs, "
+          f"miss {miss_seconds * 1000 / max(report['misses'], 1):.1f} ms")
+    print(f"Decoded plays held: at most {peak_bytes / 1e6:.1f} MB with the budget, "
+          f"{estimated_bytes / 1e6:.1f} MB with every play decoded (estimates)")
+    print(f"Estimate check for every play: {estimated_bytes / 1e6:.1f} MB estimated, "
+          f"{unbounded_bytes / 1e6:.1f} MB measured by tracemalloc")
+
+    report['peak_bytes'] = peak_bytes
+    report['unbounded_bytes'] = unbounded_bytes
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading the JSON corpus")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    columnar_parser = subparsers.add_parser('columnar', help="JSON dicts vs the columnar play model")
+    columnar_parser.add_argument('--repeat', type=int, default=5)
+
+    store_parser = subparsers.add_parser('store', help="random line lookups: corpus store vs json.load")
+    store_parser.add_argument('--lookups', type=int, default=10000)
+
+    lazy_parser = subparsers.add_parser('lazy', help="one scene of a notes file: json.load vs LazyNotes")
+    lazy_parser.add_argument('--repeat', type=int, default=5)
+
+    serializer_parser = subparsers.add_parser('serializer', help="dump/load of the notes files per JSON backend")
+    serializer_parser.add_argument('--repeat', type=int, default=5)
+
+    subparsers.add_parser('pack', help="compressed corpus pack: size and one-scene reads per codec")
+
+    registry_parser = subparsers.add_parser('registry', help="skewed play requests through a bounded Corpus")
+    registry_parser.add_argument('--requests', type=int, default=5000)
+    registry_parser.add_argument('--budget-mb', type=int, default=8)
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'columnar':
+        benchmark_columnar(args.repeat)
+    elif args.benchmark == 'store':
+        benchmark_store(args.lookups)
+    elif args.benchmark == 'lazy':
+        benchmark_lazy(args.repeat)
+    elif args.benchmark == 'serializer':
+        benchmark_serializer(args.repeat)
+    elif args.benchmark == 'pack':
+        benchmark_pack()
+    elif args.benchmark == 'registry':
+        benchmark_registry(args.requests, args.budget_mb)
+
+if __name__ == "__main__":
+    main()
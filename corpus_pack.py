@@ -0,0 +1,255 @@
+# Compressed, seekable container for the corpus files
+# Packs per-play JSON files, notes files and *_structured.txt files into one file
+# where every scene is its own compressed frame (gzip or lzma from the standard
+# library). A small index records where each frame lives, so one scene is read by
+# decompressing just that frame, while a whole file is the concatenation of its
+# frames and extracts byte for byte.
+#
+# Frames cut a file at scene boundaries without re-encoding anything:
+#   JSON  - each frame runs from the end of the previous scene's value to the end
+#           of this one (so it holds the separator, the key and the value); the
+#           spans come from lazy_notes.scan_scene_spans()
+#   text  - each frame is one "ACT X SCENE Y" header line up to the next header
+# Bytes before the first scene and after the last are kept in unkeyed frames.
+#
+# Layout: MAGIC, the compressed frames back to back, a JSON index, then the index
+# offset as 8 bytes (little-endian), like page_archive.py.
+
+import argparse
+import gzip
+import hashlib
+import lzma
+import mmap
+import os
+import struct
+
+import json_io
+from corpus import corpus_file_names
+from lazy_notes import scan_scene_spans
+from scene_keys import SceneIndex, parse_number
+
+MAGIC = b"SHKPACK1"
+FOOTER = struct.Struct("<Q")
+DEFAULT_CODEC = "gzip"
+
+CODECS = {
+    "gzip": (lambda data: gzip.compress(data, compresslevel=9, mtime=0), gzip.decompress),
+    "lzma": (lambda data: lzma.compress(data, check=lzma.CHECK_NONE), lzma.decompress),
+}
+
+def file_kind(path):
+    return "json" if path.endswith('.json') else "text"
+
+def json_frames(data):
+    """Yield (scene key or None, frame bytes, value start) covering a JSON file."""
+    previous_end = 0
+    for key, start, end in scan_scene_spans(data):
+        yield key, data[previous_end:end], start - previous_end
+        previous_end = end
+    if previous_end < len(data) or not previous_end:
+        yield None, data[previous_end:], 0
+
+def text_frames(data):
+    """Yield (scene key or None, frame bytes, 0) covering a structured text file."""
+    key = None
+    frame_start = 0
+    position = 0
+    for line in data.splitlines(keepends=True):
+        header = line.strip().decode('utf-8')
+        if header.startswith('ACT ') and 'SCENE ' in header:
+            if position > frame_start:
+                yield key, data[frame_start:position], 0
+            key = header
+            frame_start = position
+        position += len(line)
+    if position > frame_start or not position:
+        yield key, data[frame_start:position], 0
+
+def pack_corpus(pack_path, paths, codec=DEFAULT_CODEC):
+    """
+    Pack corpus files into a container. Files are stored under their base name.
+    Returns (files, original bytes, packed bytes).
+    """
+    compress, _ = CODECS[codec]
+    index = {'codec': codec, 'files': {}}
+    original_bytes = 0
+    tmp_path = pack_path + ".tmp"
+
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        for path in paths:
+            with open(path, 'rb') as source:
+                data = source.read()
+            original_bytes += len(data)
+            kind = file_kind(path)
+
+            frames = []
+            for key, frame, value_start in (json_frames if kind == "json" else text_frames)(data):
+                compressed = compress(frame)
+                frames.append([key, f.tell(), len(compressed), len(frame), value_start])
+                f.write(compressed)
+
+            index['files'][os.path.basename(path)] = {
+                'kind': kind,
+                'size': len(data),
+                'sha256': hashlib.sha256(data).hexdigest(),
+                'frames': frames
+            }
+
+        index_offset = f.tell()
+        f.write(json_io.dumps_bytes(index, compact=True))
+        f.write(FOOTER.pack(index_offset))
+        packed_bytes = f.tell()
+
+    os.replace(tmp_path, pack_path)
+    return len(index['files']), original_bytes, packed_bytes
+
+class CorpusPack:
+    """Read-only, mmap-backed view of a container; scenes decompress on demand."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.file = open(self.path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files
+            self.file.close()
+            raise ValueError(f"{path} is not a corpus pack") from None
+
+        if self.data[:len(MAGIC)] != MAGIC or len(self.data) < len(MAGIC) + FOOTER.size:
+            self.close()
+            raise ValueError(f"{path} is not a corpus pack")
+
+        index_offset, = FOOTER.unpack_from(self.data, len(self.data) - FOOTER.size)
+        index = json_io.loads(self.data[index_offset:len(self.data) - FOOTER.size])
+        self.codec = index['codec']
+        self.decompress = CODECS[self.codec][1]
+        self.index = index['files']
+        self.scene_maps = {}
+
+    def close(self):
+        if getattr(self, 'data', None) is not None:
+            self.data.close()
+            self.data = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def files(self):
+        """Names of the files in the pack."""
+        return list(self.index)
+
+    def _entry(self, name):
+        try:
+            return self.index[name]
+        except KeyError:
+            raise FileNotFoundError(f"{name} is not in {self.path}") from None
+
+    def _frame(self, frame):
+        _, offset, length, _, _ = frame
+        return self.decompress(self.data[offset:offset + length])
+
+    def _scene_map(self, name):
+        scene_map = self.scene_maps.get(name)
+        if scene_map is None:
+            # Like json.load, a repeated key resolves to its last frame
+            frames = {frame[0]: frame for frame in self._entry(name)['frames'] if frame[0] is not None}
+            scene_map = self.scene_maps[name] = (SceneIndex(frames), frames)
+        return scene_map
+
+    def scenes(self, name):
+        """Scene keys of a file, in canonical act/scene order."""
+        return list(self._scene_map(name)[0])
+
+    def scene_bytes(self, name, act, scene=None):
+        """
+        The raw bytes of one scene, decompressing only its frame: the encoded JSON
+        value for JSON files, the header and its lines for text files. Scenes are
+        addressed by (act, scene) numbers, or by their key alone.
+        """
+        scene_index, frames = self._scene_map(name)
+        try:
+            if scene is None:
+                frame = frames[act]
+            else:
+                frame = frames[scene_index.key(parse_number(str(act)), parse_number(str(scene)))]
+        except KeyError:
+            raise KeyError(f"{name}: no scene {act if scene is None else (act, scene)!r}") from None
+        return self._frame(frame)[frame[4]:]
+
+    def scene(self, name, act, scene=None):
+        """One scene, decoded: a dict for JSON files, a string for text files."""
+        data = self.scene_bytes(name, act, scene)
+        if self._entry(name)['kind'] == "json":
+            return json_io.loads(data)
+        return data.decode('utf-8')
+
+    def read(self, name):
+        """The whole original file, as bytes."""
+        return b''.join(self._frame(frame) for frame in self._entry(name)['frames'])
+
+    def extract(self, name, directory='.'):
+        """Write one file back out, checking it against its recorded hash. Returns the path."""
+        entry = self._entry(name)
+        data = self.read(name)
+        if len(data) != entry['size'] or hashlib.sha256(data).hexdigest() != entry['sha256']:
+            raise ValueError(f"{name}: extracted data does not match the pack index")
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the corpus into a compressed container with per-scene frames")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    pack_parser = subparsers.add_parser('pack', help="pack corpus files (default: every corpus file here)")
+    pack_parser.add_argument('pack')
+    pack_parser.add_argument('files', nargs='*')
+    pack_parser.add_argument('--codec', choices=sorted(CODECS), default=DEFAULT_CODEC)
+
+    list_parser = subparsers.add_parser('list', help="list the files in a pack")
+    list_parser.add_argument('pack')
+
+    extract_parser = subparsers.add_parser('extract', help="extract files (default: all of them)")
+    extract_parser.add_argument('pack')
+    extract_parser.add_argument('files', nargs='*')
+    extract_parser.add_argument('--directory', default='.')
+
+    get_parser = subparsers.add_parser('get', help="print one scene, e.g. get corpus.pack Macbeth.json 1 3")
+    get_parser.add_argument('pack')
+    get_parser.add_argument('file')
+    get_parser.add_argument('scene', nargs='+', help="act and scene numbers, or the scene key")
+
+    args = parser.parse_args()
+
+    if args.command == 'pack':
+        paths = args.files or corpus_file_names()
+        files, original_bytes, packed_bytes = pack_corpus(args.pack, paths, args.codec)
+        print(f"✓ Packed {files} files into {args.pack}: {original_bytes / 1e6:.1f} MB → "
+              f"{packed_bytes / 1e6:.1f} MB ({args.codec})")
+        return
+
+    with CorpusPack(args.pack) as pack:
+        if args.command == 'list':
+            for name in pack.files():
+                entry = pack.index[name]
+                packed = sum(frame[2] for frame in entry['frames'])
+                print(f"{name:<40} {entry['size'] / 1e6:7.2f} MB → {packed / 1e6:6.2f} MB, "
+                      f"{len(pack.scenes(name))} scenes")
+        elif args.command == 'extract':
+            os.makedirs(args.directory, exist_ok=True)
+            for name in args.files or pack.files():
+                print(f"✓ {pack.extract(name, args.directory)}")
+        elif args.command == 'get':
+            scene = pack.scene(args.file, *(args.scene if len(args.scene) == 2 else [' '.join(args.scene)]))
+            print(json_io.dumps(scene) if isinstance(scene, dict) else scene, end='' if isinstance(scene, str) else '\n')
+
+if __name__ == "__main__":
+    main()
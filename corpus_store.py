@@ -0,0 +1,244 @@
+# Memory-mapped binary corpus store
+# Packs any number of per-play JSON files ("ACT X, SCENE Y": { "line": { "play": ..., "notes": [...] } },
+# notes optional) into one file that is opened with mmap, so a reader can fetch any
+# line or note without parsing whole JSON files. Worker processes opening the same
+# store share its pages through the OS page cache.
+#
+# Layout:
+#   MAGIC, then a fixed header (see HEADER)
+#   text blob   - every line's "play" text and every note, UTF-8, back to back
+#   line table  - one fixed-width LINE_RECORD per line: text offset/length, first note, note count
+#                 (NO_NOTES when the source line has no "notes" key at all)
+#   note table  - one fixed-width NOTE_RECORD per note: text offset/length
+#   scene lists - per play, JSON of its scenes with first line and line count
+#   directory   - small JSON: play name -> offset/length of its scene list
+# Opening reads the header and the play directory only; a play's scene list is
+# parsed the first time it is used. A (play, act, scene, line) lookup is then a
+# dict access for the scene plus one struct.unpack_from on the line table.
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import json_io
+from scene_keys import SceneIndex, parse_number
+
+MAGIC = b"SHKSTOR2"
+HEADER = struct.Struct("<QQQQQQ")
+LINE_RECORD = struct.Struct("<QIII")
+NOTE_RECORD = struct.Struct("<QI")
+# Note count of a line whose source entry has no "notes" key, so entry() can leave it out
+NO_NOTES = 0xFFFFFFFF
+
+def build_store(store_path, sources):
+    """
+    Pack per-play JSON files into a store.
+    sources maps play name -> JSON file path. Returns (plays, lines, notes) written.
+    """
+    line_table = array('Q')
+    note_table = array('Q')
+    play_scenes = {}
+    directory = {}
+    tmp_path = store_path + ".tmp"
+
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(HEADER.pack(0, 0, 0, 0, 0, 0))
+
+        def write_text(text):
+            offset = f.tell()
+            data = text.encode('utf-8')
+            f.write(data)
+            return offset, len(data)
+
+        for play, json_path in sources.items():
+            data = json_io.read_json(json_path)
+
+            scenes = []
+            for scene_key, lines in data.items():
+                first_line = len(line_table) // 4
+                labels = list(lines)
+                for label in labels:
+                    entry = lines[label]
+                    offset, length = write_text(entry.get('play', ''))
+                    notes = entry.get('notes') or []
+                    note_count = len(notes) if 'notes' in entry else NO_NOTES
+                    line_table.extend((offset, length, len(note_table) // 2, note_count))
+                    for note in notes:
+                        note_table.extend(write_text(note))
+
+                # Scenes numbered 1..n need no label list: line n is at first_line + n - 1
+                dense = labels == [str(n) for n in range(1, len(labels) + 1)]
+                scenes.append([scene_key, first_line, len(labels), None if dense else labels])
+
+            play_scenes[play] = scenes
+
+        lines_offset = f.tell()
+        for offset, length, first_note, note_count in zip(*[iter(line_table)] * 4):
+            f.write(LINE_RECORD.pack(offset, length, first_note, note_count))
+        notes_offset = f.tell()
+        for offset, length in zip(*[iter(note_table)] * 2):
+            f.write(NOTE_RECORD.pack(offset, length))
+
+        for play, scenes in play_scenes.items():
+            directory[play] = write_text(json.dumps(scenes, ensure_ascii=False))
+
+        directory_offset = f.tell()
+        directory_bytes = json.dumps(directory, ensure_ascii=False).encode('utf-8')
+        f.write(directory_bytes)
+
+        f.seek(len(MAGIC))
+        f.write(HEADER.pack(directory_offset, len(directory_bytes),
+                            lines_offset, len(line_table) // 4,
+                            notes_offset, len(note_table) // 2))
+
+    os.replace(tmp_path, store_path)
+    return len(directory), len(line_table) // 4, len(note_table) // 2
+
+class CorpusStore:
+    """Read-only view of a store file; lookups slice the mmap directly."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.file = open(self.path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a corpus store")
+
+        (directory_offset, directory_length, self.lines_offset, self.line_count,
+         self.notes_offset, self.note_count) = HEADER.unpack_from(self.data, len(MAGIC))
+        self.directory = json.loads(self.data[directory_offset:directory_offset + directory_length])
+        self.play_scenes = {}
+        self.scene_maps = {}
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def plays(self):
+        """Names of the plays in the store."""
+        return list(self.directory)
+
+    def _scenes(self, play):
+        scenes = self.play_scenes.get(play)
+        if scenes is None:
+            try:
+                offset, length = self.directory[play]
+            except KeyError:
+                raise KeyError(f"No play {play!r} in {self.path}") from None
+            scenes = self.play_scenes[play] = json.loads(self.data[offset:offset + length])
+        return scenes
+
+    def scenes(self, play):
+        """Scene keys of a play, in canonical act/scene order."""
+        return list(self._scene_map(play)[0])
+
+    def _scene_map(self, play):
+        scene_map = self.scene_maps.get(play)
+        if scene_map is None:
+            entries = {entry[0]: entry for entry in self._scenes(play)}
+            scene_map = self.scene_maps[play] = (SceneIndex(entries), entries)
+        return scene_map
+
+    def _scene(self, play, act, scene):
+        scene_index, entries = self._scene_map(play)
+        try:
+            if act is None:
+                return entries[scene]
+            return entries[scene_index.key(parse_number(str(act)), parse_number(str(scene)))]
+        except KeyError:
+            raise KeyError(f"{play}: no scene {scene if act is None else (act, scene)!r}") from None
+
+    def line_index(self, play, act, scene, line):
+        """
+        Global index of a line. Scenes are addressed by (act, scene) numbers, or by
+        their stored key with act=None; line is the line's key within the scene.
+        """
+        entry = self._scene(play, act, scene)
+        _, first_line, count, labels = entry
+        label = str(line)
+        if labels is None:
+            number = int(label) if label.isdigit() else 0
+            if 1 <= number <= count:
+                return first_line + number - 1
+        else:
+            if isinstance(labels, list):
+                # Turn the stored label list into a lookup table on first use
+                labels = entry[3] = {name: i for i, name in enumerate(labels)}
+            if label in labels:
+                return first_line + labels[label]
+        raise KeyError(f"{play} {act} {scene}: no line {line!r}")
+
+    def _line_record(self, index):
+        return LINE_RECORD.unpack_from(self.data, self.lines_offset + index * LINE_RECORD.size)
+
+    def line_bytes(self, play, act, scene, line):
+        """
+        The line's UTF-8 text as a zero-copy memoryview into the store.
+        Release the view before closing the store.
+        """
+        offset, length, _, _ = self._line_record(self.line_index(play, act, scene, line))
+        return memoryview(self.data)[offset:offset + length]
+
+    def line(self, play, act, scene, line):
+        """The line's "play" text."""
+        offset, length, _, _ = self._line_record(self.line_index(play, act, scene, line))
+        return self.data[offset:offset + length].decode('utf-8')
+
+    def notes(self, play, act, scene, line):
+        """The line's notes, as a list of strings."""
+        _, _, first_note, note_count = self._line_record(self.line_index(play, act, scene, line))
+        return self._read_notes(first_note, note_count)
+
+    def _read_notes(self, first_note, note_count):
+        if note_count == NO_NOTES:
+            return []
+        notes = []
+        for index in range(first_note, first_note + note_count):
+            offset, length = NOTE_RECORD.unpack_from(self.data, self.notes_offset + index * NOTE_RECORD.size)
+            notes.append(self.data[offset:offset + length].decode('utf-8'))
+        return notes
+
+    def entry(self, play, act, scene, line):
+        """
+        The line as in the source JSON: {"play": ..., "notes": [...]}, without
+        "notes" when the source line had no notes key.
+        """
+        offset, length, first_note, note_count = self._line_record(self.line_index(play, act, scene, line))
+        entry = {"play": self.data[offset:offset + length].decode('utf-8')}
+        if note_count != NO_NOTES:
+            entry["notes"] = self._read_notes(first_note, note_count)
+        return entry
+
+def main():
+    """
+    python corpus_store.py build <store> <play.json> ...     (play names are the file names without .json)
+    python corpus_store.py get <store> <play> <act> <scene> <line>
+    """
+    if len(sys.argv) >= 4 and sys.argv[1] == "build":
+        store_path = sys.argv[2]
+        sources = {os.path.splitext(os.path.basename(path))[0]: path for path in sys.argv[3:]}
+        plays, lines, notes = build_store(store_path, sources)
+        print(f"✓ Packed {plays} plays, {lines} lines and {notes} notes into {store_path}")
+    elif len(sys.argv) == 7 and sys.argv[1] == "get":
+        with CorpusStore(sys.argv[2]) as store:
+            print(json.dumps(store.entry(*sys.argv[3:7]), indent=2, ensure_ascii=False))
+    else:
+        print("Usage: python corpus_store.py build <store> <play.json> ...")
+        print("       python corpus_store.py get <store> <play> <act> <scene> <line>")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Candidate index for fuzzy bibliography lookups
+# CompleteNotesProcessor.calculate_similarity() scores a word against a key as
+# 1.0 (same word ignoring case), 0.9 (same length, at most 2 characters differ)
+# or 0.8 (one contains the other), and 0.0 otherwise. A FuzzyIndex returns, for a
+# word, every key that can score above 0.0 without comparing it to every key:
+#   same word     - lookup in a lowercase key table
+#   <= 2 changes  - split both into 3 parts; with at most 2 differences one part is
+#                   unchanged, so keys are indexed by (length, part number, part)
+#   containment   - keys inside the word: lookup of the word's substrings;
+#                   the word inside keys: the posting list of its rarest trigram
+# Candidates come back in bibliography order and are still scored with
+# calculate_similarity(), so the best match is exactly the one a full scan finds.
+
+PARTS = 3
+MIN_CONTAINED = 3
+
+def split_parts(text):
+    """Split text into PARTS contiguous pieces of near-equal length."""
+    length = len(text)
+    bounds = [length * i // PARTS for i in range(PARTS + 1)]
+    return [text[bounds[i]:bounds[i + 1]] for i in range(PARTS)]
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class FuzzyIndex:
+    """Index of keys by lowercase form, length-bucketed parts and trigrams."""
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.by_lower = {}
+        self.by_part = {}
+        self.by_trigram = {}
+        self.max_length = 0
+
+        for position, key in enumerate(self.keys):
+            lower = key.lower()
+            self.max_length = max(self.max_length, len(lower))
+            self.by_lower.setdefault(lower, []).append(position)
+            for part_number, part in enumerate(split_parts(lower)):
+                self.by_part.setdefault((len(key), part_number, part), []).append(position)
+            if len(key) >= MIN_CONTAINED:
+                for trigram in trigrams(lower):
+                    self.by_trigram.setdefault(trigram, []).append(position)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def candidates(self, word):
+        """Keys that may be similar to word, in the order they were given."""
+        lower = word.lower()
+        positions = set(self.by_lower.get(lower, ()))
+
+        # Same length with at most 2 differences: one of the 3 parts is unchanged
+        for part_number, part in enumerate(split_parts(lower)):
+            positions.update(self.by_part.get((len(word), part_number, part), ()))
+
+        if len(word) >= MIN_CONTAINED:
+            # Keys contained in the word
+            for start in range(len(lower)):
+                for end in range(start + MIN_CONTAINED, min(len(lower), start + self.max_length) + 1):
+                    positions.update(self.by_lower.get(lower[start:end], ()))
+
+            # The word contained in keys: every such key has all of its trigrams
+            postings = [self.by_trigram.get(trigram, ()) for trigram in trigrams(lower)]
+            positions.update(min(postings, key=len))
+
+        return [self.keys[position] for position in sorted(positions)]
@@ -0,0 +1,227 @@
+# Persistent on-disk HTTP cache for the MIT Shakespeare pages
+# Page bodies are stored content-addressed (objects/<sha256>), and each URL has a
+# small JSON entry with the validators (ETag / Last-Modified) the server sent.
+# Cached pages are revalidated with a conditional GET; a 304 is served from disk.
+#
+# Every file is written to a temporary name and moved into place with os.replace,
+# so several scraper processes can share one cache directory: readers only ever
+# see complete files, and a body evicted by another process is just a cache miss.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+DEFAULT_CACHE_DIR = ".http_cache"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+class HttpCache:
+    """Content-addressed page cache with conditional revalidation and LRU eviction."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(self.directory, "objects")
+        self.entries_dir = os.path.join(self.directory, "entries")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.entries_dir, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.evicting = False
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'bytes_downloaded': 0,
+            'evictions': 0
+        }
+        self.total_bytes = self._scan_size()
+
+    def _entry_path(self, url):
+        return os.path.join(self.entries_dir, hashlib.sha256(url.encode('utf-8')).hexdigest() + ".json")
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest)
+
+    def _write_atomic(self, path, data):
+        """Write bytes to path via a temporary file in the same directory."""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _scan_size(self):
+        total = 0
+        for entry in os.scandir(self.objects_dir):
+            if entry.is_file() and not entry.name.startswith(".tmp-"):
+                total += entry.stat().st_size
+        return total
+
+    def _load(self, url):
+        """Return (entry, body bytes) for a cached URL, or (None, None)."""
+        try:
+            with open(self._entry_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(self._object_path(entry['digest']), 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+        if hashlib.sha256(body).hexdigest() != entry['digest']:
+            return None, None
+        return entry, body
+
+    def _store(self, url, response):
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+
+        # The entry goes first: until its body is in place it is just a cache miss,
+        # and evict() never sees a new body without the entry that uses it
+        entry = {
+            'url': url,
+            'digest': digest,
+            'size': len(body),
+            'encoding': response.encoding,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'stored_at': time.time()
+        }
+        self._write_atomic(self._entry_path(url), json.dumps(entry).encode('utf-8'))
+
+        # Checked, written and counted under one lock, so a body two threads store
+        # at once is only counted once
+        with self.lock:
+            if not os.path.exists(object_path):
+                self._write_atomic(object_path, body)
+                self.total_bytes += len(body)
+
+        # Decided under the lock, so only one thread at a time sets off an eviction
+        with self.lock:
+            must_evict = self.total_bytes > self.max_bytes and not self.evicting
+            if must_evict:
+                self.evicting = True
+        if must_evict:
+            try:
+                self.evict()
+            finally:
+                with self.lock:
+                    self.evicting = False
+
+    def _count(self, stat, amount=1):
+        with self.lock:
+            self.stats[stat] += amount
+
+    def fetch(self, url, session):
+        """
+        Fetch a page's text, revalidating any cached copy with a conditional GET.
+        Raises requests.HTTPError for error responses, like fetch_page().
+        """
+        entry, body = self._load(url)
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = session.get(url, headers=headers)
+
+        if entry and response.status_code == 304:
+            self._count('hits')
+            try:
+                # Mark the entry as recently used for eviction
+                os.utime(self._entry_path(url))
+            except OSError:
+                pass
+            return body.decode(entry.get('encoding') or 'utf-8', errors='replace')
+
+        response.raise_for_status()
+        self._count('misses')
+        self._count('bytes_downloaded', len(response.content))
+        self._store(url, response)
+        return response.text
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+        Returns the number of entries removed.
+        """
+        # Bodies written since the scan began may belong to entries it missed; the
+        # margin covers filesystem timestamps that lag the clock
+        scan_started = time.time() - 1.0
+
+        entries = []
+        for item in os.scandir(self.entries_dir):
+            if not item.name.endswith(".json"):
+                continue
+            try:
+                with open(item.path, 'r', encoding='utf-8') as f:
+                    digest = json.load(f)['digest']
+                entries.append((item.stat().st_mtime, item.path, digest))
+            except (OSError, ValueError, KeyError):
+                continue
+
+        entries.sort()
+        # Bodies are shared by content, so only delete one when no remaining entry uses it
+        in_use = {}
+        for _, _, digest in entries:
+            in_use[digest] = in_use.get(digest, 0) + 1
+
+        # Bodies no entry points to any more (pages whose content changed)
+        orphans = []
+        for item in os.scandir(self.objects_dir):
+            if item.name not in in_use and not item.name.startswith(".tmp-"):
+                try:
+                    if item.stat().st_mtime < scan_started:
+                        orphans.append(item.path)
+                except FileNotFoundError:
+                    pass
+
+        # Deleted and accounted under the lock, so no store's byte count is lost
+        with self.lock:
+            removed = 0
+            removed_bytes = 0
+            for object_path in orphans:
+                removed_bytes += self._remove_file(object_path)
+
+            for _, entry_path, digest in entries:
+                if self.total_bytes - removed_bytes <= self.max_bytes:
+                    break
+                self._remove_file(entry_path)
+                removed += 1
+
+                in_use[digest] -= 1
+                if in_use[digest] == 0:
+                    removed_bytes += self._remove_file(self._object_path(digest))
+
+            self.total_bytes -= removed_bytes
+            self.stats['evictions'] += removed
+        return removed
+
+    def _remove_file(self, path):
+        """Delete a file if it is still there; returns the bytes freed."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return 0
+        return size
+
+    def get_report(self):
+        """Return the cache counters plus its current size on disk."""
+        with self.lock:
+            report = dict(self.stats)
+            report['bytes_on_disk'] = self.total_bytes
+        requests_made = report['hits'] + report['misses']
+        report['hit_ratio'] = report['hits'] / requests_made if requests_made else 0.0
+        return report
@@ -0,0 +1,58 @@
+# JSON serializer layer shared by every JSON writer
+# Uses orjson when it is installed and the standard library otherwise. Both
+# produce the same text: pretty mode is exactly json.dump(indent=2,
+# ensure_ascii=False), for files people read, and compact mode drops all
+# whitespace, for files only programs read.
+#
+# Install the fast backend with: pip install orjson
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+if orjson is not None:
+    _PRETTY_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    _COMPACT_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def dumps_bytes(obj, compact=False):
+    """Serialize obj to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=_COMPACT_OPTIONS if compact else _PRETTY_OPTIONS)
+    return dumps(obj, compact).encode('utf-8')
+
+def dumps(obj, compact=False):
+    """Serialize obj to a JSON string."""
+    if orjson is not None:
+        return dumps_bytes(obj, compact).decode('utf-8')
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+def dump(obj, f, compact=False):
+    """Write obj as JSON to a text file opened with encoding='utf-8'."""
+    f.write(dumps(obj, compact))
+
+def loads(data):
+    """Parse JSON from str or UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load(f):
+    """Parse JSON from an open file (text or binary)."""
+    return loads(f.read())
+
+def write_json(path, obj, compact=False):
+    """Write obj to path as UTF-8 JSON."""
+    with open(path, 'wb') as f:
+        f.write(dumps_bytes(obj, compact))
+
+def read_json(path):
+    """Read a UTF-8 JSON file."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
@@ -0,0 +1,148 @@
+# Lazy, scene-level access to the notes JSON files
+# Files like macbeth_notes.json are one big object of "ACT X, SCENE Y" scenes.
+# A sidecar index (<file>.idx) records the byte span of every scene's value, so a
+# single scene can be decoded on its own with json.loads instead of parsing the
+# whole file. LazyNotes exposes a file as a read-only mapping that decodes scenes
+# the first time they are accessed.
+#
+# The index is built with one regex scan over the raw bytes (strings are matched
+# whole, so braces inside notes are never counted) and rebuilt whenever the
+# source file's size or modification time no longer match.
+
+import json
+import os
+import re
+import sys
+from collections.abc import Mapping
+
+import json_io
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+# A whole JSON string, or one structural character
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]:,]', re.DOTALL)
+
+def scan_scene_spans(data):
+    """
+    Return [(key, start, end), ...] for the members of the top-level JSON object in
+    data (bytes), in file order. data[start:end] is the member's encoded value.
+    """
+    spans = []
+    depth = 0
+    key = None
+    value_start = None
+    colon_end = None
+
+    for match in _TOKEN.finditer(data):
+        token = match.group()[0]
+
+        if depth == 1:
+            if token == 0x22:  # '"'
+                if key is None:
+                    key = json.loads(match.group())
+                elif colon_end is not None:
+                    spans.append((key, match.start(), match.end()))
+                    key = colon_end = None
+                continue
+            if token == 0x3A:  # ':'
+                colon_end = match.end()
+                continue
+            if token in (0x2C, 0x7D) and colon_end is not None:  # ',' or '}' after a bare number/literal
+                raw = data[colon_end:match.start()]
+                start = colon_end + len(raw) - len(raw.lstrip())
+                end = colon_end + len(raw.rstrip())
+                spans.append((key, start, end))
+                key = colon_end = None
+
+        if token in (0x7B, 0x5B):  # '{' '['
+            if depth == 1:
+                value_start = match.start()
+            depth += 1
+        elif token in (0x7D, 0x5D):  # '}' ']'
+            depth -= 1
+            if depth == 1 and value_start is not None:
+                spans.append((key, value_start, match.end()))
+                key = colon_end = value_start = None
+
+    return spans
+
+def index_path_for(json_path):
+    return json_path + INDEX_SUFFIX
+
+def build_index(json_path, index_path=None):
+    """Scan a notes file and write its sidecar index. Returns the index dict."""
+    stat = os.stat(json_path)
+    with open(json_path, 'rb') as f:
+        data = f.read()
+
+    index = {
+        'version': INDEX_VERSION,
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'scenes': scan_scene_spans(data)
+    }
+    tmp_path = (index_path or index_path_for(json_path)) + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_path, index_path or index_path_for(json_path))
+    return index
+
+def load_index(json_path, index_path=None):
+    """Return the sidecar index for a notes file, rebuilding it if it is missing or stale."""
+    index_path = index_path or index_path_for(json_path)
+    stat = os.stat(json_path)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if (index.get('version') == INDEX_VERSION
+                and index.get('source_size') == stat.st_size
+                and index.get('source_mtime_ns') == stat.st_mtime_ns):
+            return index
+    except (OSError, ValueError):
+        pass
+    return build_index(json_path, index_path)
+
+class LazyNotes(Mapping):
+    """Read-only mapping of scene key -> scene dict, decoding each scene on first access."""
+
+    def __init__(self, json_path, index_path=None):
+        self.json_path = json_path
+        index = load_index(json_path, index_path)
+
+        # Like json.load, a repeated key keeps its first position and its last value
+        self.spans = {}
+        for key, start, end in index['scenes']:
+            self.spans[key] = (start, end)
+        self.scenes = {}
+
+    def __getitem__(self, key):
+        scene = self.scenes.get(key)
+        if scene is None:
+            start, end = self.spans[key]
+            with open(self.json_path, 'rb') as f:
+                f.seek(start)
+                scene = self.scenes[key] = json_io.loads(f.read(end - start))
+        return scene
+
+    def __iter__(self):
+        return iter(self.spans)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, key):
+        return key in self.spans
+
+def main():
+    """Build or refresh the sidecar index of notes files: python lazy_notes.py <notes.json> ..."""
+    if len(sys.argv) < 2:
+        print("Usage: python lazy_notes.py <notes.json> ...")
+        return
+
+    for json_path in sys.argv[1:]:
+        index = load_index(json_path)
+        print(f"✓ {index_path_for(json_path)}: {len(index['scenes'])} scenes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Line wrapping shared by every scraper
+# Produces exactly the same lines as the original split_long_line(), which built
+# `current_line + " " + word` for every word. Break points are found with
+# str.rfind on the line itself, or from running word lengths when the line has
+# doubled/edge spaces or a word longer than the limit, so no temporary strings
+# are built per word and wrapping stays linear in the length of the line.
+
+DEFAULT_MAX_LENGTH = 120
+
+def _split_by_word_lengths(line, max_length):
+    """
+    Reproduce split_long_line() word by word, tracking the current line's length
+    and the index of its first word instead of the string itself.
+    """
+    words = line.split(' ')
+    lines = []
+    start = 0
+    current_length = 0
+
+    for i, word in enumerate(words):
+        word_length = len(word)
+        if current_length + 1 + word_length <= max_length:
+            if current_length:
+                current_length += 1 + word_length
+            else:
+                start = i
+                current_length = word_length
+        elif current_length:
+            lines.append(' '.join(words[start:i]))
+            start = i
+            current_length = word_length
+        else:
+            # Single word longer than max_length, just add it
+            lines.append(word)
+            start = i + 1
+
+    if current_length:
+        lines.append(' '.join(words[start:]))
+
+    return lines
+
+def split_long_line(line, max_length=DEFAULT_MAX_LENGTH):
+    """
+    Split a line if it's longer than max_length characters.
+    Returns a list of lines.
+    """
+    length = len(line)
+    if length <= max_length:
+        return [line]
+
+    # Doubled or edge spaces give empty words, which the word-by-word rules treat specially
+    if '  ' in line or line[0] == ' ' or line[-1] == ' ':
+        return _split_by_word_lengths(line, max_length)
+
+    lines = []
+    position = 0
+    while length - position > max_length:
+        # Last space that keeps this piece within max_length
+        space = line.rfind(' ', position + 1, position + max_length + 1)
+        if space == -1:
+            # A word longer than max_length
+            return _split_by_word_lengths(line, max_length)
+        lines.append(line[position:space])
+        position = space + 1
+
+    lines.append(line[position:])
+    return lines
+
+def wrap_lines(lines, max_length=DEFAULT_MAX_LENGTH):
+    """
+    Wrap a batch of lines (e.g. a whole scene) at once.
+    Returns one flat list; lines that already fit are passed through untouched.
+    """
+    wrapped = []
+    append = wrapped.append
+    for line in lines:
+        if len(line) <= max_length:
+            append(line)
+        else:
+            wrapped.extend(split_long_line(line, max_length))
+    return wrapped
@@ -0,0 +1,153 @@
+# Rebuild MIT-style Shakespeare pages from the bundled *_structured.txt files
+# The repo does not ship the original HTML, so benchmarks and offline runs use
+# pages rendered back from our own scraped text. Scraping a mirror built here
+# reproduces the *_structured.txt file it was rendered from, with scenes in
+# canonical act/scene order.
+
+import os
+import re
+import sys
+
+from play_scraper import PLAYS
+
+SCENE_HEADING = re.compile(r'^ACT (\d+) SCENE (\d+)$')
+NUMBERED_LINE = re.compile(r'^(\d+): (.*)$')
+SPEAKER_LINE = re.compile(r"^([A-Z][A-Za-z'\.\- ]*?): (.*)$")
+
+ROMAN = [(10, 'X'), (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I')]
+
+def to_roman(number):
+    """Convert a small scene number to the roman numerals MIT uses in headings."""
+    result = ""
+    for value, numeral in ROMAN:
+        while number >= value:
+            result += numeral
+            number -= value
+    return result
+
+def read_structured_scenes(txt_file_path):
+    """
+    Read a *_structured.txt file back into scenes.
+    Returns a list of ((act, scene), speeches) where speeches is a list of
+    (speaker, [lines]). Wrapped continuation lines are joined back together.
+    """
+    scenes = []
+    speeches = None
+
+    with open(txt_file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+
+            heading = SCENE_HEADING.match(line)
+            if heading:
+                speeches = []
+                scenes.append(((heading.group(1), heading.group(2)), speeches))
+                continue
+
+            if not line or speeches is None:
+                continue
+
+            numbered = NUMBERED_LINE.match(line)
+            if numbered:
+                text = numbered.group(2)
+                speaker = SPEAKER_LINE.match(text)
+                # A "SPEAKER: " prefix repeating the current speaker is part of the text:
+                # the scrapers only print the speaker when it changes
+                if speaker and (not speeches or speaker.group(1) != speeches[-1][0]):
+                    speeches.append((speaker.group(1), [speaker.group(2)]))
+                elif not speeches:
+                    speeches.append(("", [text]))
+                else:
+                    speeches[-1][1].append(text)
+            elif speeches:
+                # Continuation of a line split at 120 characters
+                speeches[-1][1][-1] += " " + line
+
+    return scenes
+
+def render_index(play, scene_keys):
+    """Render the index.html page listing every scene of a play."""
+    links = []
+    for act, scene in scene_keys:
+        links.append(f'<a href="{play.slug}.{act}.{scene}.html">Act {act}, Scene {scene}</a><br>')
+
+    return (
+        f"<html>\n<head>\n<title>{play.title}: List of Scenes</title>\n</head>\n"
+        f"<body bgcolor=\"#ffffff\" text=\"#000000\">\n<h1>{play.title}</h1>\n"
+        + "\n".join(links)
+        + "\n</body>\n</html>\n"
+    )
+
+def render_scene(play, act, scene, speeches):
+    """Render one scene page in the MIT markup the scrapers parse."""
+    parts = [
+        f"<html>\n<head>\n<title>{play.title}: Act {act}, Scene {scene}\n </title>\n</head>",
+        "<body bgcolor=\"#ffffff\" text=\"#000000\">",
+        "<table width=\"100%\" bgcolor=\"#CCF6F6\">",
+        f"<tr><td class=\"play\" align=\"center\">{play.title}",
+        f"<tr><td class=\"nav\" align=\"center\"><A href=\"/{play.slug}/\">{play.title}</A> | Act {act}, Scene {scene}",
+        "</table>",
+        f"<H3>SCENE {to_roman(int(scene)) or scene}.</h3>",
+    ]
+
+    line_number = 0
+    for speech_number, (speaker, lines) in enumerate(speeches, 1):
+        parts.append(f"<A NAME=speech{speech_number}><b>{speaker}</b></a>\n<blockquote>")
+        for text in lines:
+            line_number += 1
+            parts.append(f"<A NAME={line_number}>{text}</A><br>")
+        parts.append("</blockquote>")
+
+    parts.append("</body>\n</html>\n")
+    return "\n".join(parts)
+
+def render_play(key):
+    """
+    Render every page of one play from its bundled structured text.
+    Returns a dict of file name -> HTML, or None if the text file is missing.
+    """
+    play = PLAYS[key]
+    txt_file = play.output_file.replace('_theatrical.txt', '_structured.txt')
+    if not os.path.exists(txt_file):
+        return None
+
+    scenes = read_structured_scenes(txt_file)
+    pages = {"index.html": render_index(play, [scene_key for scene_key, _ in scenes])}
+    for (act, scene), speeches in scenes:
+        pages[f"{play.slug}.{act}.{scene}.html"] = render_scene(play, act, scene, speeches)
+
+    return pages
+
+def build_mirror(root, keys=None):
+    """
+    Write a directory tree laid out like shakespeare.mit.edu (root/<slug>/<page>).
+    Returns the number of pages written.
+    """
+    written = 0
+    for key in keys or PLAYS:
+        pages = render_play(key)
+        if pages is None:
+            print(f"  ✗ No structured text for {key}, skipping")
+            continue
+
+        play_dir = os.path.join(root, PLAYS[key].slug)
+        os.makedirs(play_dir, exist_ok=True)
+        for name, html in pages.items():
+            with open(os.path.join(play_dir, name), 'w', encoding='utf-8') as f:
+                f.write(html)
+        written += len(pages)
+
+    return written
+
+def main():
+    """Build a local mirror: python mit_mirror.py <directory> [play ...]"""
+    if len(sys.argv) < 2:
+        print("Usage: python mit_mirror.py <directory> [play ...]")
+        return
+
+    root = sys.argv[1]
+    written = build_mirror(root, sys.argv[2:] or None)
+    print(f"✓ Wrote {written} pages to {root}")
+
+if __name__ == "__main__":
+    main()
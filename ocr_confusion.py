@@ -0,0 +1,66 @@
+# OCR confusion matrix for reading bibliography keys
+# OCR misreads a few characters for one another (i / l / 1, o / 0). Instead of
+# adding a copy of every key with each of those substitutions applied, a
+# ConfusionMatrix gives each confusion a small cost, and ReferenceMatcher reads
+# the real keys through it: a word matches a key when it is the key with some
+# characters misread, at a total cost of at most max_cost (reading_cost()). That
+# is a weighted edit distance in which any other edit costs EDIT_COST; max_cost
+# must stay below EDIT_COST, so only confusions ever fit under the bound, and a
+# key can only match text whose characters are each alike() the key's.
+#
+# A glyph is misread the same way throughout a word: every occurrence of a key
+# character is read as the same character. "Ha11iwe11" and "Haiiiweii" read as
+# "Halliwell", but "Hail" is not a misreading of "Hall".
+
+EDIT_COST = 1.0
+
+class ConfusionMatrix:
+    """Costs of reading a key's character as another one, and the bound on their total."""
+
+    def __init__(self, confusions, max_cost):
+        # confusions: {key character: {character read instead: cost}}
+        if max_cost >= EDIT_COST:
+            raise ValueError(f"max_cost must be below the cost of an edit ({EDIT_COST}), got {max_cost}")
+        self.max_cost = max_cost
+        self.costs = {}
+        for key_char, readings in confusions.items():
+            for read_char, cost in readings.items():
+                self.costs[(key_char, read_char)] = cost
+
+        # Characters that may stand for one another
+        classes = {}
+        for key_char, read_char in self.costs:
+            merged = classes.get(key_char, {key_char}) | classes.get(read_char, {read_char})
+            for char in merged:
+                classes[char] = merged
+        self.classes = {char: tuple(sorted(merged)) for char, merged in classes.items()}
+
+    def alike(self, char):
+        """char and every character confusable with it, directly or through others."""
+        return self.classes.get(char, (char,))
+
+    @classmethod
+    def from_source(cls, source):
+        """The matrix of a decoded bibliography file (ocr_confusions, max_ocr_cost)."""
+        return cls(source.get('ocr_confusions', {}), source.get('max_ocr_cost', 0.0))
+
+    def __bool__(self):
+        return bool(self.costs)
+
+    def __len__(self):
+        return len(self.costs)
+
+    def reading_cost(self, word, key):
+        """Total cost of reading key as word, or None if word is not a misreading within max_cost."""
+        if len(word) != len(key):
+            return None
+        cost = 0.0
+        read_as = {}
+        for key_char, read_char in zip(key, word):
+            if read_as.setdefault(key_char, read_char) != read_char:
+                return None
+            if key_char != read_char:
+                cost += self.costs.get((key_char, read_char), EDIT_COST)
+                if cost > self.max_cost:
+                    return None
+        return cost
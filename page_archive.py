@@ -0,0 +1,158 @@
+# Offline page sources for replaying scrapes without network access
+# play_scraper.py can read pages from a local copy of shakespeare.mit.edu instead
+# of the site (--offline PATH): either a mirror directory laid out like the site
+# (as written by mit_mirror.py), or a single archive file packed from a mirror
+# or from the HTTP cache of a live run.
+#
+# Archive layout: MAGIC, the page bodies back to back, a JSON index mapping each
+# page path to [offset, length, encoding], then the index offset as 8 bytes
+# (little-endian). The file is read through mmap, so a lookup is one dict access
+# and one slice and only the pages actually read are paged in.
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+from http_cache import DEFAULT_CACHE_DIR
+
+MAGIC = b"SHAKESPEARE-ARCHIVE/1\n"
+FOOTER = struct.Struct("<Q")
+
+class MirrorDirectory:
+    """Pages stored as files under root/<path>, like the site itself."""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+
+    def read(self, path):
+        """Return the text of the page at a site-relative path."""
+        file_path = os.path.join(self.root, *path.split('/'))
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def paths(self):
+        """Every page path in the mirror."""
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                relative = os.path.relpath(os.path.join(directory, name), self.root)
+                yield relative.replace(os.sep, '/')
+
+    def close(self):
+        pass
+
+class PageArchive:
+    """Read-only, mmap-backed single-file page archive."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.file = open(self.path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files
+            self.file.close()
+            raise ValueError(f"{path} is not a page archive") from None
+
+        if self.data[:len(MAGIC)] != MAGIC or len(self.data) < len(MAGIC) + FOOTER.size:
+            self.close()
+            raise ValueError(f"{path} is not a page archive")
+
+        index_offset, = FOOTER.unpack_from(self.data, len(self.data) - FOOTER.size)
+        self.index = json.loads(self.data[index_offset:len(self.data) - FOOTER.size])
+
+    def read(self, path):
+        """Return the text of the page at a site-relative path."""
+        try:
+            offset, length, encoding = self.index[path]
+        except KeyError:
+            raise FileNotFoundError(f"{path} is not in {self.path}") from None
+        return self.data[offset:offset + length].decode(encoding or 'utf-8', errors='replace')
+
+    def paths(self):
+        """Every page path in the archive."""
+        return iter(self.index)
+
+    def close(self):
+        if getattr(self, 'data', None) is not None:
+            self.data.close()
+            self.data = None
+        self.file.close()
+
+def write_archive(archive_path, pages):
+    """
+    Pack pages into an archive file.
+    pages is an iterable of (site-relative path, body bytes, encoding).
+    Returns the number of pages written.
+    """
+    index = {}
+    tmp_path = archive_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        for path, body, encoding in pages:
+            index[path] = [f.tell(), len(body), encoding]
+            f.write(body)
+        index_offset = f.tell()
+        f.write(json.dumps(index, sort_keys=True).encode('utf-8'))
+        f.write(FOOTER.pack(index_offset))
+    os.replace(tmp_path, archive_path)
+    return len(index)
+
+def mirror_pages(root):
+    """Yield (path, body, encoding) for every page of a mirror directory."""
+    mirror = MirrorDirectory(root)
+    for path in sorted(mirror.paths()):
+        with open(os.path.join(mirror.root, *path.split('/')), 'rb') as f:
+            yield path, f.read(), 'utf-8'
+
+def cache_pages(cache_dir, base_url):
+    """
+    Yield (path, body, encoding) for every page under base_url recorded in an
+    HttpCache directory, e.g. after a live scrape.
+    """
+    entries_dir = os.path.join(cache_dir, "entries")
+    objects_dir = os.path.join(cache_dir, "objects")
+    for name in sorted(os.listdir(entries_dir)):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(entries_dir, name), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if not entry['url'].startswith(base_url):
+                continue
+            with open(os.path.join(objects_dir, entry['digest']), 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError, KeyError):
+            continue
+        yield entry['url'][len(base_url):], body, entry.get('encoding')
+
+def open_source(path):
+    """Open a mirror directory or an archive file as a page source."""
+    if os.path.isdir(path):
+        return MirrorDirectory(path)
+    return PageArchive(path)
+
+def main():
+    """
+    Pack a mirror directory or an HTTP cache into an archive file:
+    python page_archive.py <archive> <mirror directory>
+    python page_archive.py <archive> --from-cache [cache directory]
+    """
+    from play_scraper import BASE_URL
+
+    if len(sys.argv) < 3:
+        print("Usage: python page_archive.py <archive> <mirror directory>")
+        print(f"       python page_archive.py <archive> --from-cache [cache directory (default: {DEFAULT_CACHE_DIR})]")
+        return
+
+    archive_path = sys.argv[1]
+    if sys.argv[2] == "--from-cache":
+        cache_dir = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_CACHE_DIR
+        written = write_archive(archive_path, cache_pages(cache_dir, BASE_URL))
+    else:
+        written = write_archive(archive_path, mirror_pages(sys.argv[2]))
+    print(f"✓ Packed {written} pages into {archive_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,602 @@
+# Generic scraper engine for the MIT Shakespeare plays
+# Every per-play scraper script delegates to scrape_play() with its key from PLAYS.
+# One pooled requests.Session is shared across all scenes and plays, so a corpus
+# refresh reuses connections instead of opening a new one for every scene.
+# With concurrency > 1 the scene pages of a play are downloaded concurrently
+# (a thread pool, at most `concurrency` requests in flight per play) and still
+# processed in act/scene order; code already running an event loop can await
+# fetch_pages_async() instead. Across every play and thread, at most
+# MAX_HOST_CONNECTIONS requests are in flight to one host, so the shared
+# connection pool never has to open and discard extra connections.
+# Pages go through the on-disk HttpCache (http_cache.py) unless it is disabled,
+# so reruns only revalidate pages with conditional GETs.
+# Each parsed scene is checkpointed (scrape_manifest.py); --resume refetches only
+# the scenes that are missing or failed and reassembles the output file.
+# Output is streamed scene by scene (scene_writer.py) and renamed into place at the end.
+# Scene pages are parsed in a single pass by scene_tokenizer.py, optionally on a
+# process pool; scrape_all.py uses that to scrape every play at once.
+# With OFFLINE_SOURCE set (--offline) pages under BASE_URL are read from a local
+# mirror directory or archive file (page_archive.py) and the network is never used.
+
+import argparse
+import asyncio
+import os
+import re
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, HttpCache
+from line_wrap import split_long_line, wrap_lines
+from page_archive import open_source
+from scene_tokenizer import DIRECTION, LINE, SPEECH, scene_location, tokenize_scene
+from scene_writer import StreamingSceneWriter
+from scrape_manifest import DEFAULT_CHECKPOINT_DIR, ScrapeManifest
+
+BASE_URL = "http://shakespeare.mit.edu/"
+
+# Output formats:
+#   "structured" - "ACT X SCENE Y" headings and "number: SPEAKER: dialogue" lines (same as Coriolanus)
+#   "theatrical" - banner, scene locations, stage directions and SPEAKER/DIALOGUE/CONTINUED lines
+Play = namedtuple('Play', ['slug', 'title', 'output_file', 'output_format'])
+
+PLAYS = {
+    "as_you_like_it": Play("asyoulikeit", "As You Like It", "As_You_Like_It_structured.txt", "structured"),
+    "cymbeline": Play("cymbeline", "Cymbeline", "Cymbeline_theatrical.txt", "theatrical"),
+    "henry_iv_part1": Play("1henryiv", "Henry IV Part 1", "Henry_IV_Part1_structured.txt", "structured"),
+    "henry_iv_part2": Play("2henryiv", "Henry IV Part 2", "Henry_IV_Part2_structured.txt", "structured"),
+    "julius_caesar": Play("julius_caesar", "Julius Caesar", "Julius_Caesar_structured.txt", "structured"),
+    "king_john": Play("john", "King John", "King_John_structured.txt", "structured"),
+    "loves_labours_lost": Play("lll", "Love's Labour's Lost", "Loves_Labours_Lost_structured.txt", "structured"),
+    "merchant_venice": Play("merchant", "Merchant of Venice", "Merchant_of_Venice_structured.txt", "structured"),
+    "midsummer_nights_dream": Play("midsummer", "A Midsummer Night's Dream", "Midsummer_Nights_Dream_structured.txt", "structured"),
+    "much_ado_nothing": Play("much_ado", "Much Ado About Nothing", "Much_Ado_About_Nothing_structured.txt", "structured"),
+    "richard_ii": Play("richardii", "Richard II", "Richard_II_structured.txt", "structured"),
+    "richard_iii": Play("richardiii", "Richard III", "Richard_III_structured.txt", "structured"),
+    "romeo_juliet": Play("romeo_juliet", "Romeo and Juliet", "Romeo_and_Juliet_structured.txt", "structured"),
+    "tempest": Play("tempest", "The Tempest", "The_Tempest_structured.txt", "structured"),
+    "troilus_cressida": Play("troilus_cressida", "Troilus and Cressida", "Troilus_and_Cressida_structured.txt", "structured"),
+    "twelfth_night": Play("twelfth_night", "Twelfth Night", "Twelfth_Night_structured.txt", "structured"),
+    "winters_tale": Play("winters_tale", "The Winter's Tale", "The_Winters_Tale_structured.txt", "structured"),
+}
+
+# The connection pool is sized so the default concurrency never has to drop connections
+DEFAULT_CONCURRENCY = 8
+POOL_MAXSIZE = 16
+# Requests in flight to one host across all threads; never more than the pool holds
+MAX_HOST_CONNECTIONS = POOL_MAXSIZE
+
+# Set CACHE_DIR to None to always download pages
+CACHE_DIR = DEFAULT_CACHE_DIR
+CACHE_MAX_BYTES = DEFAULT_MAX_BYTES
+
+# Per-scene checkpoints and their manifest, one subdirectory per play
+CHECKPOINT_DIR = DEFAULT_CHECKPOINT_DIR
+
+# Requests per second across every thread fetching pages; None means no limit
+RATE_LIMIT = None
+# What scrape_all.py limits a whole-corpus run to unless told otherwise
+DEFAULT_RATE_LIMIT = 8.0
+
+# Mirror directory or archive file to replay pages from; None means fetch them
+OFFLINE_SOURCE = None
+
+_session = None
+_cache = None
+_rate_limiter = None
+_page_source = None
+_page_source_path = None
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+class RateLimiter:
+    """Spaces requests at least 1/requests_per_second apart, across all threads."""
+
+    def __init__(self, requests_per_second):
+        self.requests_per_second = requests_per_second
+        self.interval = 1.0 / requests_per_second
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def wait(self):
+        """Block until this caller's request slot comes up."""
+        with self.lock:
+            slot = max(self.next_slot, time.monotonic())
+            self.next_slot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+def get_session():
+    """
+    Return the shared requests.Session, creating it on first use.
+    The adapter keeps a pool of keep-alive connections to the MIT host.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        # pool_block: wait for a free connection rather than open one that is thrown away
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE, pool_block=True)
+        _session.mount('http://', adapter)
+        _session.mount('https://', adapter)
+    return _session
+
+def get_cache():
+    """
+    Return the shared HttpCache, creating it on first use, or None if caching is disabled.
+    """
+    global _cache
+    if CACHE_DIR is None:
+        return None
+    if _cache is None or _cache.directory != os.path.abspath(CACHE_DIR):
+        _cache = HttpCache(CACHE_DIR, CACHE_MAX_BYTES)
+    return _cache
+
+def get_rate_limiter():
+    """
+    Return the shared RateLimiter for RATE_LIMIT, or None if requests are not limited.
+    """
+    global _rate_limiter
+    if RATE_LIMIT is None:
+        return None
+    if _rate_limiter is None or _rate_limiter.requests_per_second != RATE_LIMIT:
+        _rate_limiter = RateLimiter(RATE_LIMIT)
+    return _rate_limiter
+
+def get_host_slots(url):
+    """
+    Return the semaphore shared by every thread fetching from url's host, allowing
+    MAX_HOST_CONNECTIONS requests at once.
+    """
+    host = urlsplit(url).netloc
+    with _host_slots_lock:
+        slots = _host_slots.get(host)
+        if slots is None:
+            slots = _host_slots[host] = threading.BoundedSemaphore(MAX_HOST_CONNECTIONS)
+        return slots
+
+def get_page_source():
+    """
+    Return the shared offline page source for OFFLINE_SOURCE, or None when pages are fetched.
+    """
+    global _page_source, _page_source_path
+    if OFFLINE_SOURCE is None:
+        if _page_source is not None:
+            _page_source.close()
+            _page_source = None
+        return None
+    if _page_source is None or _page_source_path != OFFLINE_SOURCE:
+        if _page_source is not None:
+            _page_source.close()
+        _page_source = open_source(OFFLINE_SOURCE)
+        _page_source_path = OFFLINE_SOURCE
+    return _page_source
+
+def fetch_page(url, session=None):
+    """
+    Fetch a page through the pooled session and return its text.
+    Cached pages are revalidated instead of downloaded again.
+    In offline mode the page is read from the local mirror or archive instead.
+    """
+    page_source = get_page_source()
+    if page_source is not None:
+        if not url.startswith(BASE_URL):
+            raise FileNotFoundError(f"{url} is outside {BASE_URL} and cannot be replayed offline")
+        return page_source.read(url[len(BASE_URL):])
+
+    session = session or get_session()
+    with get_host_slots(url):
+        rate_limiter = get_rate_limiter()
+        if rate_limiter is not None:
+            rate_limiter.wait()
+
+        cache = get_cache()
+        if cache is not None:
+            return cache.fetch(url, session)
+
+        response = session.get(url)
+        response.raise_for_status()
+        return response.text
+
+def scene_order(href):
+    """
+    Sort key for scene links: numeric (act, scene), so scene 10 comes after scene 9.
+    """
+    numbers = re.findall(r'\.(\d+)\.(\d+)\.html$', href)
+    if not numbers:
+        return (float('inf'), float('inf'))
+    act_num, scene_num = numbers[0]
+    return (int(act_num), int(scene_num))
+
+async def fetch_pages_async(urls, session=None, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Download pages concurrently with at most `concurrency` requests in flight from
+    this call; fetch_page() also holds every caller to MAX_HOST_CONNECTIONS per host.
+    Returns a list in the same order as urls holding each page's text, or the
+    exception raised while fetching it.
+    """
+    session = session or get_session()
+    loop = asyncio.get_running_loop()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async def fetch(url):
+            return await loop.run_in_executor(executor, fetch_page, url, session)
+
+        return await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+
+def iter_scene_pages(urls, session=None, concurrency=1):
+    """
+    Yield (url, page text or exception) for each url, in order.
+    Pages are fetched one by one, or with concurrency > 1 on one thread pool for the
+    whole call, at most `concurrency * 4` pages ahead of the one being yielded, so
+    only a few pages are held in memory at a time. No event loop is started, so
+    this also works where one is already running (notebooks).
+    """
+    session = session or get_session()
+
+    if concurrency > 1:
+        def result(future):
+            return future.exception() or future.result()
+
+        window = concurrency * 4
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for url in urls:
+                pending.append((url, executor.submit(fetch_page, url, session)))
+                if len(pending) >= window:
+                    url, future = pending.popleft()
+                    yield url, result(future)
+
+            while pending:
+                url, future = pending.popleft()
+                yield url, result(future)
+        return
+
+    for url in urls:
+        try:
+            yield url, fetch_page(url, session)
+        except Exception as e:
+            yield url, e
+
+def parse_scene(key, act_num, scene_num, scene_content):
+    """
+    Parse and format one scene page of a play.
+    Returns (scene_lines, lines_added, speakers), speakers being the labels the page
+    marked up as speakers; a top-level function so it can run in a process pool.
+    """
+    scene_lines = []
+    speakers = []
+    lines_added = process_scene(PLAYS[key], act_num, scene_num, scene_content, scene_lines, speakers)
+    return scene_lines, lines_added, speakers
+
+def iter_parsed_scenes(key, scene_pages, parse_pool=None, lookahead=8):
+    """
+    Yield (url, (scene_lines, lines_added, speakers) or exception) for each fetched scene page, in order.
+    With a parse_pool, up to `lookahead` pages are parsed in worker processes while
+    later pages are still being fetched.
+    """
+    play = PLAYS[key]
+    scene_pattern = re.compile(re.escape(play.slug) + r'\.(\d+)\.(\d+)\.html')
+
+    def parse(url, scene_content):
+        if isinstance(scene_content, Exception):
+            return scene_content
+        act_num, scene_num = scene_pattern.search(url).groups()
+        if parse_pool is None:
+            try:
+                return parse_scene(key, act_num, scene_num, scene_content)
+            except Exception as e:
+                return e
+        return parse_pool.submit(parse_scene, key, act_num, scene_num, scene_content)
+
+    def result(parsed):
+        if isinstance(parsed, Future):
+            return parsed.exception() or parsed.result()
+        return parsed
+
+    pending = deque()
+    for url, scene_content in scene_pages:
+        pending.append((url, parse(url, scene_content)))
+        if len(pending) >= lookahead:
+            url, parsed = pending.popleft()
+            yield url, result(parsed)
+
+    while pending:
+        url, parsed = pending.popleft()
+        yield url, result(parsed)
+
+def scrape_play(key, session=None, concurrency=1, resume=False, parse_pool=None, verbose=True):
+    """
+    Scrapes one play from the MIT website and writes it in the play's output format.
+    With concurrency > 1 scene pages are downloaded concurrently.
+    Every parsed scene is checkpointed; with resume=True only scenes missing from
+    the checkpoint manifest (or that failed last time) are fetched again.
+    With a parse_pool (a concurrent.futures executor) scenes are parsed there.
+    verbose=False drops the per-scene progress output.
+    Returns a summary dict, or None if the play could not be scraped.
+    """
+    play = PLAYS[key]
+    session = session or get_session()
+    log = print if verbose else (lambda *args, **kwargs: None)
+    base_url = BASE_URL + play.slug + "/"
+
+    try:
+        manifest = ScrapeManifest(key, CHECKPOINT_DIR, resume)
+
+        # Get the main index page
+        content = fetch_page(base_url + "index.html", session)
+
+        # Find all scene links with the correct pattern: slug.X.Y.html
+        scene_pattern = re.compile(re.escape(play.slug) + r'\.(\d+)\.(\d+)\.html')
+        scene_links = re.findall(r'href="(' + re.escape(play.slug) + r'\.\d+\.\d+\.html)"', content)
+        scene_links = [href for href in scene_links if scene_pattern.search(href)]
+
+        log(f"Found {len(scene_links)} scene links")
+
+        # Sort the links into canonical act/scene order
+        scene_links.sort(key=scene_order)
+
+        pending_links = manifest.pending_scenes(scene_links)
+        if resume:
+            log(f"Resuming: {len(scene_links) - len(pending_links)} scenes already checkpointed")
+
+        log(f"Processing {len(pending_links)} scenes...")
+        if concurrency > 1:
+            log(f"Fetching scenes concurrently ({concurrency} per host)...")
+
+        scene_urls = [base_url + href for href in pending_links]
+        scene_pages = iter_scene_pages(scene_urls, session, concurrency)
+        parsed_scenes = iter_parsed_scenes(key, scene_pages, parse_pool)
+        pending = set(pending_links)
+        failed_links = []
+
+        # Stream every scene to the output as soon as it is parsed (or read back from
+        # its checkpoint), in canonical order; the file is only replaced once complete
+        log(f"Writing scenes to {play.output_file}...")
+        with StreamingSceneWriter(play.output_file, lambda line: is_dialogue_line(play, line)) as writer:
+            if play.output_format == "theatrical":
+                writer.write_lines([
+                    "=" * 80,
+                    play.title.upper(),
+                    "by William Shakespeare",
+                    "=" * 80,
+                    ""
+                ])
+
+            fetched = 0
+            for href in scene_links:
+                if href not in pending:
+                    writer.write_scene(manifest.load_scene_lines(href), manifest.scene_speakers(href))
+                    continue
+
+                scene_url, parsed = next(parsed_scenes)
+                fetched += 1
+
+                # Extract act and scene numbers from href
+                match = scene_pattern.search(href)
+                act_num = match.group(1)
+                scene_num = match.group(2)
+
+                log(f"[{fetched}/{len(pending_links)}] Fetching ACT {act_num} SCENE {scene_num}")
+
+                try:
+                    if isinstance(parsed, Exception):
+                        raise parsed
+                    scene_lines, lines_added, speakers = parsed
+                    manifest.record_scene(href, scene_url, scene_lines, lines_added, speakers)
+                    writer.write_scene(scene_lines, speakers)
+                    log(f"  → Processed {lines_added} lines of dialogue")
+
+                except Exception as e:
+                    print(f"  ✗ Error processing {scene_url}: {e}")
+                    manifest.record_failure(href, scene_url, e)
+                    failed_links.append(href)
+                    continue
+
+        dialogue_lines = writer.dialogue_lines
+        log(f"✓ Successfully saved {writer.total_lines} lines to {play.output_file}")
+        log(f"✓ Processed {len(scene_links)} scenes with {dialogue_lines} dialogue lines")
+        if failed_links:
+            print(f"⚠️  {len(failed_links)} scene(s) missing from {play.output_file}: {', '.join(failed_links)}")
+            print(f"   Rerun with --resume to fetch only those scenes")
+
+        return {
+            'play': key,
+            'scenes': len(scene_links),
+            'failed_scenes': failed_links,
+            'dialogue_lines': dialogue_lines,
+            'total_lines': writer.total_lines,
+            'output_file': play.output_file
+        }
+
+    except Exception as e:
+        print(f"Error occurred scraping {play.title}: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+def process_scene(play, act_num, scene_num, scene_content, output_lines, speakers=None):
+    """
+    Add the heading and dialogue of one scene to output_lines in the play's format.
+    The page is tokenized once; the events feed both the heading and the dialogue.
+    Speaker labels written to the output are appended to speakers, if given.
+    Returns the number of dialogue lines added.
+    """
+    if play.output_format == "theatrical":
+        events = list(tokenize_scene(scene_content))
+
+        # Add scene heading with enhanced formatting
+        output_lines.append("")
+        output_lines.append("-" * 60)
+        output_lines.append(f"ACT {act_num}, SCENE {scene_num}")
+
+        # Extract and add scene location
+        location = scene_location(events)
+        if location:
+            output_lines.append(f"Location: {location}")
+
+        output_lines.append("-" * 60)
+        output_lines.append("")
+
+        return format_events_theatrical(events, output_lines)
+
+    # Add scene heading - SAME FORMAT AS CORIOLANUS
+    output_lines.append(f"ACT {act_num} SCENE {scene_num}")
+    output_lines.append("")  # Empty line after heading
+
+    return format_events_same_format(tokenize_scene(scene_content), output_lines, speakers)
+
+def is_dialogue_line(play, line):
+    """
+    True if an output line counts as a dialogue line in the play's format.
+    """
+    if play.output_format == "theatrical":
+        return bool(line) and 'SPEAKER:' in line
+    return bool(line) and not line.startswith('ACT') and ':' in line
+
+def format_events_same_format(events, output_lines, speakers=None):
+    """
+    Format tokenized scene events EXACTLY like Coriolanus: "number: SPEAKER: line",
+    with the speaker only shown when it changes.
+    Each speaker label written is appended to speakers (once), if given.
+    Returns the number of dialogue lines added.
+    """
+    current_speaker = None
+    speaker = None
+    formatted_lines = []
+
+    for event in events:
+        if event.kind == SPEECH:
+            speaker = event.text
+            continue
+        if event.kind != LINE:
+            continue
+
+        # Format the line - EXACT SAME FORMAT AS CORIOLANUS
+        if speaker != current_speaker:
+            current_speaker = speaker
+            if speakers is not None and current_speaker.strip() not in speakers:
+                speakers.append(current_speaker.strip())
+            formatted_lines.append(f"{len(formatted_lines) + 1}: {current_speaker}: {event.text}")
+        else:
+            formatted_lines.append(f"{len(formatted_lines) + 1}: {event.text}")
+
+    # Split long lines of the whole scene at once and add to output
+    output_lines.extend(wrap_lines(formatted_lines))
+
+    return len(formatted_lines)
+
+def format_events_theatrical(events, output_lines):
+    """
+    Format tokenized scene events in theatrical style: all stage directions first,
+    then SPEAKER/DIALOGUE/CONTINUED lines.
+    Returns the number of dialogue lines added.
+    """
+    lines_added = 0
+    current_speaker = None
+    speaker = None
+    dialogue_lines = []
+
+    for event in events:
+        if event.kind == DIRECTION:
+            output_lines.append(f"[STAGE DIRECTION: {event.text}]")
+            output_lines.append("")
+        elif event.kind == SPEECH:
+            speaker = event.text
+        elif event.kind == LINE:
+            # Format the line in theatrical style
+            if speaker != current_speaker:
+                current_speaker = speaker
+                # Add speaker name with enhanced formatting
+                dialogue_lines.append("")
+                dialogue_lines.append(f"SPEAKER: {current_speaker.upper()}")
+                dialogue_lines.append(f"DIALOGUE: {event.text}")
+            else:
+                # Continue with same speaker
+                dialogue_lines.append(f"CONTINUED: {event.text}")
+
+            lines_added += 1
+
+    output_lines.extend(dialogue_lines)
+    return lines_added
+
+def process_scene_content_same_format(scene_content, output_lines):
+    """
+    Process the content of a single scene using the EXACT SAME parsing as Coriolanus.
+    Returns the number of dialogue lines added.
+    """
+    return format_events_same_format(tokenize_scene(scene_content), output_lines)
+
+def process_scene_content_theatrical(scene_content, output_lines):
+    """
+    Process the content of a single scene using theatrical formatting.
+    Returns the number of dialogue lines added.
+    """
+    return format_events_theatrical(tokenize_scene(scene_content), output_lines)
+
+def extract_scene_location(scene_content):
+    """
+    Extract the scene location from the HTML title or content.
+    """
+    return scene_location(tokenize_scene(scene_content))
+
+def extract_stage_directions(scene_content):
+    """
+    Extract stage directions from the scene content.
+    """
+    return [event.text for event in tokenize_scene(scene_content) if event.kind == DIRECTION]
+
+def main():
+    """
+    Scrape the plays named on the command line (keys from PLAYS), or every play.
+    All of them share one pooled session.
+    """
+    parser = argparse.ArgumentParser(description="Scrape Shakespeare plays from shakespeare.mit.edu")
+    parser.add_argument('plays', nargs='*', help="play keys to scrape (default: all)")
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help=f"scene pages fetched at once per play (e.g. {DEFAULT_CONCURRENCY}; default: 1)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help=f"HTTP cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="evict least recently used pages above this size")
+    parser.add_argument('--no-cache', action='store_true', help="always download every page")
+    parser.add_argument('--rate-limit', type=float, default=None,
+                        help="maximum requests per second to the site (default: no limit)")
+    parser.add_argument('--resume', action='store_true',
+                        help="only fetch scenes missing from the checkpoint manifest, then reassemble")
+    parser.add_argument('--offline', metavar='PATH', default=None,
+                        help="read pages from a local mirror directory or page archive instead of the site")
+    args = parser.parse_args()
+
+    global CACHE_DIR, CACHE_MAX_BYTES, RATE_LIMIT, OFFLINE_SOURCE
+    CACHE_DIR = None if args.no_cache or args.offline else args.cache_dir
+    CACHE_MAX_BYTES = args.cache_max_mb * 1024 * 1024
+    RATE_LIMIT = args.rate_limit
+    OFFLINE_SOURCE = args.offline
+
+    keys = args.plays or list(PLAYS)
+    unknown = [key for key in keys if key not in PLAYS]
+    if unknown:
+        print(f"Unknown play(s): {', '.join(unknown)}")
+        print(f"Available plays: {', '.join(PLAYS)}")
+        return
+
+    session = get_session()
+    for key in keys:
+        print(f"\n=== {PLAYS[key].title.upper()} ===")
+        scrape_play(key, session, args.concurrency, args.resume)
+
+    cache = get_cache()
+    if cache is not None:
+        report = cache.get_report()
+        print(f"\nHTTP cache: {report['hits']} hits, {report['misses']} downloads "
+              f"({report['bytes_downloaded']} bytes), {report['evictions']} evictions, "
+              f"{report['bytes_on_disk']} bytes on disk")
+
+# Run the scraper
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,14 @@ Play Text Cleaner
 Removes repetitive speaker names from consecutive lines in Macbeth play text.
 """
 
-import json
+import argparse
 import re
 from typing import Dict, List, Tuple
 
+import json_io
+from lazy_notes import LazyNotes
+from scene_keys import SceneIndex
+
 class PlayTextCleaner:
     """Cleans up repetitive speaker names in play text."""
     
@@ -79,7 +83,8 @@ class PlayTextCleaner:
         cleaned_data = {}
         total_scenes = len(notes_data)
         
-        for i, (act_scene, scene_data) in enumerate(notes_data.items(), 1):
+        # Walk scenes in act/scene order whatever the file's key style or order
+        for i, (act_scene, scene_data) in enumerate(SceneIndex(notes_data).items(notes_data), 1):
             print(f"Cleaning {act_scene}... ({i}/{total_scenes})")
             
             if isinstance(scene_data, dict):
@@ -137,20 +142,25 @@ class PlayTextCleaner:
                     count += 1
         else:
             # Show examples from first available scene
-            for act_scene in original_data.keys():
+            for act_scene in SceneIndex(original_data):
                 if isinstance(original_data[act_scene], dict):
                     self.show_examples(original_data, cleaned_data, act_scene)
                     break
 
 def main():
     """Main function to clean play text."""
+    parser = argparse.ArgumentParser(description="Remove repeated speaker names from the expanded Macbeth notes")
+    parser.add_argument('--scene', help='only clean one scene, e.g. "ACT 1, SCENE 3", and print it instead of saving')
+    parser.add_argument('--compact', action='store_true', help="save JSON without indentation")
+    args = parser.parse_args()
+
     print("=== PLAY TEXT CLEANER FOR MACBETH ===")
     
     # Load the expanded notes
     print("Step 1: Loading expanded notes...")
     try:
-        with open('macbeth_notes_complete_expanded.json', 'r', encoding='utf-8') as f:
-            expanded_notes = json.load(f)
+        # Scenes are decoded on first access through the sidecar index
+        expanded_notes = LazyNotes('macbeth_notes_complete_expanded.json')
         print(f"✅ Loaded expanded notes with {len(expanded_notes)} acts/scenes")
     except FileNotFoundError:
         print("❌ File 'macbeth_notes_complete_expanded.json' not found!")
@@ -160,16 +170,25 @@ def main():
         print(f"❌ Error loading expanded notes: {e}")
         return
     
+    cleaner = PlayTextCleaner()
+
+    if args.scene:
+        if args.scene not in expanded_notes:
+            print(f"❌ No scene {args.scene!r} in macbeth_notes_complete_expanded.json")
+            return
+        cleaned_scene = cleaner.clean_consecutive_speakers(expanded_notes[args.scene])
+        print(json_io.dumps({args.scene: cleaned_scene}))
+        return
+    
     # Clean the play text
     print("Step 2: Cleaning play text...")
-    cleaner = PlayTextCleaner()
     cleaned_notes = cleaner.clean_all_scenes(expanded_notes)
     
     # Save cleaned notes
     print("Step 3: Saving cleaned notes...")
     try:
         with open('macbeth_notes_cleaned_play.json', 'w', encoding='utf-8') as f:
-            json.dump(cleaned_notes, f, indent=2, ensure_ascii=False)
+            json_io.dump(cleaned_notes, f, args.compact)
         print("✅ Cleaned notes saved to 'macbeth_notes_cleaned_play.json'")
     except Exception as e:
         print(f"❌ Error saving cleaned notes: {e}")
@@ -0,0 +1,135 @@
+# Single-pass matcher for bibliography keys
+# The keys are compiled once into a character trie. A scan walks the trie from each
+# word start in the text and keeps the longest key that also ends on a word
+# boundary, so "Beaumont and Fletcher" wins over "Fletcher" and "Rowe" never
+# matches inside "Rowena". Matches never overlap and the scan resumes after each
+# one; expand() assembles the output from the original text, so an inserted
+# citation is never scanned again. Word starts that cannot begin a key (most
+# words, as keys are capitalised) are skipped by the regex engine. The work per
+# note is proportional to its length (plus at most one key length at each word
+# start), however many references it contains.
+#
+# Given a ConfusionMatrix, confusable characters share their trie child ("l",
+# "i" and "1" all lead to the same node), so a key ending at a word boundary may
+# be an OCR misreading of it ("Ha11iwe11" for "Halliwell") rather than the key
+# itself; the span is then checked with reading_cost() and the cheapest key
+# within max_cost wins. The walk itself is the same dict lookups as without
+# confusions.
+
+import re
+
+# Marks the end of a key in a trie node; no text character is the empty string
+KEY_END = ""
+
+def _is_word_char(char):
+    """Same test as \\w in str patterns."""
+    return char.isalnum() or char == '_'
+
+class ReferenceMatcher:
+    """Trie over a set of keys, matched whole-word, leftmost-longest."""
+
+    def __init__(self, keys=(), confusions=None):
+        self.root = {}
+        self.keys = 0
+        self.confusions = confusions if confusions else None
+        self._starts = None
+        for key in keys:
+            self.add(key)
+
+    def add(self, key):
+        """Add a key; keys must start and end with a word character."""
+        node = self.root
+        if self.confusions is None:
+            for char in key:
+                node = node.setdefault(char, {})
+            if KEY_END not in node:
+                self.keys += 1
+            node[KEY_END] = key
+        else:
+            for char in key:
+                child = node.get(char)
+                if child is None:
+                    child = {}
+                    for alike in self.confusions.alike(char):
+                        node[alike] = child
+                node = child
+            # Keys that differ only in confusable characters share a node: [key, ...] in the order added
+            alike_keys = node.setdefault(KEY_END, [])
+            if key not in alike_keys:
+                alike_keys.append(key)
+                self.keys += 1
+        self._starts = None
+
+    def _start_pattern(self):
+        """Word starts whose first character begins some key, found by the regex engine."""
+        if self._starts is None:
+            first_chars = ''.join(sorted(self.root))
+            self._starts = re.compile(r'\b[' + re.escape(first_chars) + ']' if first_chars else r'(?!)')
+        return self._starts
+
+    def __len__(self):
+        return self.keys
+
+    def find(self, text):
+        """Return [(start, end, key), ...] for every non-overlapping whole-word key in text."""
+        matches = []
+        root = self.root
+        length = len(text)
+        position = 0
+        confusions = self.confusions
+
+        for word in self._start_pattern().finditer(text):
+            start = word.start()
+            if start < position:
+                continue
+
+            node = root
+            index = start
+            best = None
+            while index < length:
+                node = node.get(text[index])
+                if node is None:
+                    break
+                index += 1
+                if KEY_END in node and (index == length or not _is_word_char(text[index])):
+                    key = node[KEY_END]
+                    if confusions is not None:
+                        key = self._read_key(text[start:index], key)
+                        if key is None:
+                            continue
+                    best = (start, index, key)
+
+            if best is not None:
+                matches.append(best)
+                position = best[1]
+
+        return matches
+
+    def _read_key(self, span, alike_keys):
+        """The key span is the cheapest reading of, or None if it reads as none of them."""
+        if len(alike_keys) == 1 and alike_keys[0] == span:
+            return span
+        best = None
+        for key in alike_keys:
+            cost = self.confusions.reading_cost(span, key)
+            if cost is not None and (best is None or cost < best[0]):
+                best = (cost, key)
+        return best[1] if best is not None else None
+
+    def expand(self, text, replacements):
+        """
+        Replace every match with replacements[key] in one pass.
+        Returns (expanded text, matches).
+        """
+        matches = self.find(text)
+        if not matches:
+            return text, matches
+
+        parts = []
+        position = 0
+        for start, end, key in matches:
+            parts.append(text[position:start])
+            parts.append(replacements[key])
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts), matches
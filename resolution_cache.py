@@ -0,0 +1,92 @@
+# Memo of word -> bibliography key resolutions
+# The same names (Steevens, Malone, Johnson, ...) and the same ordinary capitalised
+# words come up thousands of times across the notes, and each one used to go
+# through the fuzzy lookup again. A ResolutionCache remembers the outcome for each
+# word, including "no match", in a bounded LRU shared by every processor in the
+# process, so it carries over from scene to scene and file to file.
+#
+# Entries are only valid for the bibliography they were computed against: the
+# cache is bound to a fingerprint of the bibliography's entries and clears itself
+# whenever a lookup comes with a different one.
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import json_io
+
+DEFAULT_MAX_ENTRIES = 50000
+
+# Returned by ResolutionCache.get() for words it has no entry for
+MISSING = object()
+
+_resolution_cache = None
+
+def bibliography_fingerprint(bibliography):
+    """Content hash of a bibliography's entries, in order (order decides ties)."""
+    return hashlib.sha256(json_io.dumps_bytes(list(bibliography.items()), compact=True)).hexdigest()
+
+class ResolutionCache:
+    """Bounded LRU of word -> closest key (or None), for one bibliography at a time."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.fingerprint = None
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'invalidations': 0
+        }
+
+    def _bind(self, fingerprint):
+        if fingerprint != self.fingerprint:
+            if self.entries:
+                self.stats['invalidations'] += 1
+            self.entries.clear()
+            self.fingerprint = fingerprint
+
+    def get(self, fingerprint, word):
+        """The cached resolution of word (a key or None), or MISSING."""
+        with self.lock:
+            self._bind(fingerprint)
+            resolution = self.entries.get(word, MISSING)
+            if resolution is MISSING:
+                self.stats['misses'] += 1
+            else:
+                self.entries.move_to_end(word)
+                self.stats['hits'] += 1
+            return resolution
+
+    def put(self, fingerprint, word, resolution):
+        """Remember the resolution of word, evicting the least recently used entries."""
+        with self.lock:
+            self._bind(fingerprint)
+            self.entries[word] = resolution
+            self.entries.move_to_end(word)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def get_report(self):
+        """Return the cache counters plus its size."""
+        with self.lock:
+            report = dict(self.stats)
+            report['entries'] = len(self.entries)
+            report['negative_entries'] = sum(1 for resolution in self.entries.values() if resolution is None)
+        lookups = report['hits'] + report['misses']
+        report['hit_ratio'] = report['hits'] / lookups if lookups else 0.0
+        return report
+
+def get_resolution_cache():
+    """Return the process-wide ResolutionCache."""
+    global _resolution_cache
+    if _resolution_cache is None:
+        _resolution_cache = ResolutionCache()
+    return _resolution_cache
@@ -0,0 +1,107 @@
+# Canonical (act, scene) keys for the inconsistent scene labels across files
+# The scraped JSON uses "ACT 1 SCENE 1", the notes files "ACT 1, SCENE 1", and
+# othello_notes.json "ACT I, SCENE I". parse_scene_key() turns any of them into an
+# (act, scene) tuple of ints, and SceneIndex is built once per file to give O(1)
+# lookup by (act, scene) and iteration in numeric act/scene order (so SCENE 10
+# follows SCENE 9), without re-sorting or matching key strings on every access.
+
+import re
+from bisect import bisect_left, bisect_right
+
+SCENE_KEY = re.compile(r'^ACT\s+([IVXLC]+|\d+)\.?,?\s+SCENE\s+([IVXLC]+|\d+)\.?$', re.IGNORECASE)
+ROMAN_VALUES = {'I': 1, 'V': 5, 'X': 10, 'L': 50, 'C': 100}
+
+def parse_number(token):
+    """Parse an act or scene number written in digits or roman numerals."""
+    if token.isdigit():
+        return int(token)
+    total = 0
+    previous = 0
+    for numeral in reversed(token.upper()):
+        value = ROMAN_VALUES[numeral]
+        total = total - value if value < previous else total + value
+        previous = max(previous, value)
+    return total
+
+def parse_scene_key(scene_key):
+    """
+    Return (act, scene) as ints for keys like "ACT 1 SCENE 2", "ACT 1, SCENE 2"
+    or "ACT I, SCENE II", or None if the key is not a scene label.
+    """
+    match = SCENE_KEY.match(scene_key.strip())
+    if not match:
+        return None
+    return parse_number(match.group(1)), parse_number(match.group(2))
+
+class SceneIndex:
+    """
+    The scene keys of one file in canonical order.
+    Keys that do not parse as scene labels keep their file order after the others;
+    when two keys name the same scene, lookups return the first one.
+    """
+
+    def __init__(self, keys):
+        parsed = []
+        unparsed = []
+        self.numbers = {}
+        for position, key in enumerate(keys):
+            number = parse_scene_key(key)
+            if number is None:
+                unparsed.append(key)
+            else:
+                parsed.append((number, position, key))
+                self.numbers[key] = number
+
+        parsed.sort()
+        self.ordered_numbers = [number for number, _, _ in parsed]
+        self.keys = [key for _, _, key in parsed] + unparsed
+        self.unparsed = set(unparsed)
+        self.by_number = {}
+        for number, _, key in parsed:
+            self.by_number.setdefault(number, key)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __contains__(self, scene):
+        """True for a known (act, scene) tuple or scene key."""
+        if isinstance(scene, tuple):
+            return scene in self.by_number
+        return scene in self.numbers or scene in self.unparsed
+
+    def key(self, act, scene):
+        """The file's key for (act, scene); KeyError if the scene is not there."""
+        try:
+            return self.by_number[(int(act), int(scene))]
+        except KeyError:
+            raise KeyError(f"No ACT {act} SCENE {scene}") from None
+
+    def get(self, act, scene, default=None):
+        return self.by_number.get((int(act), int(scene)), default)
+
+    def number(self, key):
+        """(act, scene) for a key of this file, or None."""
+        return self.numbers.get(key)
+
+    def range(self, start=None, end=None):
+        """
+        Yield the keys of scenes from start to end inclusive, both (act, scene)
+        tuples; None leaves that side open. Unparsed keys are never included.
+        """
+        first = 0 if start is None else bisect_left(self.ordered_numbers, tuple(start))
+        last = len(self.ordered_numbers) if end is None else bisect_right(self.ordered_numbers, tuple(end))
+        return iter(self.keys[first:last])
+
+    def act(self, act):
+        """Yield the keys of every scene of one act, in scene order."""
+        first = bisect_left(self.ordered_numbers, (act,))
+        last = bisect_left(self.ordered_numbers, (act + 1,))
+        return iter(self.keys[first:last])
+
+    def items(self, mapping):
+        """Yield (key, mapping[key]) for every key, in canonical order."""
+        for key in self.keys:
+            yield key, mapping[key]
@@ -0,0 +1,85 @@
+# Interchangeable HTML parser backends for MIT scene pages
+# Every backend turns a scene page into its speaker/line stream: one
+# (speaker, text) pair per verse line inside a speech, in document order, with
+# the text whitespace-normalised. scraper_benchmarks.py parsers times them and
+# checks they agree.
+#
+# Backends:
+#   html.parser - BeautifulSoup with Python's built-in parser (the Coriolanus scraper's original)
+#   lxml        - BeautifulSoup with lxml, registered only when lxml is installed
+#   regex       - scene_tokenizer.py's single-pass pattern, as used by play_scraper.py
+
+from scene_tokenizer import LINE, SPEECH, tokenize_scene
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+try:
+    import lxml  # noqa: F401 - only needed as a BeautifulSoup tree builder
+except ImportError:
+    lxml = None
+
+DEFAULT_BACKEND = "html.parser"
+
+def _is_line_anchor(name):
+    return name.isdigit()
+
+def _soup_speaker_lines(scene_content, features):
+    soup = BeautifulSoup(scene_content, features)
+    stream = []
+
+    # A speech is an <a name=speechN> holding the speaker, followed by a
+    # <blockquote> whose numbered anchors are the speech's lines
+    for speech in soup.find_all('a', attrs={'name': lambda name: name and name.startswith('speech')}):
+        blockquote = speech.find_next_sibling()
+        if blockquote is None or blockquote.name != 'blockquote':
+            continue
+        speaker = speech.get_text().strip()
+        for anchor in blockquote.find_all('a', attrs={'name': _is_line_anchor}):
+            text = ' '.join(anchor.get_text().split())
+            if text:
+                stream.append((speaker, text))
+
+    return stream
+
+def html_parser_speaker_lines(scene_content):
+    """Speaker/line stream parsed with BeautifulSoup and html.parser."""
+    return _soup_speaker_lines(scene_content, 'html.parser')
+
+def lxml_speaker_lines(scene_content):
+    """Speaker/line stream parsed with BeautifulSoup and lxml."""
+    return _soup_speaker_lines(scene_content, 'lxml')
+
+def regex_speaker_lines(scene_content):
+    """Speaker/line stream from the single-pass scene tokenizer."""
+    stream = []
+    speaker = None
+    for event in tokenize_scene(scene_content):
+        if event.kind == SPEECH:
+            speaker = event.text
+        elif event.kind == LINE:
+            stream.append((speaker, event.text))
+    return stream
+
+BACKENDS = {"regex": regex_speaker_lines}
+if BeautifulSoup is not None:
+    BACKENDS["html.parser"] = html_parser_speaker_lines
+    if lxml is not None:
+        BACKENDS["lxml"] = lxml_speaker_lines
+
+def available_backends():
+    """Names of the backends that can run with the installed packages."""
+    return list(BACKENDS)
+
+def speaker_lines(scene_content, backend=DEFAULT_BACKEND):
+    """
+    Return the [(speaker, text), ...] stream of one scene page using the named backend.
+    """
+    try:
+        parse = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown or unavailable parser backend {backend!r} "
+                         f"(available: {', '.join(BACKENDS)})") from None
+    return parse(scene_content)
@@ -0,0 +1,96 @@
+# Single-pass tokenizer for MIT Shakespeare scene pages
+# One precompiled pattern walks the page once and yields typed events in document
+# order, instead of separate findall passes for speeches, the lines inside every
+# speech, stage directions and the scene title.
+#
+# Events:
+#   SPEECH    - a speech starts; text is the speaker, anchor the speechN number
+#   LINE      - a verse line inside a speech; text is whitespace-normalised, anchor is the MIT line anchor
+#   DIRECTION - a stage direction (<blockquote><i>...</i></blockquote>); text is whitespace-normalised
+#   TITLE     - the contents of a <title> or <h3>; anchor is the tag name ("title" or "h3")
+
+import re
+from collections import namedtuple
+
+SPEECH = "speech"
+LINE = "line"
+DIRECTION = "direction"
+TITLE = "title"
+
+SceneEvent = namedtuple('SceneEvent', ['kind', 'text', 'anchor'])
+
+# The alternatives match exactly what the old per-element regexes matched, including
+# their case sensitivity. A speech only opens when a <blockquote> follows the speaker,
+# and ends at the first </blockquote> (a stage direction's closing tag counts too).
+# Every token starts with "<", so that is factored out to let the regex engine skip
+# straight to the next tag.
+TOKEN_PATTERN = re.compile(
+    r'<(?:'
+    r'A NAME=speech(?P<speech>\d+)><b>(?P<speaker>[^<]+)</b></a>(?=\s*<blockquote>)'
+    r'|(?i:blockquote>\s*<i>(?P<direction>[^<]+)</i>\s*</blockquote>)'
+    r'|A NAME=(?P<anchor>\d+)>(?P<line>[^<]+)</A>'
+    r'|(?P<end>/blockquote>)'
+    r'|(?i:(?P<tag>title|h3)>(?P<title>[^<]*)</(?P=tag)>)'
+    r')'
+)
+
+# match.lastindex tells which alternative matched: the last group of each one
+_SPEAKER = TOKEN_PATTERN.groupindex['speaker']
+_DIRECTION = TOKEN_PATTERN.groupindex['direction']
+_LINE = TOKEN_PATTERN.groupindex['line']
+_END = TOKEN_PATTERN.groupindex['end']
+_TITLE = TOKEN_PATTERN.groupindex['title']
+
+LOCATION_PATTERN = re.compile(r'SCENE [IVX]+\.\s*([^<]+)', re.IGNORECASE)
+
+def _event(kind, text, anchor):
+    # tuple.__new__ skips the namedtuple constructor's argument handling in the hot loop
+    return tuple.__new__(SceneEvent, (kind, text, anchor))
+
+def tokenize_scene(scene_content):
+    """
+    Yield SceneEvents for one scene page in document order.
+    """
+    in_speech = False
+
+    for match in TOKEN_PATTERN.finditer(scene_content):
+        token = match.lastindex
+
+        if token == _LINE:
+            if in_speech:
+                text = ' '.join(match[_LINE].split())
+                if text:
+                    yield _event(LINE, text, match['anchor'])
+
+        elif token == _SPEAKER:
+            in_speech = True
+            yield _event(SPEECH, match[_SPEAKER].strip(), match['speech'])
+
+        elif token == _END:
+            in_speech = False
+
+        elif token == _DIRECTION:
+            in_speech = False
+            text = ' '.join(match[_DIRECTION].split())
+            if text:
+                yield _event(DIRECTION, text, None)
+
+        elif token == _TITLE:
+            yield _event(TITLE, match[_TITLE], match['tag'].lower())
+
+def scene_location(events):
+    """
+    Return the location from a "SCENE X. Location" title, preferring <title> over <h3>.
+    """
+    h3_location = None
+    for event in events:
+        if event.kind != TITLE:
+            continue
+        match = LOCATION_PATTERN.match(event.text)
+        if not match:
+            continue
+        if event.anchor == "title":
+            return match.group(1).strip()
+        if h3_location is None:
+            h3_location = match.group(1).strip()
+    return h3_location
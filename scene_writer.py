@@ -0,0 +1,117 @@
+# Streaming writer for the scraped play text files
+# Scenes are written through a buffered file as soon as they are parsed, with
+# line counters kept along the way, so a play never has to be held in memory.
+# The text goes to a temporary file next to the target and is renamed over it
+# only when the play is complete; readers never see a partial file.
+# The speaker labels the page markup gave each scene are collected along the way
+# and saved next to the text (speakers_file_for()), so txt_to_json_converter.py can
+# tell a speaker label from dialogue that happens to contain a colon.
+
+import json
+import os
+import tempfile
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+SPEAKERS_SUFFIX = ".speakers.json"
+
+# The umask can only be read by setting it, which would briefly change it for
+# every other thread, so it is read once here, before any writer threads exist
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def set_default_permissions(path):
+    """Give a file made by mkstemp (private to us) the permissions open() would have."""
+    os.chmod(path, 0o666 & ~_UMASK)
+
+def speakers_file_for(path):
+    """The speaker list saved next to a scraped text file."""
+    return os.path.splitext(path)[0] + SPEAKERS_SUFFIX
+
+def load_speakers(path):
+    """The speaker labels saved next to a scraped text file, or None if it has none."""
+    try:
+        with open(speakers_file_for(path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+class StreamingSceneWriter:
+    """Buffered, atomically committed writer for '\\n'-joined output lines."""
+
+    def __init__(self, path, is_dialogue_line=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.path = path
+        self.is_dialogue_line = is_dialogue_line
+        self.buffer_size = buffer_size
+        self.file = None
+        self.tmp_path = None
+        self.speakers = {}  # label -> None, in order of first appearance
+
+        self.total_lines = 0
+        self.dialogue_lines = 0
+        self.scenes = 0
+
+    def open(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, self.tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".txt")
+        self.file = os.fdopen(fd, 'w', encoding='utf-8', newline='', buffering=self.buffer_size)
+        return self
+
+    def write_lines(self, lines):
+        """Write lines to the output, keeping the line counters up to date."""
+        for line in lines:
+            # Lines are '\n'-joined: no newline before the first or after the last
+            if self.total_lines:
+                self.file.write('\n')
+            self.file.write(line)
+            self.total_lines += 1
+            if self.is_dialogue_line and self.is_dialogue_line(line):
+                self.dialogue_lines += 1
+
+    def write_scene(self, lines, speakers=()):
+        """Write the lines of one scene and record the speaker labels it used."""
+        self.write_lines(lines)
+        self.speakers.update(dict.fromkeys(speakers))
+        self.scenes += 1
+
+    def commit(self):
+        """Flush the output and move it into place."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+        # The speaker list goes first, so a text file is never newer than its speakers
+        if self.speakers:
+            self._write_speakers()
+
+        set_default_permissions(self.tmp_path)
+        os.replace(self.tmp_path, self.path)
+        self.file = None
+
+    def _write_speakers(self):
+        speakers_path = speakers_file_for(self.path)
+        directory = os.path.dirname(os.path.abspath(speakers_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(list(self.speakers), f, indent=2, ensure_ascii=False)
+        set_default_permissions(tmp_path)
+        os.replace(tmp_path, speakers_path)
+
+    def abort(self):
+        """Discard everything written so far; the previous output file is left alone."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Scrape All
+Rebuilds the whole corpus in one run: every play is scraped at the same time,
+page fetches from all of them share one pooled session, HTTP cache, per-host
+connection limit and global rate limiter (8 requests/s unless --rate-limit says
+otherwise), and scene parsing/formatting runs on a process pool.
+Usage: python scrape_all.py [plays...] [--workers N] [--rate-limit RPS] [--concurrency N] [--resume]
+                            [--offline MIRROR_OR_ARCHIVE]
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import play_scraper
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+
+def timed_scrape_play(key, session, concurrency, resume, parse_pool):
+    """Scrape one play quietly; returns (key, seconds, summary dict or None)."""
+    start = time.perf_counter()
+    summary = play_scraper.scrape_play(key, session, concurrency, resume, parse_pool, verbose=False)
+    return key, time.perf_counter() - start, summary
+
+def scrape_all(keys=None, workers=None, concurrency=play_scraper.DEFAULT_CONCURRENCY, resume=False,
+               rate_limit=play_scraper.DEFAULT_RATE_LIMIT):
+    """
+    Scrape the given plays (default: all of them) concurrently, at most rate_limit
+    requests per second in total (None for no limit).
+    Returns {key: {'seconds', 'summary'}} in the order the plays were given.
+    """
+    play_scraper.RATE_LIMIT = rate_limit
+    keys = keys or list(play_scraper.PLAYS)
+    workers = workers or os.cpu_count() or 1
+    session = play_scraper.get_session()
+    results = {}
+
+    # One thread per play drives its fetches and writes its output; the threads
+    # only wait on the network and the parse pool, so they need no CPU of their own.
+    # Parser processes are spawned rather than forked, since the play threads are
+    # already running when the pool starts its workers
+    parse_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=parse_context) as parse_pool, \
+            ThreadPoolExecutor(max_workers=len(keys)) as play_pool:
+        futures = [
+            play_pool.submit(timed_scrape_play, key, session, concurrency, resume, parse_pool)
+            for key in keys
+        ]
+        for future in futures:
+            key, seconds, summary = future.result()
+            results[key] = {'seconds': seconds, 'summary': summary}
+            status = "✓" if summary and not summary['failed_scenes'] else "⚠️ "
+            print(f"{status} {play_scraper.PLAYS[key].title} finished in {seconds:.2f}s")
+
+    return results
+
+def print_summary(results, wall_time):
+    """Print a per-play timing and throughput table."""
+    print(f"\n{'Play':<32} {'Time':>8} {'Scenes':>7} {'Lines':>7} {'Scenes/s':>9} {'Lines/s':>9}")
+    print("-" * 76)
+
+    total_scenes = 0
+    total_lines = 0
+    for key, result in results.items():
+        title = play_scraper.PLAYS[key].title
+        seconds = result['seconds']
+        summary = result['summary']
+        if summary is None:
+            print(f"{title:<32} {seconds:7.2f}s  failed")
+            continue
+
+        scenes = summary['scenes'] - len(summary['failed_scenes'])
+        lines = summary['total_lines']
+        total_scenes += scenes
+        total_lines += lines
+        print(f"{title:<32} {seconds:7.2f}s {scenes:7d} {lines:7d} "
+              f"{scenes / seconds:9.1f} {lines / seconds:9.0f}")
+
+    slowest = max((result['seconds'] for result in results.values()), default=0.0)
+    sequential = sum(result['seconds'] for result in results.values())
+    print("-" * 76)
+    print(f"{'Total (wall clock)':<32} {wall_time:7.2f}s {total_scenes:7d} {total_lines:7d} "
+          f"{total_scenes / wall_time:9.1f} {total_lines / wall_time:9.0f}")
+    print(f"Slowest play: {slowest:.2f}s; sum of per-play times: {sequential:.2f}s")
+
+    failed = [key for key, result in results.items()
+              if result['summary'] is None or result['summary']['failed_scenes']]
+    if failed:
+        print(f"⚠️  Incomplete: {', '.join(failed)} - rerun with --resume")
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape every Shakespeare play at once")
+    parser.add_argument('plays', nargs='*', help="play keys to scrape (default: all)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="parser processes (default: one per CPU)")
+    parser.add_argument('--rate-limit', type=float, default=play_scraper.DEFAULT_RATE_LIMIT,
+                        help="maximum requests per second to the site, across all plays; 0 for no limit "
+                             f"(default: {play_scraper.DEFAULT_RATE_LIMIT:g})")
+    parser.add_argument('--concurrency', type=int, default=play_scraper.DEFAULT_CONCURRENCY,
+                        help=f"scene pages fetched at once per play (default: {play_scraper.DEFAULT_CONCURRENCY})")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help=f"HTTP cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="evict least recently used pages above this size")
+    parser.add_argument('--no-cache', action='store_true', help="always download every page")
+    parser.add_argument('--resume', action='store_true',
+                        help="only fetch scenes missing from the checkpoint manifests, then reassemble")
+    parser.add_argument('--offline', metavar='PATH', default=None,
+                        help="read pages from a local mirror directory or page archive instead of the site")
+    args = parser.parse_args()
+
+    play_scraper.CACHE_DIR = None if args.no_cache or args.offline else args.cache_dir
+    play_scraper.CACHE_MAX_BYTES = args.cache_max_mb * 1024 * 1024
+    play_scraper.OFFLINE_SOURCE = args.offline
+
+    keys = args.plays or list(play_scraper.PLAYS)
+    unknown = [key for key in keys if key not in play_scraper.PLAYS]
+    if unknown:
+        print(f"Unknown play(s): {', '.join(unknown)}")
+        print(f"Available plays: {', '.join(play_scraper.PLAYS)}")
+        return
+
+    print(f"Scraping {len(keys)} plays...")
+    start = time.perf_counter()
+    results = scrape_all(keys, args.workers, args.concurrency, args.resume, args.rate_limit or None)
+    print_summary(results, time.perf_counter() - start)
+
+    cache = play_scraper.get_cache()
+    if cache is not None:
+        report = cache.get_report()
+        print(f"\nHTTP cache: {report['hits']} hits, {report['misses']} downloads "
+              f"({report['bytes_downloaded']} bytes), {report['evictions']} evictions, "
+              f"{report['bytes_on_disk']} bytes on disk")
+
+if __name__ == "__main__":
+    main()
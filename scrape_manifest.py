@@ -0,0 +1,106 @@
+# Per-scene checkpoints for resumable scraping
+# Each formatted scene is saved to its own checkpoint file as soon as it is parsed,
+# and manifest.json records the scene's URL, content hash, line count, speaker
+# labels and status.
+# A resumed run only fetches scenes that are missing, failed or whose checkpoint
+# no longer matches its hash, then reassembles the play from the checkpoints.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+DEFAULT_CHECKPOINT_DIR = ".scrape_checkpoints"
+
+def write_atomic(path, text):
+    """Write text to path via a temporary file, so a crash never leaves half a file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class ScrapeManifest:
+    """Checkpoint manifest for one play: scene href -> url, sha256, lines, status."""
+
+    def __init__(self, key, directory=DEFAULT_CHECKPOINT_DIR, resume=False):
+        self.key = key
+        self.directory = os.path.join(directory, key)
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        self.lock = threading.Lock()
+
+        if not resume and os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.scenes = {}
+        if resume:
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self.scenes = json.load(f).get('scenes', {})
+            except (OSError, ValueError):
+                self.scenes = {}
+
+    def _scene_path(self, href):
+        return os.path.join(self.directory, href.replace('.html', '.txt'))
+
+    def save(self):
+        """Write the manifest to disk."""
+        with self.lock:
+            data = {'play': self.key, 'updated_at': time.time(), 'scenes': self.scenes}
+            write_atomic(self.manifest_path, json.dumps(data, indent=2, ensure_ascii=False))
+
+    def is_complete(self, href):
+        """True if the scene was scraped and its checkpoint still matches the recorded hash."""
+        entry = self.scenes.get(href)
+        # Checkpoints from before speakers were recorded are scraped again
+        if not entry or entry.get('status') != 'done' or 'speakers' not in entry:
+            return False
+        try:
+            with open(self._scene_path(href), 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest() == entry['sha256']
+        except OSError:
+            return False
+
+    def record_scene(self, href, url, scene_lines, lines_added, speakers=()):
+        """Checkpoint a parsed scene and its speaker labels and mark it done in the manifest."""
+        text = '\n'.join(scene_lines)
+        write_atomic(self._scene_path(href), text)
+        with self.lock:
+            self.scenes[href] = {
+                'url': url,
+                'sha256': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+                'lines': lines_added,
+                'speakers': list(speakers),
+                'status': 'done'
+            }
+        self.save()
+
+    def record_failure(self, href, url, error):
+        """Mark a scene as failed so a resumed run fetches it again."""
+        with self.lock:
+            self.scenes[href] = {'url': url, 'status': 'failed', 'error': str(error)}
+        self.save()
+
+    def load_scene_lines(self, href):
+        """Return the checkpointed output lines of a completed scene."""
+        with open(self._scene_path(href), 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        return text.split('\n') if text else []
+
+    def scene_speakers(self, href):
+        """Return the speaker labels recorded for a completed scene."""
+        return self.scenes[href].get('speakers', [])
+
+    def pending_scenes(self, hrefs):
+        """Return the hrefs still to scrape: missing, failed or with a stale checkpoint."""
+        return [href for href in hrefs if not self.is_complete(href)]
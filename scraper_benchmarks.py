@@ -0,0 +1,609 @@
+#!/usr/bin/env python3
+"""
+Scraper Benchmarks
+Times the scraping pipeline offline against pages rendered by mit_mirror.py.
+Usage: python scraper_benchmarks.py async [play] [--latency SECONDS] [--concurrency N]
+       python scraper_benchmarks.py cache [--latency SECONDS]
+       python scraper_benchmarks.py all [--latency SECONDS] [--workers N]
+       python scraper_benchmarks.py offline [--repeat N]
+       python scraper_benchmarks.py tokenizer [--repeat N]
+       python scraper_benchmarks.py parsers [--pages DIR] [--repeat N]
+       python scraper_benchmarks.py wrap [--repeat N]
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import os
+import re
+import tempfile
+import textwrap
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import line_wrap
+import mit_mirror
+import page_archive
+import play_scraper
+import scene_parsers
+import scrape_all
+
+class SlowMirrorHandler(SimpleHTTPRequestHandler):
+    """Serves the mirror over keep-alive HTTP/1.1, sleeping before every response."""
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+@contextlib.contextmanager
+def serve_mirror(root, latency):
+    """Serve a mirror directory on a free localhost port; yields the base URL."""
+    handler = type('Handler', (SlowMirrorHandler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(handler, directory=root))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def timed_scrape(key, concurrency):
+    """Scrape one play quietly; returns (seconds, output text)."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        play_scraper.scrape_play(key, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+
+    with open(play_scraper.PLAYS[key].output_file, 'r', encoding='utf-8') as f:
+        return elapsed, f.read()
+
+def benchmark_async(key="romeo_juliet", latency=0.05, concurrency=play_scraper.DEFAULT_CONCURRENCY):
+    """
+    Scrape one play from a local stand-in server that adds `latency` seconds to
+    every request, sequentially and then concurrently, and report the speedup.
+    """
+    print(f"=== ASYNC FETCH BENCHMARK: {play_scraper.PLAYS[key].title} ===")
+    print(f"Injected latency: {latency * 1000:.0f} ms per request, concurrency: {concurrency}")
+
+    original_base_url = play_scraper.BASE_URL
+    original_cache_dir = play_scraper.CACHE_DIR
+    original_cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        mirror_root = os.path.join(workdir, "mirror")
+        pages = mit_mirror.build_mirror(mirror_root, [key])
+        print(f"Rendered {pages} pages into a local mirror")
+
+        with serve_mirror(mirror_root, latency) as base_url:
+            play_scraper.BASE_URL = base_url
+            play_scraper.CACHE_DIR = None
+            os.chdir(workdir)
+            try:
+                sequential_time, sequential_text = timed_scrape(key, 1)
+                concurrent_time, concurrent_text = timed_scrape(key, concurrency)
+            finally:
+                os.chdir(original_cwd)
+                play_scraper.BASE_URL = original_base_url
+                play_scraper.CACHE_DIR = original_cache_dir
+
+    print(f"Sequential:  {sequential_time:.2f}s")
+    print(f"Concurrent:  {concurrent_time:.2f}s")
+    print(f"Speedup:     {sequential_time / concurrent_time:.1f}x")
+    print(f"Identical output: {'✅' if sequential_text == concurrent_text else '❌'}")
+
+    return {
+        'sequential': sequential_time,
+        'concurrent': concurrent_time,
+        'identical': sequential_text == concurrent_text
+    }
+
+def benchmark_cache(latency=0.0, keys=None):
+    """
+    Scrape the corpus from a local stand-in server twice with a fresh HTTP cache
+    and report what the second (revalidating) run downloaded.
+    """
+    keys = keys or [key for key in play_scraper.PLAYS if key != "cymbeline"]
+    print(f"=== HTTP CACHE BENCHMARK: {len(keys)} plays ===")
+
+    original_base_url = play_scraper.BASE_URL
+    original_cache_dir = play_scraper.CACHE_DIR
+    original_cwd = os.getcwd()
+    runs = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        mirror_root = os.path.join(workdir, "mirror")
+        pages = mit_mirror.build_mirror(mirror_root, keys)
+        print(f"Rendered {pages} pages into a local mirror")
+
+        with serve_mirror(mirror_root, latency) as base_url:
+            play_scraper.BASE_URL = base_url
+            play_scraper.CACHE_DIR = os.path.join(workdir, "cache")
+            os.chdir(workdir)
+            try:
+                for label in ("Cold", "Warm"):
+                    # A new HttpCache per run, as if it were a new process
+                    play_scraper._cache = None
+                    start = time.perf_counter()
+                    for key in keys:
+                        timed_scrape(key, play_scraper.DEFAULT_CONCURRENCY)
+                    elapsed = time.perf_counter() - start
+                    report = play_scraper.get_cache().get_report()
+                    runs.append(report)
+                    print(f"{label} run: {elapsed:.2f}s, {report['misses']} downloads, "
+                          f"{report['hits']} revalidated, {report['bytes_downloaded']} bytes transferred")
+            finally:
+                os.chdir(original_cwd)
+                play_scraper.BASE_URL = original_base_url
+                play_scraper.CACHE_DIR = original_cache_dir
+                play_scraper._cache = None
+
+    return runs
+
+def read_outputs(keys):
+    """Return {key: output text} for the given plays."""
+    outputs = {}
+    for key in keys:
+        with open(play_scraper.PLAYS[key].output_file, 'r', encoding='utf-8') as f:
+            outputs[key] = f.read()
+    return outputs
+
+def benchmark_all(latency=0.05, workers=None, keys=None):
+    """
+    Rebuild the corpus from a local stand-in server one play after another, as the
+    per-play scripts did, then through scrape_all.py, and compare wall time and output.
+    """
+    keys = keys or list(play_scraper.PLAYS)
+    print(f"=== SCRAPE-ALL BENCHMARK: {len(keys)} plays ===")
+    print(f"Injected latency: {latency * 1000:.0f} ms per request")
+
+    original_base_url = play_scraper.BASE_URL
+    original_cache_dir = play_scraper.CACHE_DIR
+    original_rate_limit = play_scraper.RATE_LIMIT
+    original_cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        mirror_root = os.path.join(workdir, "mirror")
+        pages = mit_mirror.build_mirror(mirror_root, keys)
+        print(f"Rendered {pages} pages into a local mirror")
+
+        with serve_mirror(mirror_root, latency) as base_url:
+            play_scraper.BASE_URL = base_url
+            play_scraper.CACHE_DIR = None
+            os.chdir(workdir)
+            try:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for key in keys:
+                        play_scraper.scrape_play(key)
+                sequential_time = time.perf_counter() - start
+                sequential_outputs = read_outputs(keys)
+
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    # The stand-in server needs no politeness limit
+                    results = scrape_all.scrape_all(keys, workers, rate_limit=None)
+                orchestrated_time = time.perf_counter() - start
+                orchestrated_outputs = read_outputs(keys)
+            finally:
+                os.chdir(original_cwd)
+                play_scraper.BASE_URL = original_base_url
+                play_scraper.CACHE_DIR = original_cache_dir
+                play_scraper.RATE_LIMIT = original_rate_limit
+
+    slowest = max(result['seconds'] for result in results.values())
+    identical = sequential_outputs == orchestrated_outputs
+    print(f"One play at a time:  {sequential_time:.2f}s")
+    print(f"scrape_all:          {orchestrated_time:.2f}s (slowest play {slowest:.2f}s)")
+    print(f"Speedup:             {sequential_time / orchestrated_time:.1f}x")
+    print(f"Identical output: {'✅' if identical else '❌'}")
+
+    return {
+        'sequential': sequential_time,
+        'orchestrated': orchestrated_time,
+        'slowest_play': slowest,
+        'identical': identical
+    }
+
+def benchmark_offline(repeat=3, keys=None):
+    """
+    Replay the whole corpus from a mirror directory and from a packed archive file
+    through the full parse and format pipeline, and check both give the same output.
+    """
+    keys = keys or list(play_scraper.PLAYS)
+    print(f"=== OFFLINE REPLAY BENCHMARK: {len(keys)} plays ===")
+
+    original_offline_source = play_scraper.OFFLINE_SOURCE
+    original_cache_dir = play_scraper.CACHE_DIR
+    original_cwd = os.getcwd()
+    results = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        mirror_root = os.path.join(workdir, "mirror")
+        archive_path = os.path.join(workdir, "mirror.archive")
+        pages = mit_mirror.build_mirror(mirror_root, keys)
+        page_archive.write_archive(archive_path, page_archive.mirror_pages(mirror_root))
+        print(f"Rendered {pages} pages into a mirror directory and a "
+              f"{os.path.getsize(archive_path) / 1e6:.1f} MB archive")
+
+        play_scraper.CACHE_DIR = None
+        os.chdir(workdir)
+        try:
+            for label, source in (("Mirror directory", mirror_root), ("Archive (mmap)", archive_path)):
+                play_scraper.OFFLINE_SOURCE = source
+                best = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        for key in keys:
+                            play_scraper.scrape_play(key)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                results[label] = {'seconds': best, 'outputs': read_outputs(keys)}
+                print(f"{label + ':':<18} {best:.2f}s ({pages / best:.0f} pages/s)")
+        finally:
+            os.chdir(original_cwd)
+            play_scraper.OFFLINE_SOURCE = original_offline_source
+            play_scraper.CACHE_DIR = original_cache_dir
+            # Closes the archive before its directory is removed
+            play_scraper.get_page_source()
+
+    outputs = [result.pop('outputs') for result in results.values()]
+    identical = all(output == outputs[0] for output in outputs)
+    print(f"Identical output: {'✅' if identical else '❌'}")
+    results['identical'] = identical
+    return results
+
+# The multi-pass regex parsing the scrapers used before scene_tokenizer.py,
+# kept as the reference the tokenizer is timed and checked against
+
+def original_split_long_line(line, max_length=120):
+    """The split_long_line() every scraper used to carry, kept as the wrapping reference."""
+    if len(line) <= max_length:
+        return [line]
+
+    lines = []
+    current_line = ""
+    words = line.split(' ')
+
+    for word in words:
+        if len(current_line + " " + word) <= max_length:
+            if current_line:
+                current_line += " " + word
+            else:
+                current_line = word
+        else:
+            if current_line:
+                lines.append(current_line)
+                current_line = word
+            else:
+                lines.append(word)
+
+    if current_line:
+        lines.append(current_line)
+
+    return lines
+
+def regex_process_scene_content_same_format(scene_content, output_lines):
+    lines_added = 0
+    current_speaker = None
+
+    speech_pattern = r'<A NAME=speech\d+><b>([^<]+)</b></a>\s*<blockquote>(.*?)</blockquote>'
+    speeches = re.findall(speech_pattern, scene_content, re.DOTALL)
+
+    for speaker, dialogue_block in speeches:
+        speaker = speaker.strip()
+        line_pattern = r'<A NAME=\d+>([^<]+)</A>'
+        lines = re.findall(line_pattern, dialogue_block)
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            line = re.sub(r'\s+', ' ', line)
+
+            if speaker != current_speaker:
+                current_speaker = speaker
+                formatted_line = f"{lines_added + 1}: {current_speaker}: {line}"
+            else:
+                formatted_line = f"{lines_added + 1}: {line}"
+
+            lines_added += 1
+            output_lines.extend(original_split_long_line(formatted_line))
+
+    return lines_added
+
+def regex_extract_scene_location(scene_content):
+    title_match = re.search(r'<title>SCENE [IVX]+\.\s*([^<]+)</title>', scene_content, re.IGNORECASE)
+    if title_match:
+        return title_match.group(1).strip()
+    h3_match = re.search(r'<h3>SCENE [IVX]+\.\s*([^<]+)</h3>', scene_content, re.IGNORECASE)
+    if h3_match:
+        return h3_match.group(1).strip()
+    return None
+
+def regex_extract_stage_directions(scene_content):
+    stage_directions = []
+    direction_pattern = r'<blockquote>\s*<i>([^<]+)</i>\s*</blockquote>'
+    for direction in re.findall(direction_pattern, scene_content, re.IGNORECASE):
+        direction = re.sub(r'\s+', ' ', direction).strip()
+        if direction:
+            stage_directions.append(direction)
+    return stage_directions
+
+def regex_process_scene_content_theatrical(scene_content, output_lines):
+    lines_added = 0
+    current_speaker = None
+
+    for direction in regex_extract_stage_directions(scene_content):
+        output_lines.append(f"[STAGE DIRECTION: {direction}]")
+        output_lines.append("")
+
+    speech_pattern = r'<A NAME=speech\d+><b>([^<]+)</b></a>\s*<blockquote>(.*?)</blockquote>'
+    for speaker, dialogue_block in re.findall(speech_pattern, scene_content, re.DOTALL):
+        speaker = speaker.strip()
+        for line in re.findall(r'<A NAME=\d+>([^<]+)</A>', dialogue_block):
+            line = line.strip()
+            if not line:
+                continue
+            line = re.sub(r'\s+', ' ', line)
+
+            if speaker != current_speaker:
+                current_speaker = speaker
+                output_lines.append("")
+                output_lines.append(f"SPEAKER: {current_speaker.upper()}")
+                output_lines.append(f"DIALOGUE: {line}")
+            else:
+                output_lines.append(f"CONTINUED: {line}")
+            lines_added += 1
+
+    return lines_added
+
+def regex_process_scene(play, act_num, scene_num, scene_content, output_lines):
+    if play.output_format == "theatrical":
+        output_lines.append("")
+        output_lines.append("-" * 60)
+        output_lines.append(f"ACT {act_num}, SCENE {scene_num}")
+        location = regex_extract_scene_location(scene_content)
+        if location:
+            output_lines.append(f"Location: {location}")
+        output_lines.append("-" * 60)
+        output_lines.append("")
+        return regex_process_scene_content_theatrical(scene_content, output_lines)
+
+    output_lines.append(f"ACT {act_num} SCENE {scene_num}")
+    output_lines.append("")
+    return regex_process_scene_content_same_format(scene_content, output_lines)
+
+def corpus_scene_pages(keys=None):
+    """Render every bundled play's scene pages in memory: list of (key, act, scene, html)."""
+    scene_pages = []
+    for key in keys or play_scraper.PLAYS:
+        pages = mit_mirror.render_play(key)
+        if pages is None:
+            continue
+        for name, html in pages.items():
+            match = re.search(r'\.(\d+)\.(\d+)\.html$', name)
+            if match:
+                scene_pages.append((key, match.group(1), match.group(2), html))
+    return scene_pages
+
+def time_parser(process, scene_pages, play_format, repeat):
+    """Best-of-repeat time to parse every page with one parser; returns (seconds, output lines)."""
+    best = None
+    for _ in range(repeat):
+        output_lines = []
+        start = time.perf_counter()
+        for key, act_num, scene_num, html in scene_pages:
+            play = play_scraper.PLAYS[key]._replace(output_format=play_format)
+            process(play, act_num, scene_num, html, output_lines)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output_lines
+
+def benchmark_tokenizer(repeat=5):
+    """
+    Parse every bundled play's scene pages with the old multi-pass regexes and with
+    the single-pass tokenizer, in both output formats, and check the output matches.
+    """
+    scene_pages = corpus_scene_pages()
+    total_bytes = sum(len(html) for _, _, _, html in scene_pages)
+    print(f"=== TOKENIZER BENCHMARK: {len(scene_pages)} scene pages, {total_bytes / 1e6:.1f} MB ===")
+
+    results = {}
+    for play_format in ("structured", "theatrical"):
+        regex_time, regex_lines = time_parser(regex_process_scene, scene_pages, play_format, repeat)
+        token_time, token_lines = time_parser(play_scraper.process_scene, scene_pages, play_format, repeat)
+        identical = regex_lines == token_lines
+        results[play_format] = {'regex': regex_time, 'tokenizer': token_time, 'identical': identical}
+
+        print(f"{play_format.title()} format:")
+        print(f"  Regex passes: {regex_time * 1000:.1f} ms")
+        print(f"  Tokenizer:    {token_time * 1000:.1f} ms ({regex_time / token_time:.2f}x)")
+        print(f"  Identical output: {'✅' if identical else '❌'}")
+
+    return results
+
+def coriolanus_scene_pages(pages_dir=None):
+    """
+    Coriolanus scene pages as a list of (name, html): the coriolanus.*.html files saved
+    in pages_dir, or pages rendered from the bundled Coriolanus_structured.txt.
+    """
+    if pages_dir:
+        names = sorted((name for name in os.listdir(pages_dir)
+                        if re.match(r'coriolanus\.\d+\.\d+\.html$', name)),
+                       key=play_scraper.scene_order)
+        scene_pages = []
+        for name in names:
+            with open(os.path.join(pages_dir, name), 'r', encoding='utf-8', errors='replace') as f:
+                scene_pages.append((name, f.read()))
+        return scene_pages
+
+    play = play_scraper.Play("coriolanus", "Coriolanus", "Coriolanus_structured.txt", "structured")
+    return [
+        (f"{play.slug}.{act}.{scene}.html", mit_mirror.render_scene(play, act, scene, speeches))
+        for (act, scene), speeches in mit_mirror.read_structured_scenes(play.output_file)
+    ]
+
+def benchmark_parsers(pages_dir=None, repeat=5):
+    """
+    Parse Coriolanus scene pages with every available scene_parsers backend, time
+    each one and check its speaker/line stream matches the default backend's.
+    """
+    scene_pages = coriolanus_scene_pages(pages_dir)
+    total_bytes = sum(len(html) for _, html in scene_pages)
+    backends = scene_parsers.available_backends()
+    reference_name = scene_parsers.DEFAULT_BACKEND if scene_parsers.DEFAULT_BACKEND in backends else backends[0]
+    print(f"=== PARSER BACKEND BENCHMARK: {len(scene_pages)} Coriolanus pages, {total_bytes / 1e6:.1f} MB ===")
+    missing = [name for name in ("html.parser", "lxml", "regex") if name not in backends]
+    if missing:
+        print(f"Not installed: {', '.join(missing)}")
+
+    results = {}
+    streams = {}
+    for name in backends:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            stream = [scene_parsers.speaker_lines(html, name) for _, html in scene_pages]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        streams[name] = stream
+        results[name] = {'seconds': best, 'lines': sum(len(lines) for lines in stream)}
+
+    reference = results[reference_name]['seconds']
+    for name in backends:
+        identical = streams[name] == streams[reference_name]
+        results[name]['identical'] = identical
+        print(f"  {name:<12} {results[name]['seconds'] * 1000:8.1f} ms  {reference / results[name]['seconds']:5.1f}x  "
+              f"{results[name]['lines']} lines  same stream as {reference_name}: {'✅' if identical else '❌'}")
+        if not identical:
+            # Point at the first page and line where the streams part ways
+            for (page_name, _), ours, theirs in zip(scene_pages, streams[name], streams[reference_name]):
+                if ours != theirs:
+                    index = next((i for i, pair in enumerate(zip(ours, theirs)) if pair[0] != pair[1]),
+                                 min(len(ours), len(theirs)))
+                    print(f"    first difference in {page_name}, line {index + 1}: "
+                          f"{ours[index] if index < len(ours) else None!r} vs "
+                          f"{theirs[index] if index < len(theirs) else None!r}")
+                    break
+
+    return results
+
+def corpus_formatted_lines():
+    """
+    Every "number: ..." line of the bundled *_structured.txt files, with lines the
+    scrapers split at 120 characters joined back together.
+    """
+    formatted_lines = []
+    for play in play_scraper.PLAYS.values():
+        txt_file = play.output_file.replace('_theatrical.txt', '_structured.txt')
+        if not os.path.exists(txt_file):
+            continue
+        with open(txt_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if not line or mit_mirror.SCENE_HEADING.match(line):
+                    continue
+                if mit_mirror.NUMBERED_LINE.match(line) or not formatted_lines:
+                    formatted_lines.append(line)
+                else:
+                    formatted_lines[-1] += " " + line
+    return formatted_lines
+
+def benchmark_wrap(repeat=5, max_length=120):
+    """
+    Wrap every dialogue line of the corpus with the original split_long_line(),
+    line_wrap (per line and batched) and textwrap, and check the output matches.
+    """
+    formatted_lines = corpus_formatted_lines()
+    long_lines = sum(1 for line in formatted_lines if len(line) > max_length)
+    print(f"=== LINE WRAP BENCHMARK: {len(formatted_lines)} lines, {long_lines} longer than {max_length} ===")
+
+    # Speeches joined into single paragraphs show how each approach scales with length
+    paragraphs = [' '.join(formatted_lines[i:i + 200]) for i in range(0, len(formatted_lines), 200)]
+
+    wrap_options = dict(width=max_length, break_long_words=False, break_on_hyphens=False)
+    candidates = [
+        ("original split_long_line", lambda lines: [part for line in lines for part in original_split_long_line(line, max_length)]),
+        ("line_wrap.split_long_line", lambda lines: [part for line in lines for part in line_wrap.split_long_line(line, max_length)]),
+        ("line_wrap.wrap_lines", lambda lines: line_wrap.wrap_lines(lines, max_length)),
+        ("textwrap.wrap", lambda lines: [part for line in lines for part in textwrap.wrap(line, **wrap_options)]),
+    ]
+
+    results = {}
+    for workload, lines in (("corpus lines", formatted_lines), ("200-line paragraphs", paragraphs)):
+        print(f"{workload.capitalize()}:")
+        reference = None
+        for name, wrap in candidates:
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                wrapped = wrap(lines)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            if reference is None:
+                reference = (best, wrapped)
+            identical = wrapped == reference[1]
+            results[(workload, name)] = {'seconds': best, 'identical': identical}
+            print(f"  {name:<27} {best * 1000:8.1f} ms  {reference[0] / best:5.1f}x  "
+                  f"identical: {'✅' if identical else '❌'}")
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraping pipeline offline")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    async_parser = subparsers.add_parser('async', help="sequential vs concurrent scene fetching")
+    async_parser.add_argument('play', nargs='?', default="romeo_juliet")
+    async_parser.add_argument('--latency', type=float, default=0.05)
+    async_parser.add_argument('--concurrency', type=int, default=play_scraper.DEFAULT_CONCURRENCY)
+
+    cache_parser = subparsers.add_parser('cache', help="cold vs warm runs through the HTTP cache")
+    cache_parser.add_argument('--latency', type=float, default=0.0)
+
+    all_parser = subparsers.add_parser('all', help="one play at a time vs scrape_all.py")
+    all_parser.add_argument('--latency', type=float, default=0.05)
+    all_parser.add_argument('--workers', type=int, default=None)
+
+    offline_parser = subparsers.add_parser('offline', help="replay the corpus from a mirror directory vs an archive file")
+    offline_parser.add_argument('--repeat', type=int, default=3)
+
+    tokenizer_parser = subparsers.add_parser('tokenizer', help="multi-pass regexes vs the single-pass tokenizer")
+    tokenizer_parser.add_argument('--repeat', type=int, default=5)
+
+    parsers_parser = subparsers.add_parser('parsers', help="Coriolanus HTML parser backends: speed and agreement")
+    parsers_parser.add_argument('--pages', default=None, help="directory of saved coriolanus.*.html pages")
+    parsers_parser.add_argument('--repeat', type=int, default=5)
+
+    wrap_parser = subparsers.add_parser('wrap', help="split_long_line vs line_wrap vs textwrap")
+    wrap_parser.add_argument('--repeat', type=int, default=5)
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'async':
+        benchmark_async(args.play, args.latency, args.concurrency)
+    elif args.benchmark == 'cache':
+        benchmark_cache(args.latency)
+    elif args.benchmark == 'all':
+        benchmark_all(args.latency, args.workers)
+    elif args.benchmark == 'offline':
+        benchmark_offline(args.repeat)
+    elif args.benchmark == 'tokenizer':
+        benchmark_tokenizer(args.repeat)
+    elif args.benchmark == 'parsers':
+        benchmark_parsers(args.pages, args.repeat)
+    elif args.benchmark == 'wrap':
+        benchmark_wrap(args.repeat)
+
+if __name__ == "__main__":
+    main()
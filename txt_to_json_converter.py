@@ -1,114 +1,377 @@
 # Script to convert structured .txt files to JSON format
 # Converts each .txt file to a separate JSON file with the specified format
+# Files are streamed: each scene is written as soon as it ends, so memory use is
+# bounded by one scene rather than one play.
+# Batch runs convert files in parallel on a process pool and skip every file whose
+# content hash and CONVERTER_VERSION match the conversion manifest.
+# Dialogue lines are parsed as records ("number: speaker: dialogue" or
+# "number: dialogue"). The speaker labels the scraper read from the page markup
+# are saved next to the text (<name>_structured.speakers.json); a speaker is only
+# taken from a line when it is one of them, so colons inside dialogue stay part of
+# the text. Files without that list take any label-shaped candidate as a speaker.
 
+import argparse
+import hashlib
 import json
 import os
 import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import json_io
+from scene_writer import load_speakers, set_default_permissions, speakers_file_for
+from scrape_manifest import write_atomic
+
+# Bump whenever the JSON output for the same text changes, so every file is reconverted
+CONVERTER_VERSION = 5
+
+DEFAULT_MANIFEST = ".txt_to_json_manifest.json"
+
+class JsonObjectStreamWriter:
+    """
+    Incremental encoder for one top-level JSON object.
+    Members are written as they are added, producing exactly what json_io.dump()
+    would for the whole object: json.dump(indent=2, ensure_ascii=False) in pretty
+    mode, no whitespace at all in compact mode.
+    """
+
+    def __init__(self, f, compact=False):
+        self.f = f
+        self.compact = compact
+        self.members = 0
+
+    def write_member(self, key, value):
+        """Encode and write one key/value pair of the object."""
+        encoded_key = json_io.dumps(key)
+        encoded = json_io.dumps(value, self.compact)
+
+        if self.compact:
+            self.f.write('{' if not self.members else ',')
+            self.f.write(f"{encoded_key}:{encoded}")
+        else:
+            # Strings never contain raw newlines, so this only re-indents the structure
+            encoded = encoded.replace('\n', '\n  ')
+            self.f.write('{\n' if not self.members else ',\n')
+            self.f.write(f"  {encoded_key}: {encoded}")
+        self.members += 1
+
+    def close(self):
+        """Finish the object."""
+        if not self.members:
+            self.f.write('{}')
+        else:
+            self.f.write('}' if self.compact else '\n}')
+
+# One dialogue record: "number: speaker: dialogue" or "number: dialogue"
+RECORD = re.compile(r'(\d+):(.*)')
+
+# A speaker label is a few capitalised words ("First Citizen", "LADY CAPULET",
+# "Ghost of CLARENCE"); dialogue that merely contains a colon almost never is
+SPEAKER_WORD = re.compile(r"[A-Z][A-Za-z'.\-]*|of|de|the")
+MAX_SPEAKER_WORDS = 5
+
+def parse_record(line):
+    """
+    Split a stripped dialogue line into (line number, speaker candidate or None,
+    dialogue after the candidate, whole text after the line number). The candidate is
+    the text between the first two colons; whether it really is a speaker is decided
+    by is_speaker(). Returns None for lines that are not records.
+    """
+    match = RECORD.fullmatch(line)
+    if not match:
+        return None
+    line_number, rest = match.groups()
+    candidate, separator, dialogue = rest.partition(':')
+    if not separator:
+        return line_number, None, None, rest.strip()
+    return line_number, candidate.strip(), dialogue.strip(), rest.strip()
+
+def looks_like_speaker(candidate):
+    """True if a candidate has the shape of a speaker label."""
+    words = candidate.split()
+    return (0 < len(words) <= MAX_SPEAKER_WORDS
+            and words[0][0].isupper()
+            and not words[-1].endswith("'s")
+            and all(SPEAKER_WORD.fullmatch(word) for word in words))
+
+class SpeakerLexicon:
+    """
+    The speakers of one play, as the scraper read them from the pages' speaker
+    markup (saved next to the text; see scene_writer.speakers_file_for()).
+    """
+
+    def __init__(self, speakers):
+        self.speakers = set(speakers)
+
+    @classmethod
+    def for_text(cls, txt_file_path):
+        """The lexicon saved with a scraped text file, or None if it has none."""
+        speakers = load_speakers(txt_file_path)
+        return None if speakers is None else cls(speakers)
+
+    def __contains__(self, candidate):
+        return candidate in self.speakers
+
+def is_speaker(candidate, lexicon=None):
+    """
+    True if a record's candidate is a speaker label: one of the lexicon's speakers,
+    or without a lexicon, any candidate with the shape of a label.
+    """
+    if lexicon is not None:
+        return candidate in lexicon
+    return looks_like_speaker(candidate)
+
+def is_header(line):
+    return line.startswith('ACT ') and 'SCENE ' in line
+
+def iter_scenes(lines, lexicon=None):
+    """
+    Parse structured text lines into ("ACT X SCENE Y", { "line_number": { "play": "dialogue" } })
+    pairs, yielding each scene as soon as the next header (or the end of the text) is reached.
+    Only one scene is held in memory at a time. A record starts a new speech when its
+    candidate is a speaker (see is_speaker()), so with the play's SpeakerLexicon a
+    colon inside dialogue is never read as a speaker.
+    """
+    current_act_scene = None
+    records = []
+
+    def resolve_scene():
+        scene = {}
+        current_speaker = None
+        for line_number, candidate, dialogue, text in records:
+            # Otherwise the colon is part of the dialogue and the speaker carries on
+            if candidate is not None and is_speaker(candidate, lexicon):
+                current_speaker = candidate
+                text = dialogue
+            scene[line_number] = {
+                "play": f"{current_speaker}: {text}" if current_speaker else text
+            }
+        return scene
+
+    for line in lines:
+        line = line.strip()
+
+        # Skip empty lines
+        if not line:
+            continue
+
+        # Check if this is an ACT/SCENE header
+        if is_header(line):
+            if current_act_scene is not None:
+                yield current_act_scene, resolve_scene()
+            current_act_scene = line
+            records = []
+            continue
+
+        # Dialogue records only count inside a scene
+        record = parse_record(line)
+        if record and current_act_scene:
+            records.append(record)
+
+    if current_act_scene is not None:
+        yield current_act_scene, resolve_scene()
 
 def convert_txt_to_json(txt_file_path):
     """
     Convert a structured .txt file to JSON format.
     Format: "ACT X, SCENE Y": { "line_number": { "play": "dialogue" } }
+    Returns the whole play as a dict; use stream_txt_to_json() to convert without holding it in memory.
     """
     try:
+        lexicon = SpeakerLexicon.for_text(txt_file_path)
         with open(txt_file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Create the JSON structure
-        json_data = {}
-        current_act_scene = None
-        current_speaker = None
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines
-            if not line:
-                continue
-            
-            # Check if this is an ACT/SCENE header
-            if line.startswith('ACT ') and 'SCENE ' in line:
-                current_act_scene = line
-                json_data[current_act_scene] = {}
-                continue
-            
-            # Check if this is a dialogue line (format: "number: speaker: dialogue" or "number: dialogue")
-            if ':' in line:
-                parts = line.split(':', 2)  # Split into max 3 parts
-                if len(parts) >= 2:
-                    line_number = parts[0].strip()
-                    
-                    # Check if there's a speaker name
-                    if len(parts) == 3:
-                        # Format: "number: speaker: dialogue"
-                        speaker = parts[1].strip()
-                        dialogue = parts[2].strip()
-                        current_speaker = speaker
-                    else:
-                        # Format: "number: dialogue" (continuation of previous speaker)
-                        dialogue = parts[1].strip()
-                    
-                    # Only add if we have a current act/scene
-                    if current_act_scene:
-                        # Create the play text with speaker if available
-                        if current_speaker:
-                            play_text = f"{current_speaker}: {dialogue}"
-                        else:
-                            play_text = dialogue
-                        
-                        json_data[current_act_scene][line_number] = {
-                            "play": play_text
-                        }
-        
-        return json_data
-    
+            # A repeated header replaces the earlier scene but keeps its position
+            return dict(iter_scenes(f, lexicon))
+
+    except Exception as e:
+        print(f"Error processing {txt_file_path}: {e}")
+        return None
+
+def stream_txt_to_json(txt_file_path, json_file_path, compact=False):
+    """
+    Convert a structured .txt file to a JSON file scene by scene.
+    The text is read line by line and each scene is written as soon as it ends, so
+    memory use is bounded by one scene. The JSON file is only replaced once the
+    conversion is complete. compact=True writes it without whitespace.
+    Returns (scenes, dialogue lines), or None if the file could not be converted.
+    """
+    directory = os.path.dirname(os.path.abspath(json_file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    total_scenes = 0
+    total_lines = 0
+
+    try:
+        lexicon = SpeakerLexicon.for_text(txt_file_path)
+        with open(txt_file_path, 'r', encoding='utf-8') as txt_file, \
+                os.fdopen(fd, 'w', encoding='utf-8') as json_file:
+            writer = JsonObjectStreamWriter(json_file, compact)
+            for act_scene, scene in iter_scenes(txt_file, lexicon):
+                # A repeated header is written again; JSON readers keep its last value,
+                # as the in-memory conversion does
+                writer.write_member(act_scene, scene)
+                total_scenes += 1
+                total_lines += len(scene)
+            writer.close()
+
+        if not total_scenes:
+            os.remove(tmp_path)
+            return None
+
+        set_default_permissions(tmp_path)
+        os.replace(tmp_path, json_file_path)
+        return total_scenes, total_lines
+
     except Exception as e:
         print(f"Error processing {txt_file_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         return None
 
+def file_sha256(path):
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def source_sha256(txt_file):
+    """Hash of everything a conversion reads: the text file and its speaker list, if any."""
+    digest = file_sha256(txt_file)
+    speakers_file = speakers_file_for(txt_file)
+    if os.path.exists(speakers_file):
+        digest = hashlib.sha256(f"{digest}\n{file_sha256(speakers_file)}".encode('ascii')).hexdigest()
+    return digest
+
+def json_file_for(txt_file):
+    """The JSON file a structured .txt file converts to."""
+    return txt_file.replace('_structured.txt', '.json')
+
+def convert_file(txt_file, compact=False):
+    """
+    Convert one file; a top-level function so it can run in a process pool.
+    Returns (txt_file, (scenes, dialogue lines) or None, seconds).
+    """
+    start = time.perf_counter()
+    stats = stream_txt_to_json(txt_file, json_file_for(txt_file), compact)
+    return txt_file, stats, time.perf_counter() - start
+
+def load_manifest(manifest_path):
+    """Return the conversion manifest: txt file -> sha256, converter version, JSON hash and stats."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError):
+        return {}
+
+def is_up_to_date(entry, txt_hash, json_file, compact=False):
+    """
+    True if the manifest entry records this text, this converter version, this
+    output mode and the JSON still on disk.
+    """
+    if not entry or entry.get('sha256') != txt_hash or entry.get('converter_version') != CONVERTER_VERSION:
+        return False
+    if entry.get('compact', False) != compact:
+        return False
+    try:
+        return file_sha256(json_file) == entry.get('json_sha256')
+    except OSError:
+        return False
+
+def convert_all(txt_files, workers=None, force=False, manifest_path=DEFAULT_MANIFEST, compact=False):
+    """
+    Convert structured .txt files to JSON in parallel, skipping files the manifest
+    shows are already converted. Returns {txt_file: result dict} with 'status'
+    ("converted", "unchanged" or "failed"), 'seconds' and, when known, 'scenes' and 'lines'.
+    """
+    manifest = load_manifest(manifest_path)
+    results = {}
+    pending = []
+
+    for txt_file in txt_files:
+        txt_hash = source_sha256(txt_file)
+        entry = manifest.get(txt_file)
+        if not force and is_up_to_date(entry, txt_hash, json_file_for(txt_file), compact):
+            results[txt_file] = {'status': 'unchanged', 'seconds': 0.0,
+                                 'scenes': entry.get('scenes'), 'lines': entry.get('lines')}
+        else:
+            pending.append((txt_file, txt_hash))
+
+    if len(pending) > 1 and workers != 1:
+        # Largest files first, so the pool is not left waiting on one big play at the end
+        pending.sort(key=lambda item: os.path.getsize(item[0]), reverse=True)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            txt_names = [txt_file for txt_file, _ in pending]
+            conversions = list(pool.map(convert_file, txt_names, [compact] * len(txt_names)))
+    else:
+        conversions = [convert_file(txt_file, compact) for txt_file, _ in pending]
+
+    for (txt_file, txt_hash), (_, stats, seconds) in zip(pending, conversions):
+        if stats is None:
+            manifest.pop(txt_file, None)
+            results[txt_file] = {'status': 'failed', 'seconds': seconds}
+            continue
+
+        scenes, lines = stats
+        manifest[txt_file] = {
+            'sha256': txt_hash,
+            'converter_version': CONVERTER_VERSION,
+            'compact': compact,
+            'json_file': json_file_for(txt_file),
+            'json_sha256': file_sha256(json_file_for(txt_file)),
+            'scenes': scenes,
+            'lines': lines
+        }
+        results[txt_file] = {'status': 'converted', 'seconds': seconds, 'scenes': scenes, 'lines': lines}
+
+    if pending:
+        data = {'converter_version': CONVERTER_VERSION, 'updated_at': time.time(), 'files': manifest}
+        write_atomic(manifest_path, json.dumps(data, indent=2, sort_keys=True))
+
+    # Report in the order the files were given
+    return {txt_file: results[txt_file] for txt_file in txt_files}
+
 def main():
     """
     Convert all structured .txt files to JSON format.
+    Files that have not changed since their last conversion are skipped.
     """
+    parser = argparse.ArgumentParser(description="Convert *_structured.txt files to JSON")
+    parser.add_argument('files', nargs='*', help="structured .txt files (default: every *_structured.txt here)")
+    parser.add_argument('--workers', type=int, default=None, help="converter processes (default: one per CPU)")
+    parser.add_argument('--force', action='store_true', help="reconvert every file, even unchanged ones")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST,
+                        help=f"conversion manifest (default: {DEFAULT_MANIFEST})")
+    parser.add_argument('--compact', action='store_true',
+                        help="write JSON without indentation, for programs rather than people")
+    args = parser.parse_args()
+
     # Get all .txt files that end with "structured.txt"
-    txt_files = [f for f in os.listdir('.') if f.endswith('_structured.txt')]
-    
-    print(f"Found {len(txt_files)} structured .txt files to convert:")
-    for file in txt_files:
-        print(f"  - {file}")
+    txt_files = args.files or sorted(f for f in os.listdir('.') if f.endswith('_structured.txt'))
     
-    converted_count = 0
+    print(f"Found {len(txt_files)} structured .txt files to convert")
     
-    for txt_file in txt_files:
-        print(f"\nConverting {txt_file}...")
-        
-        # Convert to JSON
-        json_data = convert_txt_to_json(txt_file)
-        
-        if json_data:
-            # Create JSON filename (replace .txt with .json)
-            json_file = txt_file.replace('_structured.txt', '.json')
-            
-            # Save JSON file
-            try:
-                with open(json_file, 'w', encoding='utf-8') as f:
-                    json.dump(json_data, f, indent=2, ensure_ascii=False)
-                
-                print(f"✓ Successfully converted to {json_file}")
-                converted_count += 1
-                
-                # Show some statistics
-                total_scenes = len(json_data)
-                total_lines = sum(len(scene) for scene in json_data.values())
-                print(f"  → {total_scenes} scenes, {total_lines} dialogue lines")
-                
-            except Exception as e:
-                print(f"✗ Error saving {json_file}: {e}")
+    start = time.perf_counter()
+    results = convert_all(txt_files, args.workers, args.force, args.manifest, args.compact)
+    elapsed = time.perf_counter() - start
+
+    for txt_file, result in results.items():
+        if result['status'] == 'converted':
+            print(f"✓ {txt_file} → {json_file_for(txt_file)} in {result['seconds']:.3f}s "
+                  f"({result['scenes']} scenes, {result['lines']} dialogue lines)")
+        elif result['status'] == 'unchanged':
+            print(f"  {txt_file} unchanged, skipped")
         else:
             print(f"✗ Failed to convert {txt_file}")
     
+    converted_count = sum(1 for result in results.values() if result['status'] == 'converted')
+    unchanged_count = sum(1 for result in results.values() if result['status'] == 'unchanged')
     print(f"\n=== CONVERSION COMPLETE ===")
-    print(f"Successfully converted {converted_count} out of {len(txt_files)} files to JSON format")
+    print(f"Converted {converted_count}, skipped {unchanged_count} unchanged, "
+          f"failed {len(txt_files) - converted_count - unchanged_count} of {len(txt_files)} files in {elapsed:.2f}s")
     print(f"Each JSON file contains the format: 'ACT X, SCENE Y': {{ 'line_number': {{ 'play': 'dialogue' }} }}")
 
 if __name__ == "__main__":